@@ -1,6 +1,10 @@
+import multiprocessing
+
 from src.containers.TelegramReportingServiceContainer import TelegramReportingServiceContainer
 
 if __name__ == '__main__':
+    # required by the vault parsing worker processes in frozen builds
+    multiprocessing.freeze_support()
 
     container = TelegramReportingServiceContainer()
 
@@ -1,12 +1,25 @@
 import json
+import mmap
 import os
+import shutil
+import sqlite3
+import threading
 import typing
-from .Utils import FileContent, FileContentJson, StatisticsFileContentJson, WorkLogEntry
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+from .Utils import FileContent, FileContentJson, FileSignature, StatisticsFileContentJson, VaultFileBuffer, WorkLogEntry
 from .Interfaces.IFileBroker import IFileBroker, FileRegistry, VaultRegistry
+from .Interfaces.IVaultWatcher import IVaultWatcher
+from .wrappers.BufferLines import BufferLines, openMappedFile
+from .wrappers.VaultWatcher import createVaultWatcher
+
+
+# vault directories that never contain notes, matched by name at any depth
+DEFAULT_IGNORED_VAULT_DIRS = [".obsidian", ".git", ".trash"]
 
 
 class FileBroker(IFileBroker):
-    def __init__(self, jsonPath: str, appdata: str, vaultPath: str):
+    def __init__(self, jsonPath: str, appdata: str, vaultPath: str, ignoredVaultDirs: list[str] | None = None):
         defaultTaskJson: FileContent = '{"tasks": []}'
 
         self.filePaths: dict[FileRegistry, dict[str, FileContent]] = {
@@ -31,11 +44,32 @@ class FileBroker(IFileBroker):
                 "path": os.path.join(jsonPath, "import.dat"),
                 "default": defaultTaskJson
             },
+            FileRegistry.OBSIDIAN_PARSE_CACHE: {
+                "path": os.path.join(jsonPath, "vault_cache.json"),
+                "default": '{}'
+            },
+            FileRegistry.STANDALONE_TASKS_JOURNAL: {
+                "path": os.path.join(jsonPath, "tasks_journal.jsonl"),
+                "default": ''
+            },
+            FileRegistry.STANDALONE_TASKS_LOG: {
+                "path": os.path.join(jsonPath, "tasks_log.jsonl"),
+                "default": ''
+            },
+            FileRegistry.STANDALONE_TASKS_DB: {
+                "path": os.path.join(jsonPath, "tasks.sqlite3"),
+                "default": ''
+            },
         }
 
         self.vaultPaths: dict[VaultRegistry, str] = {
             VaultRegistry.OBSIDIAN: vaultPath
         }
+        self.ignoredVaultDirs: set[str] = set(DEFAULT_IGNORED_VAULT_DIRS if ignoredVaultDirs is None else ignoredVaultDirs)
+
+        # watchers are started on demand, so vaults that are never scanned aren't watched
+        self.vaultWatchers: dict[VaultRegistry, IVaultWatcher] = {}
+        self.__vaultWatchersLock = threading.Lock()
 
     def readFileContent(self, fileRegistry: FileRegistry) -> str:
         try:
@@ -48,7 +82,12 @@ class FileBroker(IFileBroker):
 
     def writeFileContent(self,
                          fileRegistry: FileRegistry, content: str) -> None:
-        with open(str(self.filePaths[fileRegistry]["path"]), 'w+') as file:
+        with self.__atomicWriter(str(self.filePaths[fileRegistry]["path"]), "w") as file:
+            file.write(content)
+
+    def appendFileContent(self,
+                          fileRegistry: FileRegistry, content: str) -> None:
+        with open(str(self.filePaths[fileRegistry]["path"]), "a") as file:
             file.write(content)
 
     def readFileContentJson(self, fileRegistry: FileRegistry) -> FileContentJson:
@@ -85,7 +124,7 @@ class FileBroker(IFileBroker):
     def writeFileContentJson(self,
                              fileRegistry: FileRegistry,
                              content: FileContent | StatisticsFileContentJson) -> None:
-        with open(str(self.filePaths[fileRegistry]["path"]), 'w+') as file:
+        with self.__atomicWriter(str(self.filePaths[fileRegistry]["path"]), "w") as file:
             # Convert WorkLogEntry objects to dictionaries for JSON serialization
             serializable_content = dict(content)
             if "log" in serializable_content and isinstance(serializable_content["log"], list):
@@ -98,6 +137,23 @@ class FileBroker(IFileBroker):
                 ]
             json.dump(serializable_content, file, indent=4)
 
+    def getFileSignature(self, fileRegistry: FileRegistry) -> FileSignature | None:
+        return self.__getSignature(str(self.filePaths[fileRegistry]["path"]))
+
+    def getVaultFileSignature(self, vaultRegistry: VaultRegistry, relativePath: str) -> FileSignature | None:
+        return self.__getSignature(os.path.join(self.vaultPaths[vaultRegistry], relativePath))
+
+    def __getSignature(self, path: str) -> FileSignature | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def connectDatabase(self, fileRegistry: FileRegistry) -> sqlite3.Connection:
+        # the task provider flushes from its timer thread, callers serialize the access
+        return sqlite3.connect(str(self.filePaths[fileRegistry]["path"]), check_same_thread=False)
+
     def getVaultFileLines(self,
                           vaultRegistry: VaultRegistry,
                           relativePath: str) -> list[str]:
@@ -105,21 +161,125 @@ class FileBroker(IFileBroker):
         with open(filePath, "r", errors="ignore") as file:
             return file.readlines()
 
+    @contextmanager
+    def openVaultFile(self,
+                      vaultRegistry: VaultRegistry,
+                      relativePath: str) -> Iterator[VaultFileBuffer]:
+        with openMappedFile(self.getVaultFilePath(vaultRegistry, relativePath)) as buffer:
+            yield buffer
+
+    def getVaultFilePath(self, vaultRegistry: VaultRegistry, relativePath: str) -> str:
+        return os.path.join(self.vaultPaths[vaultRegistry], relativePath)
+
     def writeVaultFileLines(self,
                             vaultRegistry: VaultRegistry,
                             relativePath: str,
                             lines: list[str]) -> None:
         filePath = os.path.join(self.vaultPaths[vaultRegistry], relativePath)
-        with open(filePath, "w") as file:
+        with self.__atomicWriter(filePath, "w") as file:
             file.writelines(lines)
 
+    def patchVaultFileLine(self,
+                           vaultRegistry: VaultRegistry,
+                           relativePath: str,
+                           lineNumber: int,
+                           patch: Callable[[str], str | None]) -> bool:
+        filePath = os.path.join(self.vaultPaths[vaultRegistry], relativePath)
+        with open(filePath, "r+b") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                lines = BufferLines(buffer)
+                start = lines.lineOffset(lineNumber)
+                if start is None:
+                    return False
+                end, _ = lines.lineEnd(start)
+                newLine = patch(buffer[start:end].decode(lines.encoding, errors="ignore"))
+                if newLine is None:
+                    return False
+                content = newLine.encode(lines.encoding)
+
+            if len(content) == end - start:
+                # same length, only the bytes of the line are written
+                file.seek(start)
+                file.write(content)
+                return True
+
+        # the rest of the file moves, so it is rewritten as a whole
+        with open(filePath, "rb") as source, self.__atomicWriter(filePath, "wb") as target:
+            target.write(source.read(start))
+            target.write(content)
+            source.seek(end)
+            shutil.copyfileobj(source, target)
+        return True
+
+    @contextmanager
+    def __atomicWriter(self, path: str, mode: str) -> Iterator[typing.IO[typing.Any]]:
+        """
+        Opens a temporary file next to the given one, which replaces it once it has been
+        completely written. Readers never see a half written file.
+        """
+        tempPath = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            with open(tempPath, mode) as file:
+                yield file
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(path):
+                shutil.copymode(path, tempPath)
+            os.replace(tempPath, path)
+        except BaseException:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            raise
+
     # Get all files in vauld directory and subdirectories, returns a tuple with the path and the last modification time
-    def getVaultFiles(self, vaultRegistry: VaultRegistry) -> list[tuple[str, float]]:
+    def getVaultFiles(self, vaultRegistry: VaultRegistry, relativePaths: Iterable[str] | None = None, extensions: tuple[str, ...] = ()) -> list[tuple[str, float]]:
         files = []
-        for root, _, filenames in os.walk(self.vaultPaths[vaultRegistry]):
-            for filename in filenames:
-                full_file_path = os.path.join(root, filename)
-                file_path = full_file_path[len(self.vaultPaths[vaultRegistry]):]
-                last_mod_time = os.path.getmtime(full_file_path)
-                files.append((file_path, last_mod_time))
-        return files
+        if relativePaths is not None:
+            for relativePath in relativePaths:
+                if len(extensions) > 0 and not relativePath.endswith(extensions):
+                    continue
+                try:
+                    last_mod_time = os.path.getmtime(os.path.join(self.vaultPaths[vaultRegistry], relativePath))
+                except OSError:
+                    continue
+                files.append((relativePath, last_mod_time))
+            return files
+
+        return [(file_path, stat.st_mtime) for file_path, stat in self.walkVaultFiles(vaultRegistry, extensions)]
+
+    def walkVaultFiles(self, vaultRegistry: VaultRegistry, extensions: tuple[str, ...] = ()) -> Iterator[tuple[str, os.stat_result]]:
+        vaultPath = self.vaultPaths[vaultRegistry]
+        pendingDirs = [vaultPath]
+        while len(pendingDirs) > 0:
+            subDirs: list[str] = []
+            try:
+                with os.scandir(pendingDirs.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in self.ignoredVaultDirs:
+                                    subDirs.append(entry.path)
+                            elif len(extensions) == 0 or entry.name.endswith(extensions):
+                                # same path format as os.walk, relative to the configured vault path
+                                yield entry.path[len(vaultPath):], entry.stat()
+                        except OSError:
+                            # broken symlinks or files deleted while walking
+                            continue
+            except OSError:
+                continue
+            # visit the subdirectories in listing order, like os.walk does
+            pendingDirs.extend(reversed(subDirs))
+
+    def getVaultChanges(self, vaultRegistry: VaultRegistry) -> set[str] | None:
+        return self.__getVaultWatcher(vaultRegistry).popChanges()
+
+    def waitForVaultChanges(self, vaultRegistry: VaultRegistry, timeout: float) -> bool:
+        return self.__getVaultWatcher(vaultRegistry).waitForChanges(timeout)
+
+    def __getVaultWatcher(self, vaultRegistry: VaultRegistry) -> IVaultWatcher:
+        with self.__vaultWatchersLock:
+            if vaultRegistry not in self.vaultWatchers:
+                self.vaultWatchers[vaultRegistry] = createVaultWatcher(self.vaultPaths[vaultRegistry], self.ignoredVaultDirs)
+            return self.vaultWatchers[vaultRegistry]
@@ -66,7 +66,7 @@ class HeuristicScheduling(IScheduling):
         """Apply normal scheduling logic to a single task."""
         severity = p / effort_per_day
         optimal_days = ceil((r * (p * severity + 1)) / p)
-        task.setDue(task.getStart() + TimeAmount(f"{optimal_days}d"))
+        task.setDue(task.getStart() + TimeAmount.from_days(optimal_days))
         task.setSeverity(severity)
         return task
 
@@ -92,7 +92,7 @@ class HeuristicScheduling(IScheduling):
             
             # Apply sequential naming to all tasks (including original)
             split_task.setDescription(f"{original_description} {i + 1}/{split_count}")
-            split_task.setTotalCost(TimeAmount(f"{effort_per_split}p"))
+            split_task.setTotalCost(TimeAmount.from_pomodoros(effort_per_split))
             
             # Apply optimal scheduling with severity = 1
             self._apply_normal_scheduling(split_task, optimal_effort_per_day, p, effort_per_split)
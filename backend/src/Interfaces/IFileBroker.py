@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from ..Utils import FileContentJson, FileContentString, StatisticsFileContentJson
+import os
+import sqlite3
+from typing import Callable, ContextManager, Iterable, Iterator
+from ..Utils import FileContentJson, FileContentString, FileSignature, StatisticsFileContentJson, VaultFileBuffer
 
 
 # Enumeration of files that can be read
@@ -10,6 +13,10 @@ class FileRegistry(Enum):
     OBSIDIAN_TASKS_JSON = 3
     OBSIDIAN_TASKS_MD = 4
     LAST_RECEIVED_FILE = 5
+    OBSIDIAN_PARSE_CACHE = 6
+    STANDALONE_TASKS_JOURNAL = 7
+    STANDALONE_TASKS_LOG = 8
+    STANDALONE_TASKS_DB = 9
 
 
 class VaultRegistry(Enum):
@@ -34,18 +41,153 @@ class IFileBroker(ABC):
     def writeFileContent(self, fileRegistry: FileRegistry, content: FileContentString) -> None:
         pass
 
+    @abstractmethod
+    def appendFileContent(self, fileRegistry: FileRegistry, content: FileContentString) -> None:
+        pass
+
     @abstractmethod
     def writeFileContentJson(self, fileRegistry: FileRegistry, content: FileContentJson | StatisticsFileContentJson) -> None:
         pass
 
+    @abstractmethod
+    def getFileSignature(self, fileRegistry: FileRegistry) -> FileSignature | None:
+        """
+        Identifies the current content of a file without reading it.
+
+        Params:
+            fileRegistry: The file to check.
+
+        Returns:
+            FileSignature | None: The modification time, size and inode of the file, None if it doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def connectDatabase(self, fileRegistry: FileRegistry) -> sqlite3.Connection:
+        """
+        Opens the given file as an SQLite database, creating it if it doesn't exist.
+
+        Params:
+            fileRegistry: The database file.
+
+        Returns:
+            sqlite3.Connection: A connection that may be used from any thread, one at a time.
+        """
+        pass
+
     @abstractmethod
     def getVaultFileLines(self, vaultRegistry: VaultRegistry, relativePath: str) -> list[str]:
         pass
 
+    @abstractmethod
+    def openVaultFile(self, vaultRegistry: VaultRegistry, relativePath: str) -> ContextManager[VaultFileBuffer]:
+        """
+        Opens a vault file for reading its raw content in place, without loading it in memory.
+
+        Params:
+            vaultRegistry: The vault the file belongs to.
+            relativePath: The path of the file relative to the vault.
+
+        Returns:
+            ContextManager[VaultFileBuffer]: Gives the memory mapped content of the file, which is
+            only valid inside the context.
+        """
+        pass
+
+    @abstractmethod
+    def getVaultFilePath(self, vaultRegistry: VaultRegistry, relativePath: str) -> str:
+        """
+        Gets the full path of a vault file, for the worker processes that read the vault
+        files by themselves.
+
+        Params:
+            vaultRegistry: The vault the file belongs to.
+            relativePath: The path of the file relative to the vault.
+
+        Returns:
+            str: The path of the file in the file system.
+        """
+        pass
+
+    @abstractmethod
+    def getVaultFileSignature(self, vaultRegistry: VaultRegistry, relativePath: str) -> FileSignature | None:
+        """
+        Identifies the current content of a vault file without reading it.
+
+        Params:
+            vaultRegistry: The vault the file belongs to.
+            relativePath: The path of the file relative to the vault.
+
+        Returns:
+            FileSignature | None: The modification time, size and inode of the file, None if it doesn't exist.
+        """
+        pass
+
     @abstractmethod
     def writeVaultFileLines(self, vaultRegistry: VaultRegistry, relativePath: str, lines: list[str]) -> None:
         pass
 
     @abstractmethod
-    def getVaultFiles(self, vaultRegistry: VaultRegistry) -> list[tuple[str, float]]:
+    def patchVaultFileLine(self, vaultRegistry: VaultRegistry, relativePath: str, lineNumber: int, patch: Callable[[str], str | None]) -> bool:
+        """
+        Replaces a single line of a vault file. When the new line has the same length only
+        its bytes are written, otherwise the file is replaced atomically.
+
+        Params:
+            vaultRegistry: The vault the file belongs to.
+            relativePath: The path of the file relative to the vault.
+            lineNumber: The zero based number of the line.
+            patch: Receives the current line without its line ending and returns the new one,
+                or None to leave the file untouched when the line is not the expected one.
+
+        Returns:
+            bool: True if the line was replaced.
+        """
+        pass
+
+    @abstractmethod
+    def getVaultFiles(self, vaultRegistry: VaultRegistry, relativePaths: Iterable[str] | None = None, extensions: tuple[str, ...] = ()) -> list[tuple[str, float]]:
+        """
+        Gets the files of a vault with their last modification time.
+
+        Params:
+            vaultRegistry: The vault to be scanned.
+            relativePaths: If given, only these paths are checked instead of walking the whole vault.
+                Paths that no longer exist are left out of the result.
+            extensions: If given, only files ending with one of these extensions are returned.
+        """
+        pass
+
+    @abstractmethod
+    def walkVaultFiles(self, vaultRegistry: VaultRegistry, extensions: tuple[str, ...] = ()) -> Iterator[tuple[str, os.stat_result]]:
+        """
+        Lazily walks the files of a vault, skipping the ignored directories.
+
+        Params:
+            vaultRegistry: The vault to be walked.
+            extensions: If given, only files ending with one of these extensions are yielded.
+
+        Returns:
+            Iterator[tuple[str, os.stat_result]]: The relative path and stat result of each file.
+        """
+        pass
+
+    @abstractmethod
+    def getVaultChanges(self, vaultRegistry: VaultRegistry) -> set[str] | None:
+        """
+        Gets the relative paths of the vault files changed since the last call.
+
+        Returns:
+            set[str] | None: The changed paths, or None if the whole vault has to be scanned.
+        """
+        pass
+
+    @abstractmethod
+    def waitForVaultChanges(self, vaultRegistry: VaultRegistry, timeout: float) -> bool:
+        """
+        Blocks until a vault file changes or the timeout expires.
+
+        Returns:
+            bool: True if a change was detected before the timeout.
+        """
         pass
@@ -12,3 +12,25 @@ class IFilter(ABC):
     @abstractmethod
     def getDescription(self) -> str:
         pass
+
+    def getPrefilter(self) -> "IFilter | None":
+        """
+        Returns:
+            IFilter | None: The filter the tasks must pass before this one is checked, if any.
+        """
+        return None
+
+    def accepts(self, task: ITaskModel, now: int) -> bool:
+        """
+        Checks a single task against this filter. Filters overriding it check only their own
+        condition and leave the prefilter to the caller. The default filters a list with just the
+        task, so it also checks the prefilter, and the caller must not check it again.
+
+        Params:
+            task: The task to check.
+            now: The current time in milliseconds since the epoch, shared by all the tasks checked together.
+
+        Returns:
+            bool: True if the task passes the filter.
+        """
+        return len(self.filter([task])) > 0
@@ -1,17 +1,47 @@
 from abc import ABC, abstractmethod
 from typing import List, Tuple
 from .ITaskModel import ITaskModel
+from ..heuristics.TaskColumns import TaskColumns
 
 
 class IHeuristic(ABC):
 
-    @abstractmethod
+    # sort goes from the highest value to the lowest, instead of from the lowest to the highest
+    sortDescending = False
+
     def sort(self, tasks: List[ITaskModel]) -> List[Tuple[ITaskModel, float]]:
         """
         Sorts a list of tasks based on the heuristic evaluation.
-        Returns a list of tuples (task, value) sorted in a logical order.
+        Returns a list of tuples (task, value) sorted in the order of sortDescending.
+        Ties keep the order of the task list.
         """
-        pass
+        return self.sortColumns(TaskColumns(tasks))
+
+    def top(self, tasks: List[ITaskModel], count: int) -> List[Tuple[ITaskModel, float]]:
+        """
+        Returns the first count tuples sort would return, without sorting the rest of them.
+        """
+        return self.topColumns(TaskColumns(tasks), count)
+
+    def sortColumns(self, columns: TaskColumns) -> List[Tuple[ITaskModel, float]]:
+        """
+        Sorts the tasks of the columns, in the same order as sort does.
+        Several heuristics can sort the same columns, reading the task fields only once.
+        """
+        return columns.sort(self.evaluateColumns(columns), reverse=self.sortDescending)
+
+    def topColumns(self, columns: TaskColumns, count: int) -> List[Tuple[ITaskModel, float]]:
+        """
+        Returns the first count tuples sortColumns would return, without sorting the rest of them.
+        """
+        return columns.top(self.evaluateColumns(columns), count, reverse=self.sortDescending)
+
+    def evaluateColumns(self, columns: TaskColumns) -> List[float]:
+        """
+        Evaluates every task of the columns, in the order of the task list.
+        Heuristics with a closed-form formula evaluate it over the columns.
+        """
+        return [self.evaluate(task) for task in columns.tasks]
 
     @abstractmethod
     def evaluate(self, task: ITaskModel) -> float:
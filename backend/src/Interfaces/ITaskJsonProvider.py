@@ -1,7 +1,7 @@
 # class interface
 
 from abc import ABC, abstractmethod
-from ..Utils import TaskJsonType
+from ..Utils import TaskJsonElementType, TaskJsonType, TaskQuery
 
 VALID_PROJECT_STATUS = [
     "open",
@@ -25,3 +25,16 @@ class ITaskJsonProvider(ABC):
     @abstractmethod
     def saveJson(self, json: TaskJsonType) -> None:
         pass
+
+    def queryTasks(self, query: TaskQuery) -> list[tuple[int, TaskJsonElementType]] | None:
+        """
+        Finds the stored tasks that meet all the conditions of the query.
+
+        Params:
+            query: The conditions to meet.
+
+        Returns:
+            list: The position in the task list and the content of each task found, in task list order.
+                None if the provider can't run queries, the tasks must be scanned instead.
+        """
+        return None
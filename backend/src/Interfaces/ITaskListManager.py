@@ -16,6 +16,13 @@ class ITaskListManager(ABC):
     def filtered_task_list(self) -> List[ITaskModel]:
         pass
 
+    @abstractmethod
+    def get_filtered_list_version(self) -> int:
+        """
+        Returns a number that grows every time filtered_task_list may have changed, without computing it.
+        """
+        pass
+
     @property
     @abstractmethod
     def selected_task(self) -> ITaskModel | None:
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any, Tuple
 from ..wrappers.TimeManagement import TimePoint, TimeAmount
 
 
@@ -13,6 +14,8 @@ from ..wrappers.TimeManagement import TimePoint, TimeAmount
 # - investedEffort: float
 # - status: str
 class ITaskModel(ABC):
+    # lets implementations define __slots__ without getting a __dict__ back
+    __slots__ = ()
 
     @abstractmethod
     def getEventRaised(self) -> str | None:
@@ -114,6 +117,20 @@ class ITaskModel(ABC):
     def calculateRemainingTime(self) -> TimeAmount:
         pass
 
+    def getFingerprint(self) -> Tuple[Any, ...]:
+        """
+        Returns the fields of the task as plain values. Two tasks with the same content have the
+        same fingerprint, and a fingerprint taken before a change no longer matches the task.
+
+        Returns:
+            tuple: The content of the task.
+        """
+        return (
+            self.getDescription(), self.getContext(), self.getStart().as_int(), self.getDue().as_int(), self.getSeverity(),
+            self.getTotalCost().as_pomodoros(), self.getInvestedEffort().as_pomodoros(), self.getStatus(), self.getCalm(),
+            self.getProject(), self.getEventRaised(), self.getEventWaited()
+        )
+
     @abstractmethod
     def __eq__(self, other):  # type: ignore
         pass
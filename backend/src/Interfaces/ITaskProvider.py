@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Callable, List
 
 from .ITaskModel import ITaskModel
+from ..Utils import TaskQuery
 
 
 class ITaskProvider(ABC):
@@ -10,6 +11,25 @@ class ITaskProvider(ABC):
     def getTaskList(self) -> List[ITaskModel]:
         pass
 
+    @abstractmethod
+    def getTaskListVersion(self) -> int:
+        """
+        Returns a number that grows every time getTaskList starts returning a different list.
+        While it stays the same, the list returned by getTaskList does not need to be read again.
+        """
+        pass
+
+    def queryTasks(self, query: TaskQuery) -> List[ITaskModel] | None:
+        """
+        Finds the tasks of the last list returned by getTaskList that may meet the query, without
+        scanning the list. Every task that meets the query is returned, callers still check the
+        conditions on the tasks found.
+
+        Returns:
+            List[ITaskModel]: The tasks found, in task list order. None if the tasks must be scanned instead.
+        """
+        return None
+
     @abstractmethod
     def getTaskListAttribute(self, string: str) -> list[dict[str, str]]:
         pass
@@ -18,6 +38,13 @@ class ITaskProvider(ABC):
     def saveTask(self, task: ITaskModel) -> None:
         pass
 
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        Writes the saved tasks that were not written yet.
+        """
+        pass
+
     @abstractmethod
     def createDefaultTask(self, description: str) -> ITaskModel:
         pass
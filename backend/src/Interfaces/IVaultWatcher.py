@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+
+
+class IVaultWatcher(ABC):
+
+    @abstractmethod
+    def popChanges(self) -> set[str] | None:
+        """
+        Returns the vault relative paths that changed since the last call and clears them.
+
+        Returns:
+            set[str] | None: The changed paths, or None when the watcher can't tell
+            what changed and the whole vault has to be scanned again.
+        """
+        pass
+
+    @abstractmethod
+    def waitForChanges(self, timeout: float) -> bool:
+        """
+        Blocks until a change is detected in the vault or the timeout expires.
+
+        Returns:
+            bool: True if a change was detected before the timeout.
+        """
+        pass
+
+    @abstractmethod
+    def dispose(self) -> None:
+        pass
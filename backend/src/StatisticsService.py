@@ -38,42 +38,43 @@ class StatisticsService(IStatisticsService):
         # Update the date-based work done entry
         new_work_total = current_work_done + work_units_pomodoros
         
+        now = TimePoint.now()
         new_log_entry = WorkLogEntry(
-            timestamp=TimePoint.now().as_int(),
+            timestamp=now.as_int(),
             work_units=work_units_pomodoros,
             task=task.getDescription()
         )
 
         log_list.append(new_log_entry)
-        log_list = [entry for entry in log_list if TimePoint.now().as_int() - entry.timestamp < 86400000]
+        log_list = [entry for entry in log_list if now.as_int() - entry.timestamp < 86400000]
         
         self.workDone[date.isoformat()] = new_work_total
         self.workDone["log"] = log_list
 
-        print(f"Work done on {TimePoint.now()}: {work_units} on {task.getDescription()}")
+        print(f"Work done on {now}: {work_units} on {task.getDescription()}")
         self.fileBroker.writeFileContentJson(FileRegistry.STATISTICS_JSON, self.workDone)
 
     def getWorkDone(self, date: TimePoint) -> TimeAmount:
-        work_done: str = f"{self.workDone.get(date.datetime_representation.date().isoformat(), 0.0)}p"
-        return TimeAmount(work_done)
+        work_done = self.workDone.get(date.datetime_representation.date().isoformat(), 0.0)
+        return TimeAmount.from_pomodoros(work_done if not isinstance(work_done, list) else 0.0)
 
     def getWorkloadStats(self, taskList: list[ITaskModel]) -> WorkloadStats:
         filteredTasks = self.workLoadAbleFilter.filter(taskList)
 
-        workload: TimeAmount = TimeAmount("0.0p")
-        remainingEffort: TimeAmount = TimeAmount("0.0p")
+        workload: TimeAmount = TimeAmount.from_miliseconds(0)
+        remainingEffort: TimeAmount = TimeAmount.from_miliseconds(0)
         maxHeuristic = 0.0
         HeuristicName = self.mainHeuristic.__class__.__name__
         offender: str | None = None
-        offenderMax: TimeAmount = TimeAmount("0.0p")
+        offenderMax: TimeAmount = TimeAmount.from_miliseconds(0)
 
         for task in filteredTasks:
-            taskRE = TimeAmount(f"{self.remainingEffortHeuristic.evaluate(task)}p")
+            taskRE = TimeAmount.from_pomodoros(self.remainingEffortHeuristic.evaluate(task))
             taskH = self.mainHeuristic.evaluate(task)
-            taskWL = TimeAmount(f"{task.getTotalCost().as_pomodoros() / task.calculateRemainingTime().as_days()}p")
+            taskWL = TimeAmount.from_pomodoros(task.getTotalCost().as_pomodoros() / task.calculateRemainingTime().as_days())
 
             workload += taskWL
-            remainingEffort += taskRE if taskRE.as_pomodoros() > 0 else TimeAmount("0.0p")
+            remainingEffort += taskRE if taskRE.as_pomodoros() > 0 else TimeAmount.from_miliseconds(0)
             if taskH > maxHeuristic:
                 maxHeuristic = taskH
             if offenderMax.as_pomodoros() < taskWL.as_pomodoros():
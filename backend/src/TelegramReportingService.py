@@ -23,6 +23,7 @@ from .Interfaces.IStatisticsService import IStatisticsService
 from .Interfaces.ILogger import ILogger
 from .wrappers.interfaces.IUserCommService import IUserCommService
 from .wrappers.TimeManagement import TimeAmount, TimePoint
+from .filters.ContextPrefixTrie import ContextPrefixTrie
 
 
 class TelegramReportingService(IReportingService):
@@ -44,6 +45,8 @@ class TelegramReportingService(IReportingService):
         self.__messageBuilder = messageBuilder
 
         self.__lastModelList: List[ITaskModel] = []
+        self.__lastFilteredListVersion: int | None = None
+        self.__lastTaskListVersion: int | None = None
         self._updateFlag = False
 
         self._taskListManager = task_list_manager
@@ -52,6 +55,7 @@ class TelegramReportingService(IReportingService):
         self._lock = threading.Lock()
 
         self._categories = categories
+        self._categoryTrie = ContextPrefixTrie([category["prefix"] for category in categories])
 
         self.commands: List[Tuple[str, Callable[[str, bool, int | None], Coroutine[Any, Any, Any]]]] = [
             ("/list", self.listCommand),
@@ -91,11 +95,18 @@ class TelegramReportingService(IReportingService):
     def onTaskListUpdated(self) -> None:
         with self._lock:
             self._updateFlag = True
-            self._taskListManager.update_taskList(self.taskProvider.getTaskList())
+            taskList = self.taskProvider.getTaskList()
+            # the provider notifies periodically, the list manager is only updated when the list changed
+            taskListVersion = self.taskProvider.getTaskListVersion()
+            if taskListVersion == self.__lastTaskListVersion:
+                return
+            self.__lastTaskListVersion = taskListVersion
+            self._taskListManager.update_taskList(taskList)
 
     def listenForEvents(self) -> None:
         self.taskProvider.registerTaskListUpdatedCallback(self.onTaskListUpdated)
         self._taskListManager.update_taskList(self.taskProvider.getTaskList())
+        self.__lastTaskListVersion = self.taskProvider.getTaskListVersion()
         errCount = 0
         while self.run:
             try:
@@ -127,6 +138,12 @@ class TelegramReportingService(IReportingService):
                     raise
 
     def hasFilteredListChanged(self) -> bool:
+        # while nothing the filtered list depends on changes, there is no list to compare
+        filteredListVersion = self._taskListManager.get_filtered_list_version()
+        if filteredListVersion == self.__lastFilteredListVersion:
+            return False
+        self.__lastFilteredListVersion = filteredListVersion
+
         filteredList = self._taskListManager.filtered_task_list
         if self.taskProvider.compare(filteredList, self.__lastModelList):
             return False
@@ -840,7 +857,7 @@ class TelegramReportingService(IReportingService):
 
     async def setContextCommand(self, task: ITaskModel, value: str, reqId: int | None = None) -> None:
         # check if context is equal to any of the categories prefixes throw error if not
-        if any([value.startswith(category["prefix"]) for category in self._categories]):
+        if self._categoryTrie.matchesAny(value):
             task.setContext(value)
         else:
             errorMessage = f"Invalid context {value}\nvalid contexts would be: {', '.join([category['prefix'] for category in self._categories])}"
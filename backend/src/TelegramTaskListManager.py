@@ -1,10 +1,14 @@
-from typing import List, Tuple
+from typing import List, Tuple, Any
 
-from src.Utils import EventsContent
+from src.Utils import EventsContent, TaskQuery
 
 from .Utils import ActiveFilterEntry, AgendaContent, ExtendedTaskInformation, FilterListDict, FilterEntry, TaskEntry, TaskHeuristicsInfo, TaskInformation, TaskListContent, WorkloadStats
 
-from .wrappers.TimeManagement import TimeAmount, TimePoint
+from .wrappers.TimeManagement import MINUTE_MS, TimeAmount, TimePoint
+from .taskmodels.TaskModel import TaskModel
+from .filters.CompositeFilter import CompositeFilter
+from .filters.ContextPrefixTrie import ContextPrefixTrie
+from .heuristics.TaskColumns import TaskColumns
 
 from .Interfaces.ITaskProvider import ITaskProvider
 from .Interfaces.IStatisticsService import IStatisticsService
@@ -17,9 +21,12 @@ from .algorithms.Interfaces.IAlgorithm import IAlgorithm
 
 class TelegramTaskListManager(ITaskListManager):
 
-    def __init__(self, taskModelList: List[ITaskModel], algorithms: List[Tuple[str, IAlgorithm]], heuristics: List[Tuple[str, IHeuristic]], filters: List[Tuple[str, IFilter, bool]], statistics_service: IStatisticsService, tasksPerPage: int = 5):
+    def __init__(self, taskModelList: List[ITaskModel], algorithms: List[Tuple[str, IAlgorithm]], heuristics: List[Tuple[str, IHeuristic]], filters: List[Tuple[str, IFilter, bool]], statistics_service: IStatisticsService, tasksPerPage: int = 5, taskProvider: ITaskProvider | None = None):
 
         self.__taskModelList = taskModelList
+        # the provider of the task list, its queries find the tasks of the lookups without scanning the list
+        self.__taskProvider = taskProvider
+        self.__taskModelIds: set[int] | None = None
 
         self.__selectedTask = None
 
@@ -33,6 +40,16 @@ class TelegramTaskListManager(ITaskListManager):
 
         self.__statistics_service = statistics_service
 
+        # filtered_task_list together with the state it was computed from
+        self.__taskListVersion = 0
+        self.__filteredListKey: Tuple[Any, ...] | None = None
+        self.__filteredList: List[ITaskModel] = []
+        self.__filteredListVersion = 0
+        self.__categoryTrie: ContextPrefixTrie | None = None
+        self.__filteredListVersionKey: Tuple[Any, ...] | None = None
+        self.__cacheHits = 0
+        self.__cacheMisses = 0
+
         self.reset_pagination(tasksPerPage)
 
     def raiseEvent(self, event: str) -> list[ITaskModel]:
@@ -43,7 +60,7 @@ class TelegramTaskListManager(ITaskListManager):
             else:
                 return waited == event
 
-        filtered = list(filter(awaits_event, self.__taskModelList))
+        filtered = list(filter(awaits_event, self.__query_tasks(TaskQuery(waited=event))))
         for task in filtered:
             task.setEventWaited(None)
             task.setStart(TimePoint.now())
@@ -55,18 +72,62 @@ class TelegramTaskListManager(ITaskListManager):
 
     @property
     def filtered_task_list(self) -> List[ITaskModel]:
+        """
+        The tasks that pass the enabled filters, sorted by the selected heuristic and algorithm.
 
-        newTaskList: List[ITaskModel] = []
+        The list is computed again only when the tasks, their fields, the selected heuristic,
+        algorithm or filters, or the current minute changed since the last time.
+        """
+        now = TimePoint.now().as_int()
+        key = self.__get_filtered_list_key(now)
+        if key == self.__filteredListKey:
+            self.__cacheHits += 1
+            return list(self.__filteredList)
+        self.__cacheMisses += 1
+
+        newTaskList = self.__compute_filtered_task_list(now)
+        self.__filteredListKey = key
+        self.__filteredList = newTaskList
+        return list(newTaskList)
+
+    def get_filtered_list_cache_info(self) -> Tuple[int, int]:
+        """
+        Returns:
+            tuple: The times filtered_task_list was reused and the times it was computed.
+        """
+        return self.__cacheHits, self.__cacheMisses
 
-        for task in self.__taskModelList:
-            for filterr in self.__filterList:
-                if filterr[2] and filterr[1].filter([task]) and not isinstance(task.getEventWaited(), str):
-                    newTaskList.append(task)
-                    break
+    def get_filtered_list_version(self) -> int:
+        """
+        Returns:
+            int: A number that grows every time something filtered_task_list depends on changes.
+                It is checked without filtering or sorting any task.
+        """
+        key = self.__get_filtered_list_key(TimePoint.now().as_int())
+        if key != self.__filteredListVersionKey:
+            self.__filteredListVersionKey = key
+            self.__filteredListVersion += 1
+        return self.__filteredListVersion
+
+    def __get_filtered_list_key(self, now: int) -> Tuple[Any, ...]:
+        # filters and heuristics depend on the current time, which they compare with minute precision at most
+        currentMinute = now // MINUTE_MS
+        return (
+            self.__taskListVersion,
+            len(self.__taskModelList),
+            TaskModel.modifications,
+            self.__selectedHeuristic,
+            self.__selectedAlgorithm,
+            tuple(self.__filterList),
+            currentMinute
+        )
+
+    def __compute_filtered_task_list(self, now: int) -> List[ITaskModel]:
+        newTaskList = self.__filter_tasks(now)
 
         if isinstance(self.__selectedHeuristic, tuple):
             heuristic: IHeuristic = self.__selectedHeuristic[1]
-            sortedTaskList: List[Tuple[ITaskModel, float]] = heuristic.sort(newTaskList)
+            sortedTaskList: List[Tuple[ITaskModel, float]] = heuristic.sortColumns(TaskColumns(newTaskList))
             newTaskList = [task for task, _ in sortedTaskList]
 
         if isinstance(self.__selectedAlgorithm, tuple):
@@ -75,6 +136,69 @@ class TelegramTaskListManager(ITaskListManager):
 
         return newTaskList
 
+    def __filter_tasks(self, now: int) -> List[ITaskModel]:
+        # every task is checked once against all the enabled filters, at the same current time
+        enabledFilters = CompositeFilter([filterr[1] for filterr in self.__filterList if filterr[2]])
+        candidates = self.__query_tasks(TaskQuery(openOnly=True, waiting=False))
+        return [task for task in candidates if not isinstance(task.getEventWaited(), str) and enabledFilters.accepts(task, now)]
+
+    def __query_tasks(self, query: TaskQuery) -> List[ITaskModel]:
+        """
+        Finds the tasks of the list that may meet the query, the callers still check its conditions.
+
+        The task provider answers with the tasks of its last list, which are used only if they all
+        belong to this list. Otherwise the whole list is returned to be scanned.
+
+        Params:
+            query: The conditions to meet.
+
+        Returns:
+            List[ITaskModel]: The tasks found, in task list order.
+        """
+        if self.__taskProvider is None:
+            return self.__taskModelList
+        tasks = self.__taskProvider.queryTasks(query)
+        if tasks is None:
+            return self.__taskModelList
+        if self.__taskModelIds is None:
+            self.__taskModelIds = {id(task) for task in self.__taskModelList}
+        taskModelIds = self.__taskModelIds
+        if not all(id(task) in taskModelIds for task in tasks):
+            return self.__taskModelList
+        return tasks
+
+    def __get_top_filtered_tasks(self, count: int) -> Tuple[List[ITaskModel], int]:
+        """
+        Returns the first tasks of filtered_task_list, only ordering as many tasks as needed.
+
+        The last step, the algorithm or else the heuristic, just selects the first tasks. When both
+        are selected the heuristic still sorts the whole list, since it is the order the algorithm
+        keeps for tasks it considers equal.
+
+        Params:
+            count: The amount of tasks to return.
+
+        Returns:
+            tuple: The first count tasks and the amount of tasks in filtered_task_list.
+        """
+        now = TimePoint.now().as_int()
+        if self.__get_filtered_list_key(now) == self.__filteredListKey:
+            self.__cacheHits += 1
+            return self.__filteredList[:count], len(self.__filteredList)
+
+        newTaskList = self.__filter_tasks(now)
+        columns = TaskColumns(newTaskList)
+
+        if isinstance(self.__selectedAlgorithm, tuple):
+            if isinstance(self.__selectedHeuristic, tuple):
+                newTaskList = [task for task, _ in self.__selectedHeuristic[1].sortColumns(columns)]
+            return self.__selectedAlgorithm[1].applyTop(newTaskList, count)
+
+        if isinstance(self.__selectedHeuristic, tuple):
+            return [task for task, _ in self.__selectedHeuristic[1].topColumns(columns, count)], len(newTaskList)
+
+        return newTaskList[:count], len(newTaskList)
+
     @property
     def selected_task(self) -> ITaskModel | None:
         return self.__selectedTask
@@ -108,7 +232,7 @@ class TelegramTaskListManager(ITaskListManager):
 
     def search_tasks(self, searchTerms: List[str]) -> "ITaskListManager":
         taskListSearched: list[ITaskModel] = []
-        for task in self.__taskModelList:
+        for task in self.__query_tasks(TaskQuery(openOnly=True, searchTerms=searchTerms)):
             for term in searchTerms:
                 if term.lower() in task.getDescription().lower() and task.getStatus() != "x":
                     taskListSearched.append(task)
@@ -128,10 +252,14 @@ class TelegramTaskListManager(ITaskListManager):
 
     def update_taskList(self, taskModelList: List[ITaskModel]) -> None:
         self.__taskModelList = taskModelList
+        self.__taskModelIds = None
+        self.__taskListVersion += 1
         self.__correctSelectedTask()
 
     def add_task(self, task: ITaskModel) -> None:
         self.__taskModelList.append(task)
+        self.__taskModelIds = None
+        self.__taskListVersion += 1
         self.__correctSelectedTask()
 
     def __correctSelectedTask(self) -> None:
@@ -207,12 +335,11 @@ class TelegramTaskListManager(ITaskListManager):
         Returns a dictionary with the content needed to render a task list.
         This includes algorithm information, heuristic information, tasks, pagination details, etc.
         """
-        task_list = self.filtered_task_list
-        
         # Get task details for the current page
         start_index = self.__taskListPage * self.__tasksPerPage
         end_index = (self.__taskListPage + 1) * self.__tasksPerPage
-        page_tasks = task_list[start_index:end_index]
+        top_tasks, total_tasks = self.__get_top_filtered_tasks(end_index)
+        page_tasks = top_tasks[start_index:end_index]
         
         # Format tasks with complete information
         tasks: list[TaskEntry] = []
@@ -238,7 +365,7 @@ class TelegramTaskListManager(ITaskListManager):
             ))
         
         # Get pagination information
-        total_pages = (len(task_list) + self.__tasksPerPage - 1) // self.__tasksPerPage if self.__tasksPerPage > 0 else 1
+        total_pages = (total_tasks + self.__tasksPerPage - 1) // self.__tasksPerPage if self.__tasksPerPage > 0 else 1
         current_page = self.__taskListPage + 1
         
         # Get algorithm information
@@ -265,7 +392,7 @@ class TelegramTaskListManager(ITaskListManager):
             algorithm_desc=algorithm_desc,
             sort_heuristic=sort_heuristic,
             tasks=tasks,
-            total_tasks=len(task_list),
+            total_tasks=total_tasks,
             current_page=current_page,
             total_pages=total_pages,
             active_filters=active_filters,
@@ -274,23 +401,26 @@ class TelegramTaskListManager(ITaskListManager):
 
     def __filter_current_tasks(self, tasks: List[ITaskModel]) -> List[ITaskModel]:
         current_tasks: List[ITaskModel] = []
+        now = TimePoint.now().as_int()
         for task in tasks:
-            if task.getStatus() != "x" and task.getStart().as_int() < TimePoint.now().as_int():
+            if task.getStatus() != "x" and task.getStart().as_int() < now:
                 current_tasks.append(task)
         return current_tasks
 
     def __sort_by_categories(self, tasks: List[ITaskModel], categories: list[dict[str, str]]) -> List[ITaskModel]:
+        prefixes = [category["prefix"] for category in categories]
+        # the agenda is always asked with the configured categories, so the trie and the contexts it matched are kept
+        if self.__categoryTrie is None or self.__categoryTrie.prefixes != prefixes:
+            self.__categoryTrie = ContextPrefixTrie(prefixes)
         sorted_tasks: List[ITaskModel] = []
-        for category in categories:
-            for task in tasks:
-                if task.getContext().startswith(category["prefix"]):
-                    sorted_tasks.append(task)
+        for group in self.__categoryTrie.groupTasks(tasks):
+            sorted_tasks.extend(group)
         return sorted_tasks
 
     def __filter_urgent_tasks(self, date: TimePoint) -> list[ITaskModel]:
         urgent_tasks: list[ITaskModel] = []
-        deadline: TimePoint = ((date + TimeAmount("1d")) + TimeAmount("-1s"))
-        for task in self.__taskModelList:
+        deadline: TimePoint = ((date + TimeAmount.from_days(1)) + TimeAmount.from_seconds(-1))
+        for task in self.__query_tasks(TaskQuery(openOnly=True, dueBefore=deadline.as_int(), calm=False, waiting=False)):
             if task.getDue().as_int() < deadline.as_int() and task.getStatus() != "x" and task.getCalm() is False and task.getEventWaited() is None:
                 urgent_tasks.append(task)
         return urgent_tasks
@@ -298,19 +428,24 @@ class TelegramTaskListManager(ITaskListManager):
     def __filter_and_sort_future_tasks(self, tasks: List[ITaskModel], date: TimePoint) -> List[ITaskModel]:
         sorted_tasks = sorted(tasks, key=lambda x: x.getStart().as_int())
         planned_tasks: List[ITaskModel] = []
-        deadline: TimePoint = ((date + TimeAmount("1d")) + TimeAmount("-1s"))
+        deadline: TimePoint = ((date + TimeAmount.from_days(1)) + TimeAmount.from_seconds(-1))
+        now = TimePoint.now().as_int()
         for task in sorted_tasks:
-            if task.getStart().as_int() > TimePoint.now().as_int() and task.getStart().as_int() < deadline.as_int():
+            if task.getStart().as_int() > now and task.getStart().as_int() < deadline.as_int():
                 planned_tasks.append(task)
         return planned_tasks
 
     def __filter_high_heuristic_tasks(self, urgent_tasks: List[ITaskModel]) -> List[ITaskModel]:
         high_heuristic_tasks: List[ITaskModel] = []
-        taskModelListTupled: List[Tuple[ITaskModel, float]] = self.__selectedHeuristic[1].sort(self.__taskModelList) if isinstance(self.__selectedHeuristic, tuple) else []
+        now = TimePoint.now().as_int()
+        tomorrow = TimePoint.tomorrow().as_int()
+        # only the tasks that may qualify are sorted, they keep the order they have in the whole sorted list
+        candidates = self.__query_tasks(TaskQuery(openOnly=True, startBefore=now, dueAfter=tomorrow - 1, calm=False, waiting=False))
+        taskModelListTupled: List[Tuple[ITaskModel, float]] = self.__selectedHeuristic[1].sortColumns(TaskColumns(candidates)) if isinstance(self.__selectedHeuristic, tuple) else []
         taskModelList: List[ITaskModel] = [task for task, _ in taskModelListTupled]
 
         for task in taskModelList:
-            if task not in urgent_tasks and task.getStatus() != "x" and task.getStart().as_int() < TimePoint.now().as_int() and task.getDue().as_int() >= TimePoint.tomorrow().as_int() and task.getCalm() is False and task.getEventWaited() is None:
+            if task not in urgent_tasks and task.getStatus() != "x" and task.getStart().as_int() < now and task.getDue().as_int() >= tomorrow and task.getCalm() is False and task.getEventWaited() is None:
                 high_heuristic_tasks.append(task)
 
         return high_heuristic_tasks
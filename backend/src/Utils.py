@@ -1,6 +1,7 @@
 from typing import TypeAlias
 from dataclasses import dataclass
 import typing
+import mmap
 
 from src.wrappers.TimeManagement import TimeAmount, TimePoint
 from dataclasses import asdict
@@ -9,6 +10,10 @@ TaskJsonElementType = dict[str, str]
 TaskJsonListType = list[TaskJsonElementType]
 ProjectJsonElementType = dict[str, str]
 ProjectJsonListType = list[ProjectJsonElementType]
+# raw content of a vault file, memory mapped when the file is not empty
+VaultFileBuffer = bytes | mmap.mmap
+# modification time in nanoseconds, size and inode of a file, changes whenever the file is written
+FileSignature = tuple[int, int, int]
 TaskJsonType: TypeAlias = dict[str, TaskJsonListType | ProjectJsonListType]
 
 FileContentString = str
@@ -16,6 +21,37 @@ FileContentJson = TaskJsonType  # StatisticsJsonType
 FileContent: TypeAlias = FileContentJson | FileContentString
 
 
+@dataclass
+class TaskQuery:
+    """
+    Conditions of a task query, the ones left as None are not checked.
+
+    Params:
+        openOnly: Skip completed tasks.
+        contextPrefix: The context must start with this prefix.
+        startBefore: The start must be lower than this timestamp.
+        startAfter: The start must be greater than this timestamp.
+        dueBefore: The due date must be lower than this timestamp.
+        dueAfter: The due date must be greater than this timestamp.
+        calm: The calm flag must have this value.
+        waiting: True for tasks waiting for any event, False for tasks not waiting for any.
+        waited: The task must be waiting for this event.
+        raised: The task must raise this event.
+        searchTerms: The description must contain any of these terms, ignoring case.
+    """
+    openOnly: bool = False
+    contextPrefix: str | None = None
+    startBefore: int | None = None
+    startAfter: int | None = None
+    dueBefore: int | None = None
+    dueAfter: int | None = None
+    calm: bool | None = None
+    waiting: bool | None = None
+    waited: str | None = None
+    raised: str | None = None
+    searchTerms: list[str] | None = None
+
+
 @dataclass
 class FilterEntry:
     name: str
@@ -1,4 +1,5 @@
-from typing import List
+import heapq
+from typing import List, Tuple
 
 from src.Interfaces.ITaskModel import ITaskModel
 from src.algorithms.Interfaces.IAlgorithm import IAlgorithm
@@ -29,15 +30,23 @@ class EdfAlgorithm(IAlgorithm):
         """
 
         sorted_tasks = sorted(taskList, key=lambda task: task.getDue().as_int())
+        self.__describe(sorted_tasks)
+        return sorted_tasks
+
+    def applyTop(self, taskList: List[ITaskModel], count: int) -> Tuple[List[ITaskModel], int]:
+        dues = [task.getDue().as_int() for task in taskList]
+        top_tasks = [taskList[i] for i in heapq.nsmallest(count, range(len(taskList)), key=dues.__getitem__)]
+        self.__describe(top_tasks, len(taskList))
+        return top_tasks, len(taskList)
+
+    def __describe(self, sorted_tasks: List[ITaskModel], task_count: int | None = None) -> None:
         # update description to tell the user which algorithm was used
         self.description = "Earliest Due Date (EDF) Algorithm"
         # and how many tasks were sorted
-        self.description += f" \n    - {len(sorted_tasks)} tasks sorted by due date"
+        self.description += f" \n    - {len(sorted_tasks) if task_count is None else task_count} tasks sorted by due date"
         # and when is the earliest deadline
         if sorted_tasks:
             self.description += f" \n    - Earliest deadline: {sorted_tasks[0].getDue()}"
 
-        return sorted_tasks
-
     def getDescription(self) -> str:
         return "This algorithm prioritizes tasks based on their due dates."
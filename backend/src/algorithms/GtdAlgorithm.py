@@ -4,6 +4,9 @@ from typing import List, Tuple
 from src.Interfaces.IFilter import IFilter
 from src.Interfaces.IHeuristic import IHeuristic
 from src.Interfaces.IStatisticsService import IStatisticsService
+from src.filters.ContextPrefixTaskFilter import ContextPrefixTaskFilter
+from src.filters.ContextPrefixTrie import ContextPrefixTrie
+from src.heuristics.TaskColumns import TaskColumns
 from src.wrappers.TimeManagement import TimePoint
 from src.Interfaces.ITaskModel import ITaskModel
 from src.algorithms.Interfaces.IAlgorithm import IAlgorithm
@@ -36,6 +39,7 @@ class GtdAlgorithm(IAlgorithm):
         self.baseDescription = "GTD Task Algorithm"
         self.description = self.baseDescription
         self.category = "all"
+        self.categoryTrie, self.categoryPrefilter = self._buildCategoryTrie(orderedCategories)
     pass
 
     def apply(self, taskList: List[ITaskModel]) -> List[ITaskModel]:
@@ -53,6 +57,8 @@ class GtdAlgorithm(IAlgorithm):
 
         # get all task with due date before now
         nonCalm = self._filterCalmTasks(taskList)
+        # every heuristic below evaluates the non calm tasks, their fields are read once for all of them
+        columns = TaskColumns(nonCalm)
         retval = self._filterUrgents(nonCalm)
         retval = self._filterOrderedCategories(retval)
 
@@ -62,7 +68,7 @@ class GtdAlgorithm(IAlgorithm):
 
         # get all task with heuristic value above threshold and NOT calm
         for heuristic, threshold in self.orderedHeuristics:
-            retval = self._filterByHeuristic(heuristic, threshold, nonCalm)
+            retval = self._filterByHeuristic(heuristic, threshold, columns)
             retval = self._filterOrderedCategories(retval)
             if len(retval) > 0:
                 self.description = f"{self.baseDescription} \n    - {heuristic.__class__.__name__} >= {threshold} ({self.category})"
@@ -73,7 +79,7 @@ class GtdAlgorithm(IAlgorithm):
         workStats = self.statisticService.getWorkloadStats(nonCalm)
         if workStats.workDone.get(isoformatDate, 0.0) < workStats.workload.as_pomodoros():
             heuristic, threshold = self.defaultHeuristic
-            retval = self._filterByHeuristic(heuristic, threshold, nonCalm)
+            retval = self._filterByHeuristic(heuristic, threshold, columns)
             self.description = f"{self.baseDescription} \n    - {heuristic.__class__.__name__} >= {threshold} ({self.category})"
         else:
             return self.use_calm_instead(taskList)
@@ -95,12 +101,38 @@ class GtdAlgorithm(IAlgorithm):
 
     def _filterUrgents(self, tasks: List[ITaskModel]) -> list[ITaskModel]:
         retval: list[ITaskModel] = []
+        now = TimePoint.now().as_int()
         for task in tasks:
-            if task.getDue().as_int() < TimePoint.now().as_int():
+            if task.getDue().as_int() < now:
                 retval.append(task)
         return retval
 
+    def _buildCategoryTrie(self, orderedCategories: list[tuple[str, IFilter, bool]]) -> Tuple[ContextPrefixTrie | None, IFilter | None]:
+        """
+        Builds the trie of the category prefixes, when every category is a context prefix filter
+        and all of them share the same prefilter.
+
+        Returns:
+            tuple: The trie and the shared prefilter, or None when the categories are other filters.
+        """
+        prefixFilters = [category for _, category, _ in orderedCategories if isinstance(category, ContextPrefixTaskFilter)]
+        if len(prefixFilters) == 0 or len(prefixFilters) != len(orderedCategories):
+            return None, None
+        prefilter = prefixFilters[0].getPrefilter()
+        if any(category.getPrefilter() is not prefilter for category in prefixFilters):
+            return None, None
+        return ContextPrefixTrie([category.prefix for category in prefixFilters]), prefilter
+
     def _filterOrderedCategories(self, tasks: list[ITaskModel]) -> list[ITaskModel]:
+        if self.categoryTrie is not None:
+            # the tasks are grouped by category in a single pass, the first category with tasks is chosen
+            preTasks = self.categoryPrefilter.filter(tasks) if isinstance(self.categoryPrefilter, IFilter) else tasks
+            for (description, _, _), categoryTasks in zip(self.orderedCategories, self.categoryTrie.groupTasks(preTasks)):
+                if len(categoryTasks) > 0:
+                    self.category = description
+                    return categoryTasks
+            return []
+
         filteredTasks = []
         for description, category, _ in self.orderedCategories:
             filteredTasks = category.filter(tasks)
@@ -111,10 +143,10 @@ class GtdAlgorithm(IAlgorithm):
                 break
         return filteredTasks
 
-    def _filterByHeuristic(self, heuristic: IHeuristic, threshold: float, tasks: list[ITaskModel]) -> list[ITaskModel]:
+    def _filterByHeuristic(self, heuristic: IHeuristic, threshold: float, columns: TaskColumns) -> list[ITaskModel]:
         retval: list[ITaskModel] = []
-        for task in tasks:
-            if heuristic.evaluate(task) >= threshold:
+        for task, value in zip(columns.tasks, heuristic.evaluateColumns(columns)):
+            if value >= threshold:
                 retval.append(task)
         return retval
 
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 
 from src.Interfaces.IHeuristic import IHeuristic
 from src.Interfaces.ITaskModel import ITaskModel
@@ -28,5 +28,9 @@ class HeuristicAlgorithm(IAlgorithm):
         sorted_tasks = [task for task, _ in sorted_tasks_with_values]
         return sorted_tasks
 
+    def applyTop(self, taskList: List[ITaskModel], count: int) -> Tuple[List[ITaskModel], int]:
+        top_tasks_with_values = self.heuristic.top(taskList, count)
+        return [task for task, _ in top_tasks_with_values], len(taskList)
+
     def getDescription(self) -> str:
         return "Algorithm that uses a heuristic to sort tasks."
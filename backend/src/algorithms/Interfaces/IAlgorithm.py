@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 
 from src.Interfaces.ITaskModel import ITaskModel
 
@@ -23,6 +23,21 @@ class IAlgorithm(ABC):
         """
         pass
 
+    def applyTop(self, taskList: List[ITaskModel], count: int) -> Tuple[List[ITaskModel], int]:
+        """
+        Execute the algorithm, keeping only the first tasks of its result.
+        Algorithms that sort the task list select the first tasks without sorting the rest.
+
+        Args:
+            taskList (List[ITaskModel]): The list of tasks to be processed by the algorithm.
+            count (int): The amount of tasks to keep.
+
+        Returns:
+            Tuple[List[ITaskModel], int]: The first count tasks apply would return, and the amount of tasks it would return.
+        """
+        sortedTasks = self.apply(taskList)
+        return sortedTasks[:count], len(sortedTasks)
+
     @abstractmethod
     def getDescription(self) -> str:
         """
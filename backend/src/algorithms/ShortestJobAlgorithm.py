@@ -1,4 +1,5 @@
-from typing import List
+import heapq
+from typing import List, Tuple
 
 from src.Interfaces.ITaskModel import ITaskModel
 from src.algorithms.Interfaces.IAlgorithm import IAlgorithm
@@ -34,5 +35,14 @@ class ShortestJobAlgorithm(IAlgorithm):
 
         return sorted_tasks
 
+    def applyTop(self, taskList: List[ITaskModel], count: int) -> Tuple[List[ITaskModel], int]:
+        costs = [task.getTotalCost().as_pomodoros() for task in taskList]
+        top_tasks = [taskList[i] for i in heapq.nsmallest(count, range(len(taskList)), key=costs.__getitem__)]
+
+        self.description = "Shortest Job First (SJF) Algorithm"
+        self.description += f" \n    - {len(taskList)} tasks sorted by execution time"
+
+        return top_tasks, len(taskList)
+
     def getDescription(self) -> str:
         return "This algorithm prioritizes tasks based on their execution time."
@@ -15,6 +15,8 @@ from src.wrappers.ShellUserCommService import ShellUserCommService
 from src.wrappers.HttpUserCommService import HttpUserCommService
 from src.taskproviders.TaskProvider import TaskProvider
 from src.taskjsonproviders.TaskJsonProvider import TaskJsonProvider
+from src.taskjsonproviders.JournalTaskJsonProvider import JournalTaskJsonProvider
+from src.taskjsonproviders.SqliteTaskJsonProvider import SqliteTaskJsonProvider
 from src.HeuristicScheduling import HeuristicScheduling
 from src.filters.ActiveTaskFilter import ActiveTaskFilter
 from src.TelegramReportingService import TelegramReportingService
@@ -25,7 +27,7 @@ from src.filters.ContextPrefixTaskFilter import ContextPrefixTaskFilter
 from src.filters.ActiveTaskFilter import InactiveTaskFilter
 from src.heuristics.DaysToThresholdHeuristic import DaysToThresholdHeuristic
 from src.StatisticsService import StatisticsService
-from src.FileBroker import FileBroker
+from src.FileBroker import FileBroker, DEFAULT_IGNORED_VAULT_DIRS
 from src.filters.WorkloadAbleFilter import WorkloadAbleFilter
 from src.ProjectManager import ObsidianProjectManager
 from src.JsonProjectManager import JsonProjectManager
@@ -96,7 +98,7 @@ class TelegramReportingServiceContainer():
 
         # ask the user for an app mode
         appMode = None
-        while appMode not in ["1", "2", "3", "4", "5", "6"]:
+        while appMode not in ["1", "2", "3", "4", "5", "6", "7", "8", "9"]:
             print("Please select an app mode:")
             print("\t1 - Obsidian (cmd)")
             print("\t2 - JSON file (cmd)")
@@ -104,6 +106,9 @@ class TelegramReportingServiceContainer():
             print("\t4 - Obsidian (telegram)")
             print("\t5 - JSON file (HTTP)")
             print("\t6 - Obsidian (HTTP)")
+            print("\t7 - SQLite database (cmd)")
+            print("\t8 - SQLite database (telegram)")
+            print("\t9 - SQLite database (HTTP)")
             appMode = input("App mode: ")
         defaultConfig["APP_MODE"] = appMode
 
@@ -114,7 +119,7 @@ class TelegramReportingServiceContainer():
             jsonPath = "."
         defaultConfig["JSON_PATH"] = jsonPath
 
-        if appMode in ["3", "4"]:
+        if appMode in ["3", "4", "8"]:
             # ask the user for a telegram bot token
             telegramToken = input("Please enter the telegram bot token: ")
             defaultConfig["TELEGRAM_BOT_TOKEN"] = telegramToken
@@ -123,7 +128,7 @@ class TelegramReportingServiceContainer():
             telegramChatId = input("Please enter the telegram chat id: ")
             defaultConfig["TELEGRAM_CHAT_ID"] = telegramChatId
 
-        if appMode in ["5", "6"]:
+        if appMode in ["5", "6", "9"]:
             # ask the user for HTTP configuration
             httpUrl = input("Please enter the HTTP server URL (default: 0.0.0.0): ") or "0.0.0.0"
             defaultConfig["HTTP_URL"] = httpUrl
@@ -211,9 +216,10 @@ class TelegramReportingServiceContainer():
 
         # Configuration values
         configMode: int = int(self.tryGetConfig("APP_MODE", required=True) or "")
-        telegramMode = configMode in [3, 4]
-        httpMode = configMode in [5, 6]
+        telegramMode = configMode in [3, 4, 8]
+        httpMode = configMode in [5, 6, 9]
         obsidianMode = configMode in [1, 4, 6]
+        sqliteMode = configMode in [7, 8, 9]
 
         jsonPath = self.tryGetConfig("JSON_PATH", required=True)
 
@@ -227,6 +233,10 @@ class TelegramReportingServiceContainer():
 
         appdata = self.tryGetConfig("APPDATA", obsidianMode, default="NULL_APPDATA")
         vaultPath = self.tryGetConfig("OBSIDIAN_VAULT_PATH", obsidianMode, default="NULL_VAULT_PATH")
+        vaultParseWorkers = int(self.tryGetConfig("VAULT_PARSE_WORKERS", required=False, default="1") or "1")
+        tasksStorage = self.tryGetConfig("TASKS_STORAGE", required=False, default="json")
+        tasksFlushDelay = float(self.tryGetConfig("TASKS_FLUSH_DELAY", required=False, default="2") or "2")
+        ignoredVaultDirs = self.tryGetConfig("VAULT_IGNORED_DIRS", required=False, default=",".join(DEFAULT_IGNORED_VAULT_DIRS))
 
         dedicationTime = TimeAmount(self.tryGetConfig("DEDICATION_TIME", required=False, default="2p"))
         categoriesConfigOption = self.config.jsonConfig.categories()
@@ -245,7 +255,7 @@ class TelegramReportingServiceContainer():
         self.container.bot = providers.Singleton(telegram.Bot, token=token)
 
         # Data providers
-        self.container.fileBroker = providers.Singleton(FileBroker, jsonPath, appdata, vaultPath)
+        self.container.fileBroker = providers.Singleton(FileBroker, jsonPath, appdata, vaultPath, [directory.strip() for directory in ignoredVaultDirs.split(",") if directory.strip() != ""])
 
         # User communication services
         botId: IAgent = BotAgent(id="TaskManagerBot", name="Task Manager Bot", description="Bot for managing tasks")
@@ -263,11 +273,16 @@ class TelegramReportingServiceContainer():
             self.container.userCommService = self.container.shellUserCommService
 
         if obsidianMode:
-            self.container.taskJsonProvider = providers.Singleton(ObsidianVaultTaskJsonProvider, self.container.fileBroker, taskDiscoveryPolicies)
+            self.container.taskJsonProvider = providers.Singleton(ObsidianVaultTaskJsonProvider, self.container.fileBroker, taskDiscoveryPolicies, vaultParseWorkers, True)
             self.container.taskProvider = providers.Singleton(ObsidianTaskProvider, self.container.taskJsonProvider, self.container.fileBroker)
         else:
-            self.container.taskJsonProvider = providers.Singleton(TaskJsonProvider, self.container.fileBroker)
-            self.container.taskProvider = providers.Singleton(TaskProvider, self.container.taskJsonProvider, self.container.fileBroker)
+            if sqliteMode:
+                self.container.taskJsonProvider = providers.Singleton(SqliteTaskJsonProvider, self.container.fileBroker)
+            elif tasksStorage == "journal":
+                self.container.taskJsonProvider = providers.Singleton(JournalTaskJsonProvider, self.container.fileBroker)
+            else:
+                self.container.taskJsonProvider = providers.Singleton(TaskJsonProvider, self.container.fileBroker)
+            self.container.taskProvider = providers.Singleton(TaskProvider, self.container.taskJsonProvider, self.container.fileBroker, False, tasksFlushDelay)
         # Heuristics
         self.container.remainingEffortHeuristic = providers.Factory(RemainingEffortHeuristic, dedicationTime)
         self.container.daysToThresholdHeuristic = providers.Factory(DaysToThresholdHeuristic, dedicationTime)
@@ -329,7 +344,7 @@ class TelegramReportingServiceContainer():
         self.container.heristicScheduling = providers.Singleton(HeuristicScheduling, dedicationTime, self.container.taskProvider)
 
         # Task Manager
-        self.container.taskListManager = providers.Singleton(TelegramTaskListManager, self.container.taskProvider().getTaskList(), self.container.algorithmList, self.container.heuristicList, self.container.filterList, self.container.statisticsService)
+        self.container.taskListManager = providers.Singleton(TelegramTaskListManager, self.container.taskProvider().getTaskList(), self.container.algorithmList, self.container.heuristicList, self.container.filterList, self.container.statisticsService, taskProvider=self.container.taskProvider)
 
         # Project Manager
         if obsidianMode:
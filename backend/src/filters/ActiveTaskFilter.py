@@ -6,23 +6,16 @@ from ..Interfaces.IFilter import IFilter
 from ..Interfaces.ITaskModel import ITaskModel
 
 
-def filter(tasks: list[ITaskModel], invert: bool) -> List[ITaskModel]:
-    retval: List[ITaskModel] = []
-
-    for task in tasks:
-        startTime = task.getStart().datetime_representation
-        currentTime = TimePoint.now().datetime_representation
-        status = task.getStatus()
-
-        isTaskActived = (startTime.timestamp() <= currentTime.timestamp()) ^ invert
+def isActive(task: ITaskModel, currentTime: int, invert: bool) -> bool:
+    # if the task start time is before the current time, it is an active task
+    isTaskActived = (task.getStart().as_int() <= currentTime) ^ invert
+    return isTaskActived and task.getStatus() == " "
 
-        # if the task start time is before the current time, it is an active task
-        if isTaskActived and status == " ":
-            retval.append(task)
-        else:
-            continue
 
-    return retval
+def filter(tasks: list[ITaskModel], invert: bool) -> List[ITaskModel]:
+    # read the clock once, every task is compared with the same current time
+    currentTime = TimePoint.now().as_int()
+    return [task for task in tasks if isActive(task, currentTime, invert)]
 
 
 class ActiveTaskFilter(IFilter):
@@ -30,6 +23,9 @@ class ActiveTaskFilter(IFilter):
     def filter(self, tasks: list[ITaskModel]) -> List[ITaskModel]:
         return filter(tasks, False)
 
+    def accepts(self, task: ITaskModel, now: int) -> bool:
+        return isActive(task, now, False)
+
     def getDescription(self) -> str:
         return "Active tasks"
 
@@ -39,5 +35,8 @@ class InactiveTaskFilter(IFilter):
     def filter(self, tasks: list[ITaskModel]) -> List[ITaskModel]:
         return filter(tasks, True)
 
+    def accepts(self, task: ITaskModel, now: int) -> bool:
+        return isActive(task, now, True)
+
     def getDescription(self) -> str:
         return "Inactive tasks"
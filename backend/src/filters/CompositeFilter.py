@@ -0,0 +1,121 @@
+from typing import Callable, List
+
+from ..wrappers.TimeManagement import TimePoint
+
+from ..Interfaces.IFilter import IFilter
+from ..Interfaces.ITaskModel import ITaskModel
+from .ContextPrefixTaskFilter import ContextPrefixTaskFilter
+from .ContextPrefixTrie import ContextPrefixTrie
+
+
+def checksOwnCondition(filterr: IFilter) -> bool:
+    """
+    Params:
+        filterr: The filter to inspect, filters not deriving from IFilter are accepted too.
+
+    Returns:
+        bool: True if the accepts of the filter checks only its own condition, without its prefilter.
+    """
+    return isinstance(filterr, IFilter) and getattr(type(filterr), "accepts", None) is not IFilter.accepts
+
+
+def acceptsOf(filterr: IFilter) -> Callable[[ITaskModel, int], bool]:
+    """
+    Params:
+        filterr: The filter to check the tasks against.
+
+    Returns:
+        Callable[[ITaskModel, int], bool]: Checks a task at the given current time. Filters that
+        only implement filter are checked through it, prefilter included.
+    """
+    if checksOwnCondition(filterr):
+        return filterr.accepts
+    return lambda task, now: bool(filterr.filter([task]))
+
+
+class FilterNode:
+    """
+    A filter of a CompositeFilter, together with the filters that have it as prefilter.
+    """
+    __slots__ = ("filter", "accepts", "children", "isLeaf", "prefixes")
+
+    def __init__(self, filterr: IFilter | None):
+        self.filter = filterr
+        # the root holds no filter, every task passes it
+        self.accepts: Callable[[ITaskModel, int], bool] = acceptsOf(filterr) if filterr is not None else (lambda task, now: True)
+        self.children: List[FilterNode] = []
+        # the filter was given to the CompositeFilter, not only used as prefilter of others
+        self.isLeaf = False
+        # context prefix filters among the children, checked together with a single lookup
+        self.prefixes: ContextPrefixTrie | None = None
+
+    def groupPrefixes(self) -> None:
+        prefixes: List[str] = []
+        otherChildren: List[FilterNode] = []
+        for child in self.children:
+            if child.isLeaf and isinstance(child.filter, ContextPrefixTaskFilter):
+                prefixes.append(child.filter.prefix)
+            else:
+                otherChildren.append(child)
+        if len(prefixes) > 1:
+            self.prefixes = ContextPrefixTrie(prefixes)
+            self.children = otherChildren
+        for child in self.children:
+            child.groupPrefixes()
+
+
+class CompositeFilter(IFilter):
+    """
+    Keeps the tasks that pass any of the given filters, checking each task only once.
+
+    Filters that share a prefilter are grouped under it, so the prefilter is checked once per task
+    instead of once per filter, and the filters under it are skipped when the task does not pass it.
+    The context prefix filters under the same prefilter are looked up together in a ContextPrefixTrie.
+    The checks stop at the first filter the task passes, and every task is compared with the same
+    current time.
+    """
+
+    def __init__(self, filters: List[IFilter]):
+        self.filters = filters
+        self.__root = FilterNode(None)
+        for filterr in filters:
+            self.__addFilter(filterr)
+        self.__root.groupPrefixes()
+
+    def __addFilter(self, filterr: IFilter) -> None:
+        # a filter checking its prefilter by itself is the first of its chain
+        chain: List[IFilter] = [filterr]
+        while checksOwnCondition(chain[0]):
+            prefilter = chain[0].getPrefilter()
+            if not isinstance(prefilter, IFilter):
+                break
+            chain.insert(0, prefilter)
+
+        nodes = self.__root.children
+        node: FilterNode | None = None
+        for link in chain:
+            node = next((child for child in nodes if child.filter is link), None)
+            if node is None:
+                node = FilterNode(link)
+                nodes.append(node)
+            nodes = node.children
+        assert node is not None
+        node.isLeaf = True
+
+    def filter(self, tasks: List[ITaskModel]) -> List[ITaskModel]:
+        now = TimePoint.now().as_int()
+        return [task for task in tasks if self.accepts(task, now)]
+
+    def accepts(self, task: ITaskModel, now: int) -> bool:
+        return self.__acceptsAny(self.__root, task, now)
+
+    def __acceptsAny(self, parent: FilterNode, task: ITaskModel, now: int) -> bool:
+        if parent.prefixes is not None and parent.prefixes.matchesAny(task.getContext()):
+            return True
+        for node in parent.children:
+            if node.filter is not None and node.accepts(task, now) and (node.isLeaf or self.__acceptsAny(node, task, now)):
+                return True
+        return False
+
+    def getDescription(self) -> str:
+        return " or ".join(filterr.getDescription() for filterr in self.filters)
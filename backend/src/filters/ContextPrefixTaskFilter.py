@@ -22,5 +22,11 @@ class ContextPrefixTaskFilter(IFilter):
 
         return retval
 
+    def getPrefilter(self) -> IFilter | None:
+        return self.prefilter if isinstance(self.prefilter, IFilter) else None
+
+    def accepts(self, task: ITaskModel, now: int) -> bool:
+        return task.getContext().startswith(self.prefix)
+
     def getDescription(self) -> str:
         return "Tasks with context starting with " + self.prefix
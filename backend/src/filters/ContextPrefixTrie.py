@@ -0,0 +1,82 @@
+from typing import Dict, List, Tuple
+
+from ..Interfaces.ITaskModel import ITaskModel
+
+# contexts whose matches are remembered, the cache is emptied when it grows beyond this
+MATCH_CACHE_SIZE = 4096
+
+
+class PrefixNode:
+    __slots__ = ("children", "indices")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, PrefixNode] = {}
+        # positions of the prefixes that end in this node
+        self.indices: List[int] = []
+
+
+class ContextPrefixTrie:
+    """
+    Finds which of the configured category prefixes a context starts with, walking the context
+    once instead of comparing it with every prefix.
+
+    The prefixes a context matches are remembered, so the tasks of a context are assigned their
+    categories once, and a task that changes its context is looked up again by its new context.
+    """
+
+    def __init__(self, prefixes: List[str]):
+        self.prefixes = prefixes
+        self.__root = PrefixNode()
+        self.__matches: Dict[str, Tuple[int, ...]] = {}
+        for index, prefix in enumerate(prefixes):
+            node = self.__root
+            for char in prefix:
+                node = node.children.setdefault(char, PrefixNode())
+            node.indices.append(index)
+
+    def getMatches(self, context: str) -> Tuple[int, ...]:
+        """
+        Params:
+            context: The context of a task.
+
+        Returns:
+            tuple: The positions of the prefixes the context starts with, in the order of the prefixes.
+        """
+        matches = self.__matches.get(context)
+        if matches is not None:
+            return matches
+
+        found = list(self.__root.indices)
+        node = self.__root
+        for char in context:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+            found.extend(node.indices)
+        matches = tuple(sorted(found))
+
+        if len(self.__matches) >= MATCH_CACHE_SIZE:
+            self.__matches.clear()
+        self.__matches[context] = matches
+        return matches
+
+    def matchesAny(self, context: str) -> bool:
+        return len(self.getMatches(context)) > 0
+
+    def groupTasks(self, tasks: List[ITaskModel]) -> List[List[ITaskModel]]:
+        """
+        Groups the tasks by the prefixes their context starts with. A task whose context starts
+        with several prefixes is in the group of each of them.
+
+        Params:
+            tasks: The tasks to group.
+
+        Returns:
+            list: The tasks of each prefix, in the order of the prefixes, keeping the order of the tasks.
+        """
+        groups: List[List[ITaskModel]] = [[] for _ in self.prefixes]
+        for task in tasks:
+            for index in self.getMatches(task.getContext()):
+                groups[index].append(task)
+        return groups
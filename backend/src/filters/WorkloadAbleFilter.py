@@ -16,5 +16,11 @@ class WorkloadAbleFilter(IFilter):
                 workloadAbleTasks.append(task)
         return workloadAbleTasks
 
+    def getPrefilter(self) -> IFilter | None:
+        return self.activeFilter
+
+    def accepts(self, task: ITaskModel, now: int) -> bool:
+        return task.calculateRemainingTime().as_days() >= 1.0
+
     def getDescription(self) -> str:
         return "Non-urgent tasks"
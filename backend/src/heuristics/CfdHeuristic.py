@@ -1,27 +1,48 @@
-from typing import List, Tuple
+from typing import List
 
-from src.wrappers.TimeManagement import TimeAmount, TimePoint
+from src.wrappers.TimeManagement import DAY_MS, SECOND_MS, TimeAmount, TimePoint
 from ..Interfaces.IHeuristic import IHeuristic
 from ..Interfaces.ITaskModel import ITaskModel
+from .TaskColumns import TaskColumns, numpy
 
 
 class CfdHeuristic(IHeuristic):
 
+    sortDescending = False
+
     def __init__(self, dedication: TimeAmount, daysOffset: int = 0):
         self.dedication = dedication
         self.daysOffset = daysOffset
 
-    def sort(self, tasks: List[ITaskModel]) -> List[Tuple[ITaskModel, float]]:
-        pomodorosPerDay = self.dedication.as_pomodoros()
-        retval = [(task, self.fastEvaluate(task, pomodorosPerDay)) for task in tasks]
-        retval.sort(key=lambda x: x[1], reverse=False)
-        return retval
+    def evaluateColumns(self, columns: TaskColumns) -> List[float]:
+        ppd = self.dedication.as_pomodoros()
+        # every task of the list is evaluated against the same day
+        today = int(columns.today.timestamp)
+        if columns.vectorized:
+            nice, start, invested = columns.vectors(columns.getSeverity(), columns.getStart(), columns.getInvestedEffort())
+            daysActive = ((today - (start / 1e3).astype(numpy.int64)) * SECOND_MS / DAY_MS).astype(numpy.int64)
+            # the period only depends on the severity, which only takes a few values
+            severities, severityIndex = numpy.unique(nice, return_inverse=True)
+            severityPeriods = numpy.array([TimeAmount.from_pomodoros(severity / ppd).as_pomodoros() for severity in severities.tolist()], dtype=numpy.float64)
+            return list((invested / (1 + daysActive / severityPeriods[severityIndex])).tolist())
+        # the period only depends on the severity, which only takes a few values
+        periods: dict[float, float] = {}
+        values: List[float] = []
+        for nice, start, invested in zip(columns.getSeverity(), columns.getStart(), columns.getInvestedEffort()):
+            daysActive = int((today - int(start / 1e3)) * SECOND_MS / DAY_MS)
+            period = periods.get(nice)
+            if period is None:
+                period = periods[nice] = TimeAmount.from_pomodoros(nice / ppd).as_pomodoros()
+            divisor = 1 + daysActive / period
+            values.append(invested / divisor)
+        return values
 
-    def fastEvaluate(self, task: ITaskModel, pomodorosPerDay: float) -> float:
+    def fastEvaluate(self, task: ITaskModel, pomodorosPerDay: float, today: TimePoint | None = None) -> float:
         ppd = pomodorosPerDay
         nice = task.getSeverity()
-        daysActive = TimeAmount(f"{int(TimePoint.today().timestamp) - int(task.getStart().timestamp)}s").as_days()
-        period = TimeAmount(f"{nice / ppd}p").as_pomodoros()
+        today = TimePoint.today() if today is None else today
+        daysActive = TimeAmount.from_seconds(int(today.timestamp) - int(task.getStart().timestamp)).as_days()
+        period = TimeAmount.from_pomodoros(nice / ppd).as_pomodoros()
         divisor = 1 + daysActive / period
 
         return task.getInvestedEffort().as_pomodoros() / divisor
@@ -1,22 +1,28 @@
 from math import ceil
-from typing import List, Tuple
+from typing import List
 
 from ..wrappers.TimeManagement import TimeAmount
+from .TaskColumns import TaskColumns
 from ..Interfaces.IHeuristic import IHeuristic
 from ..Interfaces.ITaskModel import ITaskModel
 
 
 class DaysToThresholdHeuristic(IHeuristic):
 
+    sortDescending = False
+
     def __init__(self, dedication: TimeAmount, threshold: float):
         self.dedication = dedication
         self.threshold = threshold
 
-    def sort(self, tasks: List[ITaskModel]) -> List[Tuple[ITaskModel, float]]:
-        pomodorosPerDay = self.dedication.as_pomodoros()
-        retval = [(task, self.fastEvaluate(task, pomodorosPerDay)) for task in tasks]
-        retval.sort(key=lambda x: x[1], reverse=False)
-        return retval
+    def evaluateColumns(self, columns: TaskColumns) -> List[float]:
+        p = self.dedication.as_pomodoros()
+        w = 1
+        h = self.threshold
+        if columns.vectorized:
+            s, r, d = columns.vectors(columns.getSeverity(), columns.getTotalCost(), columns.getRemainingDays())
+            return list((d - (r * (p * s * w + h)) / (h * p)).tolist())
+        return [d - (r * (p * s * w + h)) / (h * p) for s, r, d in zip(columns.getSeverity(), columns.getTotalCost(), columns.getRemainingDays())]
 
     def fastEvaluate(self, task: ITaskModel, pomodorosPerDay: float) -> float:
         p = pomodorosPerDay
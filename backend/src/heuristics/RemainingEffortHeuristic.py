@@ -1,20 +1,26 @@
-from typing import List, Tuple
+from typing import List
 from ..Interfaces.IHeuristic import IHeuristic
 from ..Interfaces.ITaskModel import ITaskModel
 from ..wrappers.TimeManagement import TimeAmount
+from .TaskColumns import TaskColumns
 
 
 class RemainingEffortHeuristic(IHeuristic):
 
+    sortDescending = True
+
     def __init__(self, dedication: TimeAmount, desiredH: float):
         self.dedication = dedication
         self.desiredH = desiredH
 
-    def sort(self, tasks: List[ITaskModel]) -> List[Tuple[ITaskModel, float]]:
-        pomodorosPerDay = self.dedication.as_pomodoros()
-        retval = [(task, self.fastEvaluate(task, pomodorosPerDay)) for task in tasks]
-        retval.sort(key=lambda x: x[1], reverse=True)
-        return retval
+    def evaluateColumns(self, columns: TaskColumns) -> List[float]:
+        p = self.dedication.as_pomodoros()
+        w = 1
+        dr = self.desiredH
+        if columns.vectorized:
+            s, r, d = columns.vectors(columns.getSeverity(), columns.getTotalCost(), columns.getRemainingDays())
+            return list((r - ((dr * d * p) / (p * s * w + dr))).tolist())
+        return [r - ((dr * d * p) / (p * s * w + dr)) for s, r, d in zip(columns.getSeverity(), columns.getTotalCost(), columns.getRemainingDays())]
 
     def evaluate(self, task: ITaskModel) -> float:
         p = self.dedication.as_pomodoros()
@@ -33,7 +39,7 @@ class RemainingEffortHeuristic(IHeuristic):
 
     def getComment(self, task: ITaskModel) -> str:
         remaining_effort = self.evaluate(task)
-        time_amount = TimeAmount(str(remaining_effort) + "p")
+        time_amount = TimeAmount.from_pomodoros(remaining_effort)
         return str(time_amount)
         
     def getDescription(self) -> str:
@@ -1,20 +1,38 @@
-from typing import List, Tuple
+from typing import List
 from ..Interfaces.IHeuristic import IHeuristic
 from ..Interfaces.ITaskModel import ITaskModel
 from ..wrappers.TimeManagement import TimeAmount
+from .TaskColumns import TaskColumns, numpy
 
 
 class SlackHeuristic(IHeuristic):
 
+    sortDescending = True
+
     def __init__(self, dedication: TimeAmount, daysOffset: int = 0):
         self.dedication = dedication
         self.daysOffset = daysOffset
 
-    def sort(self, tasks: List[ITaskModel]) -> List[Tuple[ITaskModel, float]]:
-        pomodorosPerDay = self.dedication.as_pomodoros()
-        retval = [(task, self.fastEvaluate(task, pomodorosPerDay)) for task in tasks]
-        retval.sort(key=lambda x: x[1], reverse=True)
-        return retval
+    def evaluateColumns(self, columns: TaskColumns) -> List[float]:
+        p = self.dedication.as_pomodoros()
+        w = 1
+        if columns.vectorized:
+            s, r, remainingDays = columns.vectors(columns.getSeverity(), columns.getTotalCost(), columns.getRemainingDays())
+            d = remainingDays - self.daysOffset
+            divisor = p * d - r
+            invalid = (d < 1) | (divisor == 0)
+            h = (p * w * s * r) / numpy.where(invalid, 1, divisor)
+            return list(numpy.where(invalid | (h <= 0), 100, columns.round(h, 2)).tolist())
+        values: List[float] = []
+        for s, r, remainingDays in zip(columns.getSeverity(), columns.getTotalCost(), columns.getRemainingDays()):
+            d = remainingDays - self.daysOffset
+            divisor = p * d - r
+            if d < 1 or divisor == 0:
+                values.append(100)
+                continue
+            h = (p * w * s * r) / divisor
+            values.append(round(h, 2) if h > 0 else 100)
+        return values
 
     def fastEvaluate(self, task: ITaskModel, pomodorosPerDay: float) -> float:
         p = pomodorosPerDay
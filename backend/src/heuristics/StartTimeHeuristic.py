@@ -1,8 +1,9 @@
 from src.Interfaces.IHeuristic import IHeuristic
 from src.Interfaces.ITaskModel import ITaskModel
+from src.heuristics.TaskColumns import TaskColumns
 
 
-from typing import List, Tuple
+from typing import List
 
 
 class StartTimeHeuristic(IHeuristic):
@@ -11,13 +12,16 @@ class StartTimeHeuristic(IHeuristic):
     It's intended used is to create FIFO queues based on the start time of tasks.
     """
 
+    sortDescending = False
+
     def __init__(self) -> None:
         pass
 
-    def sort(self, tasks: List[ITaskModel]) -> List[Tuple[ITaskModel, float]]:
-        retval = [(task, self.evaluate(task)) for task in tasks]
-        retval.sort(key=lambda x: x[1], reverse=False)
-        return retval
+    def evaluateColumns(self, columns: TaskColumns) -> List[float]:
+        if columns.vectorized:
+            start, = columns.vectors(columns.getStart())
+            return list((start / 1000.0).tolist())
+        return [start / 1000.0 for start in columns.getStart()]
 
     def evaluate(self, task: ITaskModel) -> float:
         return task.getStart().as_int() / 1000.0
@@ -0,0 +1,131 @@
+import heapq
+from array import array
+from typing import Any, List, Sequence, Tuple
+
+from ..Interfaces.ITaskModel import ITaskModel
+from ..wrappers.TimeManagement import TimePoint
+
+# the heuristics import numpy from here, it is None when NumPy is not installed
+try:
+    import numpy as numpy  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # NumPy is optional, without it the heuristics loop over the array columns
+    numpy = None  # type: ignore[assignment, unused-ignore]
+
+
+class TaskColumns:
+    """
+    Fields of a task list that heuristics read, copied into arrays so a heuristic can evaluate
+    its formula over plain numbers instead of calling the task getters for every task.
+
+    Each column is read from the tasks the first time it is asked for, and then shared by
+    every heuristic evaluated with the same columns. The current day is taken once, when
+    the columns are created, so all the tasks are evaluated against the same point in time.
+
+    When NumPy is installed the columns are vectorized: heuristics take them as NumPy arrays
+    with vectors and evaluate their formula once over the whole columns.
+    """
+
+    def __init__(self, tasks: List[ITaskModel], vectorized: bool = True):
+        """
+        Params:
+            tasks: The tasks to read the columns from.
+            vectorized: Evaluate the heuristics with NumPy if it is installed.
+        """
+        self.tasks = tasks
+        self.vectorized = vectorized and numpy is not None
+        self.today = TimePoint.today()
+        self.__severity: array[float] | None = None
+        self.__totalCost: array[float] | None = None
+        self.__investedEffort: array[float] | None = None
+        self.__start: array[int] | None = None
+        self.__remainingDays: array[int] | None = None
+
+    def getSeverity(self) -> "array[float]":
+        if self.__severity is None:
+            self.__severity = array("d", [task.getSeverity() for task in self.tasks])
+        return self.__severity
+
+    def getTotalCost(self) -> "array[float]":
+        """
+        Returns:
+            array: The remaining cost of each task, in pomodoros.
+        """
+        if self.__totalCost is None:
+            self.__totalCost = array("d", [task.getTotalCost().as_pomodoros() for task in self.tasks])
+        return self.__totalCost
+
+    def getInvestedEffort(self) -> "array[float]":
+        """
+        Returns:
+            array: The effort invested in each task, in pomodoros.
+        """
+        if self.__investedEffort is None:
+            self.__investedEffort = array("d", [task.getInvestedEffort().as_pomodoros() for task in self.tasks])
+        return self.__investedEffort
+
+    def getStart(self) -> "array[int]":
+        """
+        Returns:
+            array: The start of each task, in milliseconds since the epoch.
+        """
+        if self.__start is None:
+            self.__start = array("q", [task.getStart().as_int() for task in self.tasks])
+        return self.__start
+
+    def getRemainingDays(self) -> "array[int]":
+        if self.__remainingDays is None:
+            self.__remainingDays = array("q", [task.calculateRemainingTime().as_days() for task in self.tasks])
+        return self.__remainingDays
+
+    def vectors(self, *columns: "array[Any]") -> Tuple[Any, ...]:
+        """
+        Returns:
+            tuple: The given columns as NumPy arrays, sharing the memory of the columns.
+        """
+        assert numpy is not None
+        return tuple(numpy.frombuffer(column, dtype=numpy.float64 if column.typecode == "d" else numpy.int64) for column in columns)
+
+    def round(self, values: Any, digits: int) -> Any:
+        """
+        Rounds a NumPy array like round does with each value. numpy.round scales the values
+        before rounding them, which rounds some halves differently.
+        """
+        assert numpy is not None
+        return numpy.array([round(value, digits) for value in values.tolist()], dtype=numpy.float64)
+
+    def sort(self, values: Sequence[float], reverse: bool) -> List[Tuple[ITaskModel, float]]:
+        """
+        Sorts the tasks by the values a heuristic gave them. Ties keep the order of the task
+        list, like sorting the (task, value) tuples does.
+
+        Params:
+            values: The value of each task, in the order of the task list.
+            reverse: Sort from the highest value to the lowest.
+
+        Returns:
+            list: The tasks with their values, sorted.
+        """
+        if self.vectorized:
+            # a stable sort of the negated values keeps ties in task list order when sorting in reverse too
+            vector = numpy.asarray(values, dtype=numpy.float64)
+            order = numpy.argsort(-vector if reverse else vector, kind="stable").tolist()
+        else:
+            order = sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+        return [(self.tasks[i], values[i]) for i in order]
+
+    def top(self, values: Sequence[float], count: int, reverse: bool) -> List[Tuple[ITaskModel, float]]:
+        """
+        Returns the first tasks sort would return, without sorting the rest of them.
+
+        Params:
+            values: The value of each task, in the order of the task list.
+            count: The amount of tasks to return.
+            reverse: Sort from the highest value to the lowest.
+
+        Returns:
+            list: The first count tasks with their values, sorted.
+        """
+        # heapq keeps ties in the order of the task list, like sorted does
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        order = select(count, range(len(values)), key=values.__getitem__)
+        return [(self.tasks[i], values[i]) for i in order]
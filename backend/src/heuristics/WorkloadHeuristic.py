@@ -1,17 +1,30 @@
-from typing import List, Tuple
+from typing import List
 from ..Interfaces.IHeuristic import IHeuristic
 from ..Interfaces.ITaskModel import ITaskModel
+from .TaskColumns import TaskColumns, numpy
 
 
 class WorkloadHeuristic(IHeuristic):
 
+    sortDescending = True
+
     def __init__(self) -> None:
         pass
 
-    def sort(self, tasks: List[ITaskModel]) -> List[Tuple[ITaskModel, float]]:
-        retval = [(task, self.fastEvaluate(task)) for task in tasks]
-        retval.sort(key=lambda x: x[1], reverse=True)
-        return retval
+    def evaluateColumns(self, columns: TaskColumns) -> List[float]:
+        if columns.vectorized:
+            r, d = columns.vectors(columns.getTotalCost(), columns.getRemainingDays())
+            noDaysLeft = d < 1
+            h = r / numpy.where(noDaysLeft, 1, d)
+            return list(numpy.where(noDaysLeft | (h <= 0), r, columns.round(h, 2)).tolist())
+        values: List[float] = []
+        for r, d in zip(columns.getTotalCost(), columns.getRemainingDays()):
+            if d < 1:
+                values.append(r)
+                continue
+            h = r / d
+            values.append(round(h, 2) if h > 0 else r)
+        return values
 
     def fastEvaluate(self, task: ITaskModel, pomodorosPerDay: float | None = None) -> float:
         r = task.getTotalCost().as_pomodoros()
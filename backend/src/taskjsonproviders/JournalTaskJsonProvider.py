@@ -0,0 +1,145 @@
+import json
+
+from src.Utils import ProjectJsonListType, TaskJsonListType, TaskJsonType
+from ..Interfaces.IFileBroker import IFileBroker, FileRegistry
+from .TaskJsonProvider import TaskJsonProvider
+
+# records appended to the log before it is folded into a new snapshot
+COMPACTION_RECORDS = 500
+
+
+class JournalTaskJsonProvider(TaskJsonProvider):
+    """
+    Keeps the standalone tasks as a snapshot, the usual tasks.json, plus a log of the changes
+    made since it was written. Saving only appends the tasks that changed to the log, so its
+    cost doesn't depend on the amount of tasks stored.
+
+    Every few hundred records the log is folded into a new snapshot. Records are tagged with
+    the snapshot they apply to, so a log left behind by an interrupted compaction is ignored.
+    """
+
+    def __init__(self, fileBroker: IFileBroker, compactionRecords: int = COMPACTION_RECORDS):
+        super().__init__(fileBroker)
+        self.__compactionRecords = compactionRecords
+        self.__loaded = False
+        self.__snapshot = 0
+        self.__records = 0
+        self.__tasks: TaskJsonListType = []
+        self.__projects: ProjectJsonListType = []
+
+    def _readJson(self) -> TaskJsonType:
+        """
+        Returns:
+            dict: A copy of the stored tasks and projects, so callers can modify it freely.
+        """
+        self.__load()
+        return {
+            "tasks": [dict(task) for task in self.__tasks],
+            "projects": [dict(project) for project in self.__projects]
+        }
+
+    def _writeJson(self, json: TaskJsonType) -> None:
+        """
+        Appends the difference between the stored tasks and the given ones to the log.
+
+        The changed tasks are stored as a single splice: the range between the first and
+        the last task that differ is replaced. Saving a few edited tasks, or dropping the
+        completed ones, appends a record with only those tasks.
+        """
+        self.__load()
+        tasks = [dict(task) for task in json.get("tasks", [])]
+        projects = [dict(project) for project in json.get("projects", [])]
+
+        record: dict[str, object] = {"snapshot": self.__snapshot}
+        start, deleted, inserted = self.__diff(self.__tasks, tasks)
+        if deleted > 0 or len(inserted) > 0:
+            record.update(start=start, delete=deleted, tasks=inserted)
+        if projects != self.__projects:
+            record["projects"] = projects
+        if len(record) == 1:
+            return
+
+        self.__apply(record)
+        self.__records += 1
+        # big changes cost the same as rewriting the snapshot, which also empties the log
+        if self.__records >= self.__compactionRecords or 2 * len(inserted) > len(self.__tasks):
+            self.compact()
+            return
+        self.fileBroker.appendFileContent(FileRegistry.STANDALONE_TASKS_LOG, self.__encode(record) + "\n")
+
+    def compact(self) -> None:
+        """
+        Writes the stored tasks as a new snapshot and empties the log.
+        """
+        self.__load()
+        self.__snapshot += 1
+        self.fileBroker.writeFileContentJson(FileRegistry.STANDALONE_TASKS_JSON, {
+            "meta": [{"snapshot": str(self.__snapshot)}],
+            "tasks": self.__tasks,
+            "projects": self.__projects
+        })
+        # the new snapshot is already in place, records left in the log belong to the previous one
+        self.fileBroker.writeFileContent(FileRegistry.STANDALONE_TASKS_LOG, "")
+        self.__records = 0
+
+    def __load(self) -> None:
+        """
+        Reads the snapshot and replays the log records written after it, only on the first call.
+        """
+        if self.__loaded:
+            return
+        self.__loaded = True
+
+        snapshot = self.fileBroker.readFileContentJson(FileRegistry.STANDALONE_TASKS_JSON)
+        try:
+            self.__snapshot = int(snapshot.get("meta", [{}])[0].get("snapshot", "0"))
+        except (ValueError, IndexError, AttributeError) as e:
+            print(f"Error while reading the tasks snapshot version, assuming the first one: {e}")
+        self.__tasks = list(snapshot.get("tasks", []))
+        self.__projects = list(snapshot.get("projects", []))
+
+        for line in self.fileBroker.readFileContent(FileRegistry.STANDALONE_TASKS_LOG).splitlines():
+            if line.strip() == "":
+                continue
+            try:
+                record = json.loads(line)
+                if record["snapshot"] != self.__snapshot:
+                    continue
+                self.__apply(record)
+            except (ValueError, KeyError, TypeError) as e:
+                # the last record may be cut if the process stopped while writing it
+                print(f"Error while replaying the tasks log, ignoring the rest of it: {e}")
+                break
+            self.__records += 1
+
+    def __apply(self, record: dict[str, object]) -> None:
+        if "tasks" in record:
+            start = int(str(record["start"]))
+            end = start + int(str(record["delete"]))
+            inserted = record["tasks"]
+            if not isinstance(inserted, list) or start < 0 or end > len(self.__tasks):
+                raise ValueError(f"Invalid tasks log record: {record}")
+            self.__tasks[start:end] = inserted
+        if "projects" in record:
+            projects = record["projects"]
+            if not isinstance(projects, list):
+                raise ValueError(f"Invalid tasks log record: {record}")
+            self.__projects = projects
+
+    def __diff(self, old: TaskJsonListType, new: TaskJsonListType) -> tuple[int, int, TaskJsonListType]:
+        """
+        Returns:
+            tuple: Where the first difference starts, how many old tasks are replaced and the new tasks that replace them.
+        """
+        start = 0
+        limit = min(len(old), len(new))
+        while start < limit and old[start] == new[start]:
+            start += 1
+        end = 0
+        limit -= start
+        while end < limit and old[-1 - end] == new[-1 - end]:
+            end += 1
+        return start, len(old) - start - end, new[start:len(new) - end]
+
+    def __encode(self, record: dict[str, object]) -> str:
+        return json.dumps(record, separators=(",", ":"))
@@ -0,0 +1,300 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from src.Utils import ProjectJsonListType, TaskDiscoveryPolicies, TaskJsonListType, VaultFileBuffer
+from ..wrappers.TimeManagement import TimePoint
+from ..Interfaces.ITaskJsonProvider import VALID_PROJECT_STATUS
+from ..wrappers.BufferLines import BufferLines, openMappedFile
+from ..filters.ContextPrefixTrie import ContextPrefixTrie
+
+# Tasks and projects found in a single vault file
+ParsedVaultFile = tuple[TaskJsonListType, ProjectJsonListType]
+
+# must be increased whenever a change in the parser changes its output for the same file
+PARSER_VERSION = "1"
+
+CHECKBOX = "- [ ]"
+HEADER_DELIMITER = "---"
+# a file without any of these can't contain tasks nor a project header, so it doesn't need to be decoded
+VAULT_ENTRY_MARKERS = (CHECKBOX.encode(), b"project")
+
+
+@dataclass
+class VaultFileScan:
+    """
+    The only lines of a vault file the parser needs: the ones inside the
+    header and the task lines with their line number.
+    """
+    headerLines: list[str]
+    taskLines: list[tuple[int, str]]
+    lineCount: int
+
+
+class ObsidianVaultFileParser:
+    """
+    Extracts the tasks and projects of a single markdown file of the vault.
+
+    It only depends on the discovery policies, so it can be sent to worker processes.
+    """
+
+    def __init__(self, policies: TaskDiscoveryPolicies):
+        self.__policies = policies
+        self.__categoryTrie = ContextPrefixTrie(policies.categories_prefixes)
+
+    def getFingerprint(self) -> str:
+        """
+        Identifies the output of the parser, files parsed with the same fingerprint give the same result.
+
+        Missing dates default to the current day, so the fingerprint changes every day.
+        """
+        return f"{PARSER_VERSION}|{self.__policies!r}|{TimePoint.today()}"
+
+    def parse(self, path: str, fileContent: list[str]) -> ParsedVaultFile:
+        return self.parseScan(path, scanVaultLines(fileContent))
+
+    def parseScan(self, path: str, scan: VaultFileScan) -> ParsedVaultFile:
+        tasks: TaskJsonListType = []
+        projects: ProjectJsonListType = []
+        fileHeader = self.__getFileHeader(scan.headerLines)
+        taskLines = scan.taskLines
+
+        if "project" in fileHeader and fileHeader["project"] in VALID_PROJECT_STATUS:
+            fileName = path.replace("\\", "/").split("/")[-1].split(".md")[0]
+            status = fileHeader["project"]
+            element = {
+                "name": fileName,
+                "status": status,
+                "path": path
+            }
+            projects.append(element)
+
+            if len(taskLines) == 0 and status == "open":
+                taskDict = self.__getTaskDictFromLine(
+                    f"- [ ] Define next action [track::{self.__getFallbackPolicy()}]",
+                    path, scan.lineCount,
+                    fileHeader
+                )
+                tasks.append(taskDict)
+
+        for lineNum, line in taskLines:
+            taskDict = self.__getTaskDictFromLine(line, path, lineNum, fileHeader)
+            if taskDict["valid"] == "False":
+                continue
+            tasks.append(taskDict)
+
+        return tasks, projects
+
+    def __getFileHeader(self, headerLines: list[str]) -> dict[str, str]:
+        header: dict[str, str] = {}
+        for line in headerLines:
+            splittedLine = line.split(":")
+            key = splittedLine[0].strip()
+            value = splittedLine[-1].strip()
+            header[key] = value
+        return header
+
+    def __getDefaultTaskDict(self) -> dict[str, str]:
+        return {
+            "taskText": "",
+            "starts": str(TimePoint.today()),
+            "due": str(TimePoint.today()),
+            "severity": "1",
+            "remaining_cost": "1",
+            "invested": "0",
+            "status": " ",
+            "file": "",
+            "line": "0",
+            "calm": "false"
+        }
+        # track is ommited so that the task is invalid by default
+
+    def __getTaskDictFromLine(self, line: str, file: str, lineNum: int, fileHeader: dict[str, str]) -> dict[str, str]:
+        taskDict = self.__getDefaultTaskDict()
+        taskDict["file"] = file
+        taskDict["line"] = str(lineNum)
+
+        taskText, fields = tokenizeTaskLine(line)
+        taskDict["taskText"] = taskText
+
+        # override default values with values from the file header
+        for key in fileHeader:
+            taskDict[key] = fileHeader[key]
+
+        for key, value in fields:
+            taskDict[key] = value
+
+        # special case for starts and due that should be converted to int
+        try:
+            taskDict["starts"] = self.__apply_date_policy(taskDict["starts"])
+            taskDict["due"] = self.__apply_date_policy(taskDict["due"])
+            taskDict["track"] = self.__apply_track_policy(taskDict.get("track", None))
+            taskDict["severity"] = str(float(taskDict["severity"]))
+            taskDict["total_cost"] = str(float(taskDict["remaining_cost"]) - float(taskDict["invested"]))
+            taskDict["effort_invested"] = taskDict["invested"]
+            taskDict["valid"] = "True"
+        except Exception as ex:
+            print(f"Error while processing task {taskDict['taskText']} in file {file} at line {lineNum}: {ex}")
+            taskDict["valid"] = "False"
+            pass
+
+        return taskDict
+
+    def __apply_date_policy(self, date: str) -> str:
+        try:
+            return str(TimePoint.from_string(date).as_int())
+        except ValueError:
+            if self.__policies.date_missing_policy == "1":
+                return str(TimePoint.today().as_int())
+            raise ValueError(f"Invalid date format: {date}. Expected format is YYYY-MM-DD or YYYY-MM-DDTHH:MM")
+
+    def __apply_track_policy(self, track: str | None) -> str:
+        def is_prefix_of(prefix: str | None) -> bool:
+            return isinstance(prefix, str) and self.__categoryTrie.matchesAny(prefix)
+
+        if not is_prefix_of(track):
+            if self.__policies.context_missing_policy == "1":
+                return self.__policies.default_context
+            raise ValueError("Track tag is missing and no default value is set.")
+
+        assert isinstance(track, str)
+
+        return track
+
+    def __getFallbackPolicy(self) -> str | None:
+        if self.__policies.default_context in self.__policies.categories_prefixes:
+            return self.__policies.default_context
+        return self.__policies.categories_prefixes[0] if self.__policies.categories_prefixes else None
+
+
+def tokenizeTaskLine(line: str) -> tuple[str, list[tuple[str, str]]]:
+    """
+    Splits a task line in its text and its "[key:: value]" fields in a single scan.
+
+    Only the text between the first checkbox and the next one (if any) is taken into account.
+    The task text is everything before the "[" that opens the first field.
+
+    Returns:
+        tuple: The task text and the (key, value) fields in the order they appear.
+    """
+    start = line.find(CHECKBOX) + len(CHECKBOX)
+    end = line.find(CHECKBOX, start)
+    body = line[start:] if end < 0 else line[start:end]
+
+    firstField = body.find("::")
+    if firstField >= 0:
+        textEnd = body.rfind("[", 0, firstField)
+    else:
+        # without fields, the whole body is the text unless it is cut by another checkbox
+        textEnd = len(body) if end < 0 else body.rfind("[")
+    taskText = body[:textEnd].strip() if textEnd >= 0 else ""
+
+    # every "[" opens a candidate "[key:: value]" field, the value ends at the first "]" or "::"
+    fields: list[tuple[str, str]] = []
+    for region in body.split("[")[1:]:
+        key, separator, value = region.partition("::")
+        if separator:
+            fields.append((key.strip(), value.partition("::")[0].partition("]")[0].strip()))
+    return taskText, fields
+
+
+def isHeaderDelimiter(line: str) -> bool:
+    return line.split('\n')[0].strip() == HEADER_DELIMITER
+
+
+def isTaskLine(line: str) -> bool:
+    return line.strip().startswith(CHECKBOX)
+
+
+def scanVaultLines(fileContent: list[str]) -> VaultFileScan:
+    """
+    Picks the header and task lines of a file that was already split in lines.
+
+    The header is made of the lines between the first "---" line and the next one,
+    or the end of the file when it is never closed.
+    """
+    headerLines: list[str] = []
+    inHeader = False
+    for line in fileContent:
+        if isHeaderDelimiter(line):
+            if inHeader:
+                break
+            inHeader = True
+            continue
+        if inHeader:
+            headerLines.append(line)
+
+    taskLines = [(lineNum, line) for lineNum, line in enumerate(fileContent) if isTaskLine(line)]
+    return VaultFileScan(headerLines, taskLines, len(fileContent))
+
+
+def scanVaultBuffer(buffer: VaultFileBuffer) -> VaultFileScan:
+    """
+    Picks the header and task lines straight from the raw content of a file, usually
+    memory mapped. Only the lines that contain a marker are decoded, so the memory used
+    doesn't depend on the size of the file.
+
+    Lines are split and decoded like a file opened in text mode, the result is the
+    same as calling scanVaultLines with its lines. The only exception are undecodable
+    bytes right before a line break, which text mode drops before splitting the lines.
+    """
+    if all(buffer.find(marker) < 0 for marker in VAULT_ENTRY_MARKERS):
+        return VaultFileScan([], [], 0)
+
+    lines = BufferLines(buffer)
+
+    headerLines: list[str] = []
+    opening = _findLine(lines, HEADER_DELIMITER.encode(), 0, isHeaderDelimiter)
+    if opening is not None:
+        closing = _findLine(lines, HEADER_DELIMITER.encode(), opening[2], isHeaderDelimiter)
+        headerLines = lines.decodeLines(opening[2], lines.size if closing is None else closing[0])
+
+    taskLines: list[tuple[int, str]] = []
+    taskLine = _findLine(lines, CHECKBOX.encode(), 0, isTaskLine)
+    while taskLine is not None:
+        start, line, nextLine = taskLine
+        taskLines.append((lines.lineNumber(start), line))
+        taskLine = _findLine(lines, CHECKBOX.encode(), nextLine, isTaskLine)
+
+    return VaultFileScan(headerLines, taskLines, lines.lineCount())
+
+
+def _findLine(lines: BufferLines, marker: bytes, start: int, accept: Callable[[str], bool]) -> tuple[int, str, int] | None:
+    """
+    Finds the first line from the start offset on that contains the marker and is accepted.
+
+    Returns:
+        tuple | None: The offset where the line starts, the decoded line and the offset
+        where the next line starts, None if there is no such line.
+    """
+    offset = lines.buffer.find(marker, start)
+    while offset >= 0:
+        lineStart = lines.lineStart(offset)
+        line, nextLine = lines.decodeLine(lineStart)
+        if accept(line):
+            return lineStart, line, nextLine
+        offset = lines.buffer.find(marker, nextLine)
+    return None
+
+
+def parseVaultFiles(parser: ObsidianVaultFileParser, files: list[tuple[str, str]]) -> list[ParsedVaultFile | None]:
+    """
+    Reads, scans and parses a shard of vault files, used as the unit of work of the parallel
+    parse. Each worker opens its own files, so the reads are spread across the workers too.
+
+    Params:
+        parser: The parser of the provider.
+        files: The path of each file relative to the vault, together with its full path.
+
+    Returns:
+        list: The parsed content of each file in the same order, None for the files that failed.
+    """
+    results: list[ParsedVaultFile | None] = []
+    for path, fullPath in files:
+        try:
+            with openMappedFile(fullPath) as buffer:
+                scan = scanVaultBuffer(buffer)
+            results.append(parser.parseScan(path, scan))
+        except Exception as e:
+            print(f"Error while reading file {path}: {e}")
+            results.append(None)
+    return results
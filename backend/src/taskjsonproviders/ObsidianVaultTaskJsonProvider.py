@@ -1,204 +1,261 @@
-from src.Utils import ProjectJsonListType, TaskDiscoveryPolicies, TaskJsonListType, TaskJsonType
-from ..wrappers.TimeManagement import TimePoint
-from ..Interfaces.ITaskJsonProvider import ITaskJsonProvider, VALID_PROJECT_STATUS
-from ..Interfaces.IFileBroker import IFileBroker, VaultRegistry
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from itertools import repeat
+from math import ceil
+
+from src.Utils import FileSignature, ProjectJsonListType, TaskDiscoveryPolicies, TaskJsonElementType, TaskJsonListType, TaskJsonType
+from ..Interfaces.ITaskJsonProvider import ITaskJsonProvider
+from ..Interfaces.IFileBroker import IFileBroker, FileRegistry, VaultRegistry
+from .ObsidianVaultFileParser import ObsidianVaultFileParser, ParsedVaultFile, VaultFileScan, parseVaultFiles, scanVaultBuffer
+
+# (file, line) pair that identifies a task inside the vault
+TaskKey = tuple[str, str]
+
+# below this amount of changed files, starting the worker processes costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 64
+# shards sent to each worker, so that a few big notes don't leave the other workers idle
+SHARDS_PER_WORKER = 4
+# minimum seconds between writes of the persistent cache, a stale cache is safe since file signatures are checked on load
+CACHE_SAVE_INTERVAL = 60.0
+
+
+def formatSignature(signature: FileSignature) -> str:
+    """
+    Writes a file signature the way it is stored in the persistent cache.
+    """
+    return ":".join(str(value) for value in signature)
+
+
+@dataclass
+class VaultFileEntry:
+    """
+    Parsed content of a single vault file, together with the modification
+    time and signature it was parsed at.
+    """
+    mtime: float
+    signature: FileSignature | None = None
+    tasks: dict[TaskKey, TaskJsonElementType] = field(default_factory=dict)
+    projects: ProjectJsonListType = field(default_factory=list)
 
 
 class ObsidianVaultTaskJsonProvider(ITaskJsonProvider):
 
-    def __init__(self, fileBroker: IFileBroker, policies: TaskDiscoveryPolicies):
+    def __init__(self, fileBroker: IFileBroker, policies: TaskDiscoveryPolicies, workers: int = 1, persistentCache: bool = False):
         self.__fileBroker = fileBroker
         self._lastJson: TaskJsonType = {"tasks": []}
         self._lastJsonList: TaskJsonListType = []
         self.__lastProjectList: ProjectJsonListType = []
-        self._lastMtime = 0.0
-        self.__policies = policies
+        self._fileCache: dict[str, VaultFileEntry] = {}
+        # paths of the vault files in the order they were listed, including the files whose parse failed
+        self._vaultFiles: list[str] = []
+        # files that are not cached, like the ones whose parse failed, so they are parsed again on the next call
+        self._failedFiles: set[str] = set()
+        # parser fingerprint the cached files were parsed with
+        self.__parsedFingerprint: str | None = None
+        self.__parser = ObsidianVaultFileParser(policies)
+        self.__workers = workers
+        self.__persistentCache = persistentCache
+        self.__persistentCacheLoaded = False
+        self.__lastCacheSave: float | None = None
 
     def getJson(self) -> TaskJsonType:
-        vaultFiles = self.__fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN)
-        if len(vaultFiles) == 0:
-            return {}
+        """
+        Scans the vault and returns the tasks and projects found in it.
+
+        Only the files that were added or modified since the last call are parsed
+        again, the rest of the results are taken from the per-file cache. When the
+        file broker reports which paths changed, only those are checked. If more
+        than one worker is configured, big batches of files are parsed in parallel.
+
+        With the persistent cache enabled, the per-file cache is loaded from disk on
+        the first call, so a restart only parses the files changed in the meantime.
+
+        Tasks without dates take the current day, so the cached files are parsed again
+        when the day changes.
+
+        Returns:
+            dict: The tasks json.
+        """
+        rebuildNeeded = False
+        if self.__persistentCache and not self.__persistentCacheLoaded:
+            self.__persistentCacheLoaded = True
+            rebuildNeeded = self.__loadPersistentCache()
+
+        fingerprint = self.__parser.getFingerprint()
+        if self.__parsedFingerprint is not None and fingerprint != self.__parsedFingerprint:
+            self._fileCache = {}
+        self.__parsedFingerprint = fingerprint
+
+        changedPaths = self.__fileBroker.getVaultChanges(VaultRegistry.OBSIDIAN)
+        if changedPaths is not None and len(self._fileCache) > 0:
+            changedPaths = {path for path in changedPaths if path.endswith(".md")} | self._failedFiles
+            if len(changedPaths) == 0:
+                return self._lastJson
+            vaultFiles = self.__getChangedVaultFiles(changedPaths)
+        else:
+            vaultFiles = self.__fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN, extensions=(".md",))
+            if len(vaultFiles) == 0:
+                return {}
 
         # filter in all .md files in the vault
         vaultFiles = [file for file in vaultFiles if file[0].endswith(".md")]
 
-        mtime = max([file[1] for file in vaultFiles], default=0)
-        if mtime <= self._lastMtime:
+        changedFiles = [file for file in vaultFiles if file[0] not in self._fileCache or self._fileCache[file[0]].mtime != file[1]]
+        deletedFiles = self._fileCache.keys() - {file[0] for file in vaultFiles}
+        if len(changedFiles) == 0 and len(deletedFiles) == 0 and not rebuildNeeded:
             return self._lastJson
 
-        self._lastJson = {"tasks": []}
-        self._lastJsonList = []
-        self.__lastProjectList = []
-
-        # add all tasks from the modified files to the last json
-        for file in vaultFiles:
-            try:
-                self.__process_task_file(file)
-            except Exception as e:
-                print(f"Error while reading file {file[0]}: {e}")
-        self._lastMtime = mtime
-        self._lastJson["tasks"] = self._lastJsonList
-        self._lastJson["projects"] = self.__lastProjectList
+        for path in deletedFiles:
+            del self._fileCache[path]
+
+        # taken before parsing, so a write during the parse shows up as a change on the next start
+        signatures = [self.__fileBroker.getVaultFileSignature(VaultRegistry.OBSIDIAN, file[0]) if self.__persistentCache else None for file in changedFiles]
+        parsedFiles = self.__parse_files([file[0] for file in changedFiles])
+        self._failedFiles = set()
+        for file, signature, parsedFile in zip(changedFiles, signatures, parsedFiles):
+            if parsedFile is not None:
+                entry = VaultFileEntry(file[1], signature)
+                self._fileCache[file[0]] = entry
+                self.__store_parsed_file(entry, parsedFile)
+            else:
+                self._fileCache.pop(file[0], None)
+                self._failedFiles.add(file[0])
+
+        # the lists are joined in vault file order, so editing a file does not move its tasks
+        self._vaultFiles = [file[0] for file in vaultFiles]
+        entries = [self._fileCache[path] for path in self._vaultFiles if path in self._fileCache]
+        self._lastJsonList = [taskDict for entry in entries for taskDict in entry.tasks.values()]
+        self.__lastProjectList = [project for entry in entries for project in entry.projects]
+
+        self._lastJson = {
+            "tasks": self._lastJsonList,
+            "projects": self.__lastProjectList
+        }
+
+        if self.__persistentCache and len(changedFiles) + len(deletedFiles) > 0:
+            self.__savePersistentCache()
         return self._lastJson
 
-    def __process_task_file(self, file: tuple[str, float]) -> None:
-        fileContent = self.__fileBroker.getVaultFileLines(VaultRegistry.OBSIDIAN, file[0])
-        fileHeader = self.__getFileHeader(fileContent)
-        taskLines = self.__getFileTaskLines(fileContent, fileHeader)
-
-        if "project" in fileHeader and fileHeader["project"] in VALID_PROJECT_STATUS:
-            fileName = file[0].replace("\\", "/").split("/")[-1].split(".md")[0]
-            status = fileHeader["project"]
-            element = {
-                "name": fileName,
-                "status": status,
-                "path": file[0]
-            }
-            self.__lastProjectList.append(element)
-
-            if len(taskLines) == 0 and status == "open":
-                taskDict = self.__getTaskDictFromLine(
-                    f"- [ ] Define next action [track::{self.__getFallbackPolicy()}]",
-                    file[0], len(fileContent),
-                    fileHeader
-                )
-                self.__update_or_append_task(taskDict)
-
-        for lineNum, line in taskLines:
-            taskDict = self.__getTaskDictFromLine(line, file[0], lineNum, fileHeader)
-            if taskDict["valid"] == "False":
-                continue
-            self.__update_or_append_task(taskDict)
-
-    def __update_or_append_task(self, taskDict: dict[str, str]) -> None:
-        found = False
-        for i in range(len(self._lastJsonList)):
-            if self._lastJsonList[i]["file"] == taskDict["file"] and self._lastJsonList[i]["line"] == taskDict["line"]:
-                self._lastJsonList[i] = taskDict
-                found = True
-                break
-        if not found:
-            self._lastJsonList.append(taskDict)
+    def __getChangedVaultFiles(self, changedPaths: set[str]) -> list[tuple[str, float]]:
+        """
+        Builds the vault file list from the cache, refreshing only the given paths.
+        Known files keep their position and new files are added at the end.
+        """
+        changedFiles = dict(self.__fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN, changedPaths))
+        vaultFiles: list[tuple[str, float]] = []
+        for path in self._vaultFiles:
+            if path not in changedPaths:
+                vaultFiles.append((path, self._fileCache[path].mtime))
+            elif path in changedFiles:
+                vaultFiles.append((path, changedFiles.pop(path)))
+        vaultFiles.extend(changedFiles.items())
+        return vaultFiles
 
-    def saveJson(self, json: TaskJsonType) -> None:
-        # do nothing
-        pass
+    def __parse_files(self, paths: list[str]) -> list[ParsedVaultFile | None]:
+        """
+        Parses the given vault files, returning their results in the same order.
+        """
+        if self.__workers > 1 and len(paths) >= PARALLEL_PARSE_MIN_FILES:
+            return self.__parse_files_in_parallel(paths)
+        return [self.__parse_file(path) for path in paths]
 
-    def __getFileHeader(self, file: list[str]) -> dict[str, str]:
-        header: dict[str, str] = {}
-        inHeader = False
-        for line in file:
-            if line.split('\n')[0].strip() == "---":
-                if inHeader:
-                    break
-                else:
-                    inHeader = True
-                    continue
+    def __parse_file(self, path: str) -> ParsedVaultFile | None:
+        try:
+            return self.__parser.parseScan(path, self.__scan_file(path))
+        except Exception as e:
+            print(f"Error while reading file {path}: {e}")
+            return None
 
-            if inHeader:
-                splittedLine = line.split(":")
-                key = splittedLine[0].strip()
-                value = splittedLine[-1].strip()
-                header[key] = value
-        return header
-
-    def __getFileTaskLines(self, file: list[str], fileHeader: dict[str, str]) -> list[tuple[int, str]]:
-        taskLines: list[tuple[int, str]] = []
-        for i in range(len(file)):
-            if file[i].strip().startswith("- [ ]"):
-                taskLines.append((i, file[i]))
-        return taskLines
-
-    def __getDefaultTaskDict(self) -> dict[str, str]:
-        return {
-            "taskText": "",
-            "starts": str(TimePoint.today()),
-            "due": str(TimePoint.today()),
-            "severity": "1",
-            "remaining_cost": "1",
-            "invested": "0",
-            "status": " ",
-            "file": "",
-            "line": "0",
-            "calm": "false"
-        }
-        # track is ommited so that the task is invalid by default
-
-    def __getTaskDictFromLine(self, line: str, file: str, lineNum: int, fileHeader: dict[str, str]) -> dict[str, str]:
-        taskDict = self.__getDefaultTaskDict()
-        taskDict["file"] = file
-        taskDict["line"] = str(lineNum)
-
-        # if file == "\\".join("SecondBrain/PARA/2. Areas/Legal/202304290908-DNI Renovacion.md".split("/")):
-        #     print("here")
-
-        # get task text
-        # task text is everything after "- [ ]" and before any [] containing a "::"
-        lineMod = line + "[eol:: here]"
-        textAfterCheckbox = lineMod.split("- [ ]")[1]
-        textBeforeFirstDualColon = textAfterCheckbox.split("::")[0]
-        splittedByCorchetes = textBeforeFirstDualColon.split("[")
-        allButLast = splittedByCorchetes[:-1]
-        taskDict["taskText"] = "[".join(allButLast).strip()
-
-        # override default values with values from the file header
-        for key in fileHeader:
-            taskDict[key] = fileHeader[key]
-
-        lineData = line.split("- [ ]")[1].split("[")
-        # keyvalue are in the format "[key:: value]"
-        for keyValueRegion in lineData[1:]:
-            try:
-                keyValue = keyValueRegion.split("::")
-                key = keyValue[0].strip()
-                value = keyValue[1].split("]")[0].strip()
-                taskDict[key] = value
-            except Exception:
-                pass
-
-        # special case for starts and due that should be converted to int
+    def __scan_file(self, path: str) -> VaultFileScan:
+        # the file is scanned in place, only its header and task lines are loaded
+        with self.__fileBroker.openVaultFile(VaultRegistry.OBSIDIAN, path) as buffer:
+            return scanVaultBuffer(buffer)
+
+    def __parse_files_in_parallel(self, paths: list[str]) -> list[ParsedVaultFile | None]:
+        """
+        Shards the files across a pool of worker processes, which read, scan and parse
+        them by themselves. Shards are merged back in order, so the result is the same
+        as parsing the files one after another.
+        """
+        files = [(path, self.__fileBroker.getVaultFilePath(VaultRegistry.OBSIDIAN, path)) for path in paths]
+        shardSize = max(1, ceil(len(files) / (self.__workers * SHARDS_PER_WORKER)))
+        shards = [files[i:i + shardSize] for i in range(0, len(files), shardSize)]
         try:
-            taskDict["starts"] = self.__apply_date_policy(taskDict["starts"])
-            taskDict["due"] = self.__apply_date_policy(taskDict["due"])
-            taskDict["track"] = self.__apply_track_policy(taskDict.get("track", None))
-            taskDict["severity"] = str(float(taskDict["severity"]))
-            taskDict["total_cost"] = str(float(taskDict["remaining_cost"]) - float(taskDict["invested"]))
-            taskDict["effort_invested"] = taskDict["invested"]
-            taskDict["valid"] = "True"
-        except Exception as ex:
-            print(f"Error while processing task {taskDict['taskText']} in file {file} at line {lineNum}: {ex}")
-            taskDict["valid"] = "False"
-            pass
-
-        return taskDict
-
-    def __apply_date_policy(self, date: str) -> str:
+            # spawn instead of fork, the provider lives in a process with running threads
+            with ProcessPoolExecutor(max_workers=self.__workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                return [parsedFile for shard in executor.map(parseVaultFiles, repeat(self.__parser), shards) for parsedFile in shard]
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Error while parsing the vault in parallel, falling back to a single process: {e}")
+            return [self.__parse_file(path) for path in paths]
+
+    def __store_parsed_file(self, entry: VaultFileEntry, parsedFile: ParsedVaultFile) -> None:
+        tasks, projects = parsedFile
+        for taskDict in tasks:
+            self.__update_or_append_task(entry, taskDict)
+        entry.projects.extend(projects)
+
+    def __update_or_append_task(self, entry: VaultFileEntry, taskDict: dict[str, str]) -> None:
+        key = (taskDict["file"], taskDict["line"])
+        entry.tasks[key] = taskDict
+
+    def __loadPersistentCache(self) -> bool:
+        """
+        Fills the per-file cache with the results saved by a previous run. Files whose
+        signature changed since they were saved are left out, so they are parsed again.
+
+        Returns:
+            bool: True if any file was loaded.
+        """
+        cache = self.__fileBroker.readFileContentJson(FileRegistry.OBSIDIAN_PARSE_CACHE)
+        if cache.get("meta", []) != [{"fingerprint": self.__parser.getFingerprint()}]:
+            return False
+
         try:
-            return str(TimePoint.from_string(date).as_int())
-        except ValueError:
-            if self.__policies.date_missing_policy == "1":
-                return str(TimePoint.today().as_int())
-            raise ValueError(f"Invalid date format: {date}. Expected format is YYYY-MM-DD or YYYY-MM-DDTHH:MM")
-
-    def __apply_track_policy(self, track: str | None) -> str:
-        def is_prefix_of(prefix: str | None) -> bool:
-            isPrefix = False
-            for context in self.__policies.categories_prefixes:
-                if isinstance(prefix, str) and prefix.startswith(context):
-                    isPrefix = True
-                    break
-            return isPrefix
-
-        if not is_prefix_of(track):
-            if self.__policies.context_missing_policy == "1":
-                return self.__policies.default_context
-            raise ValueError("Track tag is missing and no default value is set.")
-
-        assert isinstance(track, str)
-
-        return track
-
-    def __getFallbackPolicy(self) -> str | None:
-        if self.__policies.default_context in self.__policies.categories_prefixes:
-            return self.__policies.default_context
-        return self.__policies.categories_prefixes[0] if self.__policies.categories_prefixes else None
+            staleFiles: set[str] = set()
+            for fileRecord in cache.get("files", []):
+                path = fileRecord["path"]
+                self._vaultFiles.append(path)
+                signature = self.__fileBroker.getVaultFileSignature(VaultRegistry.OBSIDIAN, path)
+                if signature is None or fileRecord.get("signature") != formatSignature(signature):
+                    staleFiles.add(path)
+                    continue
+                self._fileCache[path] = VaultFileEntry(float(fileRecord["mtime"]), signature)
+            for taskDict in cache.get("tasks", []):
+                if taskDict["file"] not in staleFiles:
+                    self.__update_or_append_task(self._fileCache[taskDict["file"]], taskDict)
+            for project in cache.get("projects", []):
+                if project["path"] not in staleFiles:
+                    self._fileCache[project["path"]].projects.append(project)
+            self._failedFiles = staleFiles
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"Error while loading the vault cache, parsing the whole vault: {e}")
+            self._fileCache = {}
+            self._vaultFiles = []
+
+        return len(self._fileCache) > 0
+
+    def __savePersistentCache(self) -> None:
+        now = time.monotonic()
+        if self.__lastCacheSave is not None and now - self.__lastCacheSave < CACHE_SAVE_INTERVAL:
+            return
+        self.__lastCacheSave = now
+
+        self.__fileBroker.writeFileContentJson(FileRegistry.OBSIDIAN_PARSE_CACHE, {
+            "meta": [{"fingerprint": self.__parser.getFingerprint()}],
+            "files": [self.__fileRecord(path, self._fileCache[path]) for path in self._vaultFiles if path in self._fileCache],
+            "tasks": self._lastJsonList,
+            "projects": self.__lastProjectList
+        })
+
+    def __fileRecord(self, path: str, entry: VaultFileEntry) -> dict[str, str]:
+        record = {"path": path, "mtime": str(entry.mtime)}
+        if entry.signature is not None:
+            record["signature"] = formatSignature(entry.signature)
+        return record
+
+    def saveJson(self, json: TaskJsonType) -> None:
+        # do nothing
+        pass
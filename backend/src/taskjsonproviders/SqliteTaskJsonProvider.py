@@ -0,0 +1,172 @@
+import json
+import threading
+
+from src.Utils import FileSignature, TaskJsonElementType, TaskJsonType, TaskQuery
+from ..Interfaces.IFileBroker import IFileBroker, FileRegistry
+from .TaskJsonProvider import TaskJsonProvider
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    # data keeps the task as saved, the other columns are copies of the fields used in queries
+    """CREATE TABLE IF NOT EXISTS tasks (
+        position INTEGER PRIMARY KEY,
+        description TEXT,
+        context TEXT,
+        start INTEGER,
+        due INTEGER,
+        status TEXT,
+        calm TEXT,
+        raised TEXT,
+        waited TEXT,
+        data TEXT NOT NULL
+    )""",
+    "CREATE TABLE IF NOT EXISTS projects (position INTEGER PRIMARY KEY, data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status)",
+    "CREATE INDEX IF NOT EXISTS tasks_context ON tasks (context)",
+    "CREATE INDEX IF NOT EXISTS tasks_start ON tasks (start)",
+    "CREATE INDEX IF NOT EXISTS tasks_due ON tasks (due)",
+    "CREATE INDEX IF NOT EXISTS tasks_raised ON tasks (raised)",
+    "CREATE INDEX IF NOT EXISTS tasks_waited ON tasks (waited)",
+]
+
+# greater than any character, so every context that starts with a prefix sorts before prefix + CONTEXT_PREFIX_END
+CONTEXT_PREFIX_END = "\U0010ffff"
+
+
+class SqliteTaskJsonProvider(TaskJsonProvider):
+    """
+    Keeps the standalone tasks in an SQLite database, with indexes on the fields the task
+    list queries filter by. On the first run the tasks are imported from tasks.json.
+
+    Tasks are stored by their position in the task list. Saving only writes the rows of
+    the tasks that changed.
+    """
+
+    def __init__(self, fileBroker: IFileBroker):
+        super().__init__(fileBroker)
+        self.__connection = fileBroker.connectDatabase(FileRegistry.STANDALONE_TASKS_DB)
+        self.__lock = threading.Lock()
+        # the lower function of SQLite only folds ASCII letters, searches must match like str.lower does
+        self.__connection.create_function("pylower", 1, str.lower, deterministic=True)
+        with self.__lock, self.__connection:
+            for statement in SCHEMA:
+                self.__connection.execute(statement)
+        self.__importJson()
+
+    def _getSignature(self) -> FileSignature | None:
+        return self.fileBroker.getFileSignature(FileRegistry.STANDALONE_TASKS_DB)
+
+    def _readJson(self) -> TaskJsonType:
+        with self.__lock:
+            tasks = [json.loads(row[0]) for row in self.__connection.execute("SELECT data FROM tasks ORDER BY position")]
+            projects = [json.loads(row[0]) for row in self.__connection.execute("SELECT data FROM projects ORDER BY position")]
+        return {"tasks": tasks, "projects": projects}
+
+    def _writeJson(self, json: TaskJsonType) -> None:
+        taskElements = json.get("tasks", [])
+        tasks = [self.__encode(task) for task in taskElements]
+        projects = [self.__encode(project) for project in json.get("projects", [])]
+
+        with self.__lock, self.__connection:
+            storedTasks = [row[0] for row in self.__connection.execute("SELECT data FROM tasks ORDER BY position")]
+            changedTasks = [position for position, data in enumerate(tasks) if position >= len(storedTasks) or storedTasks[position] != data]
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO tasks (position, description, context, start, due, status, calm, raised, waited, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self.__getTaskRow(position, taskElements[position], tasks[position]) for position in changedTasks]
+            )
+            self.__connection.execute("DELETE FROM tasks WHERE position >= ?", (len(tasks),))
+
+            self.__connection.execute("DELETE FROM projects")
+            self.__connection.executemany("INSERT INTO projects (position, data) VALUES (?, ?)", enumerate(projects))
+
+    def queryTasks(self, query: TaskQuery) -> list[tuple[int, TaskJsonElementType]] | None:
+        """
+        Finds the stored tasks that meet all the conditions of the query, using the indexes.
+
+        The tasks injected for open projects without tasks are not stored until the json is saved,
+        they are always returned after the stored tasks found.
+
+        Params:
+            query: The conditions to meet.
+
+        Returns:
+            list: The position in the task list and the content of each task found, in task list order.
+        """
+        conditions: list[str] = []
+        parameters: list[str | int] = []
+        if query.openOnly:
+            conditions.append("status != 'x'")
+        if query.contextPrefix is not None:
+            conditions.append("context >= ? AND context < ?")
+            parameters += [query.contextPrefix, query.contextPrefix + CONTEXT_PREFIX_END]
+        if query.startBefore is not None:
+            conditions.append("start < ?")
+            parameters.append(query.startBefore)
+        if query.startAfter is not None:
+            conditions.append("start > ?")
+            parameters.append(query.startAfter)
+        if query.dueBefore is not None:
+            conditions.append("due < ?")
+            parameters.append(query.dueBefore)
+        if query.dueAfter is not None:
+            conditions.append("due > ?")
+            parameters.append(query.dueAfter)
+        if query.calm is not None:
+            conditions.append("calm LIKE 'true%'" if query.calm else "calm NOT LIKE 'true%'")
+        if query.waiting is not None:
+            conditions.append("waited IS NOT NULL" if query.waiting else "waited IS NULL")
+        if query.waited is not None:
+            conditions.append("waited = ?")
+            parameters.append(query.waited)
+        if query.raised is not None:
+            conditions.append("raised = ?")
+            parameters.append(query.raised)
+        if query.searchTerms is not None:
+            conditions.append("(" + " OR ".join(["instr(pylower(description), ?) > 0"] * len(query.searchTerms)) + ")")
+            parameters += [term.lower() for term in query.searchTerms]
+
+        statement = "SELECT position, data FROM tasks"
+        if len(conditions) > 0:
+            statement += " WHERE " + " AND ".join(conditions)
+        tasks = self.getJson().get("tasks", [])
+        with self.__lock:
+            rows = self.__connection.execute(statement + " ORDER BY position", parameters).fetchall()
+            storedCount = self.__connection.execute("SELECT count(*) FROM tasks").fetchone()[0]
+        return [(position, json.loads(data)) for position, data in rows] + list(enumerate(tasks[storedCount:], storedCount))
+
+    def __importJson(self) -> None:
+        """
+        Copies the tasks of tasks.json into the database, only the first time it is opened.
+        """
+        with self.__lock:
+            imported = self.__connection.execute("SELECT value FROM meta WHERE key = 'imported'").fetchone()
+        if imported is not None:
+            return
+
+        taskJson = self.fileBroker.readFileContentJson(FileRegistry.STANDALONE_TASKS_JSON)
+        self.saveJson(taskJson)
+        with self.__lock, self.__connection:
+            self.__connection.execute("INSERT INTO meta (key, value) VALUES ('imported', ?)", (str(len(taskJson.get("tasks", []))),))
+
+    def __getTaskRow(self, position: int, task: TaskJsonElementType, data: str) -> tuple[int, str | None, str | None, int | None, int | None, str | None, str | None, str | None, str | None, str]:
+        return (
+            position,
+            task.get("description"),
+            task.get("context"),
+            self.__toInt(task.get("start")),
+            self.__toInt(task.get("due")),
+            task.get("status"),
+            str(task.get("calm", "")).lower(),
+            task.get("raised"),
+            task.get("waited"),
+            data
+        )
+
+    def __toInt(self, value: str | None) -> int | None:
+        try:
+            return int(float(str(value)))
+        except ValueError:
+            return None
+
+    def __encode(self, element: dict[str, str]) -> str:
+        return json.dumps(element, separators=(",", ":"))
@@ -1,8 +1,9 @@
 # class interface
 
+from collections import Counter
 from typing import List
 
-from src.Utils import TaskJsonType
+from src.Utils import FileSignature, TaskJsonType
 
 from ..wrappers.TimeManagement import TimePoint
 from ..Interfaces.ITaskJsonProvider import ITaskJsonProvider
@@ -13,25 +14,51 @@ class TaskJsonProvider(ITaskJsonProvider):
 
     def __init__(self, fileBroker: IFileBroker):
         self.fileBroker = fileBroker
+        self.__cachedJson: TaskJsonType | None = None
+        self.__cacheKey: tuple[FileSignature, str] | None = None
 
     def getJson(self) -> TaskJsonType:
         """
         Reads the tasks json file and injects tasks for projects without any task assigned.
 
+        The result is kept until the file changes, the provider saves the json or the day
+        changes, since injected tasks start today. While it is kept the same object is
+        returned, callers that modify it must save it.
+
         Returns:
             dict: The tasks json.
         """
-        taskJson: TaskJsonType = self.fileBroker.readFileContentJson(FileRegistry.STANDALONE_TASKS_JSON)
+        signature = self._getSignature()
+        cacheKey = None if signature is None else (signature, str(TimePoint.today()))
+        if self.__cachedJson is not None and cacheKey is not None and cacheKey == self.__cacheKey:
+            return self.__cachedJson
+
+        taskJson = self._readJson()
         taskJson = self.__injectOpenProjectTasks(taskJson)
+        self.__cachedJson = taskJson
+        self.__cacheKey = cacheKey
         return taskJson
 
+    def _getSignature(self) -> FileSignature | None:
+        return self.fileBroker.getFileSignature(FileRegistry.STANDALONE_TASKS_JSON)
+
+    def _readJson(self) -> TaskJsonType:
+        return self.fileBroker.readFileContentJson(FileRegistry.STANDALONE_TASKS_JSON)
+
     def saveJson(self, json: TaskJsonType) -> None:
+        self.__cachedJson = None
+        self._writeJson(json)
+
+    def _writeJson(self, json: TaskJsonType) -> None:
         self.fileBroker.writeFileContentJson(FileRegistry.STANDALONE_TASKS_JSON, json)
 
     def __injectOpenProjectTasks(self, taskJson: TaskJsonType) -> TaskJsonType:
         """
         Queries the json to find projects without any task assigned and adds a task to the task list with that project assigned.
 
+        The open tasks of every project are counted in a single pass, then each open project is checked
+        once. Injected tasks count as open tasks of their project, so a project never gets two of them.
+
         Params:
             taskJson: The json to be queried.
 
@@ -40,18 +67,11 @@ class TaskJsonProvider(ITaskJsonProvider):
         """
         projects = taskJson.get("projects", [])
         tasks = taskJson.get("tasks", [])
-        projectsFound: List[str] = []
-
-        for task in tasks:
-            taskProject = task.get("project", None)
-
-            if not isinstance(taskProject, str) or taskProject in projectsFound or task.get("status", "x") != " ":
-                continue
-
-            projectsFound.append(taskProject)
+        openTaskCount = self.__countOpenProjectTasks(tasks)
 
         for project in projects:
-            if project["name"] not in projectsFound and project["status"] == "open":
+            if openTaskCount[project["name"]] == 0 and project["status"] == "open":
+                openTaskCount[project["name"]] += 1
                 tasks.append({
                     "description": "Define next action",
                     "project": project["name"],
@@ -65,3 +85,10 @@ class TaskJsonProvider(ITaskJsonProvider):
                     "calm": "False"
                 })
         return taskJson
+
+    def __countOpenProjectTasks(self, tasks: List[dict[str, str]]) -> Counter[str]:
+        """
+        Returns:
+            Counter: The amount of open tasks of each project.
+        """
+        return Counter(task["project"] for task in tasks if isinstance(task.get("project", None), str) and task.get("status", "x") == " ")
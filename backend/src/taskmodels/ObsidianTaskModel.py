@@ -1,23 +1,17 @@
 import hashlib
+from typing import Any, Tuple
 from ..Interfaces.ITaskModel import ITaskModel
 from .TaskModel import TaskModel
 
 
 class ObsidianTaskModel(TaskModel):
+    __slots__ = ("_file", "_line")
+
     def __init__(self, description: str, context: str, start: int, due: int, severity: float, totalCost: float, investedEffort: float, status: str, file: str, line: int, calm: str, raised: str | None, waited: str | None):
-        self._description: str = description
-        self._context: str = context
-        self._start: int = int(start)
-        self._due: int = int(due)
-        self._severity: float = float(severity)
-        self._totalCost: float = float(totalCost)
-        self._investedEffort: float = float(investedEffort)
-        self._status: str = status
+        # the project and the index are taken from the file and the line
+        super().__init__(description, context, start, due, severity, totalCost, investedEffort, status, calm, "", int(line), raised, waited)
         self._file: str = "/".join(file.split("\\"))
         self._line: int = int(line)
-        self._calm: bool = True if calm.upper().startswith("TRUE") else False
-        self._raised = raised
-        self._waited = waited
 
     # Overrided
     def getDescription(self) -> str:
@@ -38,7 +32,8 @@ class ObsidianTaskModel(TaskModel):
         return f"{self._file.split(slash).pop().split(dot)[0]}:{self._line}"
 
     def __eq__(self, other: ITaskModel):  # type: ignore
-        return self.getEventRaised() == other.getEventRaised() and self.getEventWaited() == other.getEventWaited() and self.getDescription() == other.getDescription() and self.getContext() == other.getContext() and self.getStart() == other.getStart() and self.getDue() == other.getDue() and self.getSeverity() == other.getSeverity() and self.getTotalCost().as_pomodoros() == other.getTotalCost().as_pomodoros() and self.getInvestedEffort().as_pomodoros() == other.getInvestedEffort().as_pomodoros() and self.getStatus() == other.getStatus() and self.getFile() == other.getFile() and self.getLine() == other.getLine() and self.getCalm() == other.getCalm()  # type: ignore
+        # the fingerprints hold the raw fields, there is no need to format descriptions or build time points
+        return self.getFingerprint() == other.getFingerprint()
 
     def getTaskUID(self) -> str:
         hash_input = f"{self._description}{self._file}{self._line}"
@@ -51,6 +46,9 @@ class ObsidianTaskModel(TaskModel):
     def getLine(self) -> int:
         return self._line
 
+    def getFingerprint(self) -> Tuple[Any, ...]:
+        return super().getFingerprint() + (self._file, self._line)
+
     def setFile(self, file: str) -> None:
         self._file = "/".join(file.split("\\"))
 
@@ -1,10 +1,25 @@
 import datetime
 from math import ceil
-from ..wrappers.TimeManagement import TimePoint, TimeAmount
+from typing import Any, Tuple
+from ..wrappers.TimeManagement import DAY_MS, MINUTE_MS, TimePoint, TimeAmount
 from ..Interfaces.ITaskModel import ITaskModel
 
 
 class TaskModel(ITaskModel):
+    """
+    Task stored as plain ints, floats and strings. The TimePoint and TimeAmount values built
+    from them are cached, since heuristics ask for them many times while sorting, and are
+    cleared by the setters that change them.
+    """
+    __slots__ = (
+        "_description", "_context", "_start", "_due", "_severity", "_totalCost", "_investedEffort",
+        "_status", "_calm", "_project", "_index", "_raised", "_waited",
+        "_startPoint", "_duePoint", "_totalCostAmount", "_investedEffortAmount", "_remainingTime"
+    )
+
+    # incremented by the setters of every task, lists built from tasks can tell when any of them changed
+    modifications = 0
+
     def __init__(self, description: str, context: str, start: int, due: int, severity: float, totalCost: float, investedEffort: float, status: str, calm: str, project: str, index: int, raised: str | None, waited: str | None):
         self._description: str = description
         self._context: str = context
@@ -19,17 +34,25 @@ class TaskModel(ITaskModel):
         self._index: int = index
         self._raised = raised
         self._waited = waited
+        self._startPoint: TimePoint | None = None
+        self._duePoint: TimePoint | None = None
+        self._totalCostAmount: TimeAmount | None = None
+        self._investedEffortAmount: TimeAmount | None = None
+        # remaining time together with the minute it was calculated at
+        self._remainingTime: tuple[int, TimeAmount] | None = None
 
     def getEventRaised(self) -> str | None:
         return self._raised
 
     def setEventRaised(self, event: str | None) -> None:
+        TaskModel.modifications += 1
         self._raised = event
 
     def getEventWaited(self) -> str | None:
         return self._waited
 
     def setEventWaited(self, event: str | None) -> None:
+        TaskModel.modifications += 1
         self._waited = event
 
     def getDescription(self) -> str:
@@ -45,19 +68,27 @@ class TaskModel(ITaskModel):
         return self._context
 
     def getStart(self) -> TimePoint:
-        return TimePoint(datetime.datetime.fromtimestamp(self._start / 1e3))
+        if self._startPoint is None:
+            self._startPoint = TimePoint.from_int(self._start)
+        return self._startPoint
 
     def getDue(self) -> TimePoint:
-        return TimePoint(datetime.datetime.fromtimestamp(self._due / 1e3)).strip_time()
+        if self._duePoint is None:
+            self._duePoint = TimePoint.from_int(self._due).strip_time()
+        return self._duePoint
 
     def getSeverity(self) -> float:
         return self._severity
 
     def getTotalCost(self) -> TimeAmount:
-        return TimeAmount(f"{self._totalCost}p")
+        if self._totalCostAmount is None:
+            self._totalCostAmount = TimeAmount.from_pomodoros(self._totalCost)
+        return self._totalCostAmount
 
     def getInvestedEffort(self) -> TimeAmount:
-        return TimeAmount(f"{self._investedEffort}p")
+        if self._investedEffortAmount is None:
+            self._investedEffortAmount = TimeAmount.from_pomodoros(self._investedEffort)
+        return self._investedEffortAmount
 
     def getStatus(self) -> str:
         return self._status
@@ -75,47 +106,77 @@ class TaskModel(ITaskModel):
         return self._project
 
     def setDescription(self, description: str) -> None:
+        TaskModel.modifications += 1
         self._description = description
 
     def setContext(self, context: str) -> None:
+        TaskModel.modifications += 1
         self._context = context
 
     def setStart(self, start: TimePoint) -> None:
+        TaskModel.modifications += 1
         self._start = start.as_int()
         if self._due < start.strip_time().as_int():
             self._due = start.strip_time().as_int()
+        self.__clearDateCache()
 
     def setDue(self, due: TimePoint) -> None:
+        TaskModel.modifications += 1
         self._due = due.as_int()
         if self._start > due.as_int():
             self._start = due.as_int()
+        self.__clearDateCache()
 
     def setSeverity(self, severity: float) -> None:
+        TaskModel.modifications += 1
         self._severity = severity
 
     def setTotalCost(self, totalCost: TimeAmount) -> None:
+        TaskModel.modifications += 1
         self._totalCost = totalCost.as_pomodoros()
+        self._totalCostAmount = None
 
     def setInvestedEffort(self, investedEffort: TimeAmount) -> None:
+        TaskModel.modifications += 1
         self._investedEffort = investedEffort.as_pomodoros()
+        self._investedEffortAmount = None
 
     def setStatus(self, status: str) -> None:
+        TaskModel.modifications += 1
         self._status = status
 
     def setCalm(self, calm: bool) -> None:
+        TaskModel.modifications += 1
         self._calm = calm
 
     def calculateRemainingTime(self) -> TimeAmount:
-        dueDate = self.getDue().as_int()
+        # same value as TimePoint.now().as_int(), without building a TimePoint on every call
+        currentDate = int(datetime.datetime.now().timestamp() * 1e3)
+        # the due date is a midnight, so the amount of days left is the same during the whole minute
+        currentMinute = currentDate // MINUTE_MS
+        if self._remainingTime is not None and self._remainingTime[0] == currentMinute:
+            return self._remainingTime[1]
 
-        currentDate = TimePoint.now().as_int()
-        d = (dueDate - currentDate) / (datetime.timedelta(days=1).total_seconds() * 1000)
+        dueDate = self.getDue().as_int()
+        d = (dueDate - currentDate) / DAY_MS
         d = max(0, d)
         d = ceil(d)
-        return TimeAmount(f"{d}d")
-    
+        self._remainingTime = (currentMinute, TimeAmount.from_days(d))
+        return self._remainingTime[1]
+
+    def __clearDateCache(self) -> None:
+        self._startPoint = None
+        self._duePoint = None
+        self._remainingTime = None
+
     def getTaskUID(self) -> str:
         return f"{self._index}"
 
+    def getFingerprint(self) -> Tuple[Any, ...]:
+        return (
+            self._description, self._context, self._start, self._due, self._severity, self._totalCost,
+            self._investedEffort, self._status, self._calm, self._project, self._raised, self._waited
+        )
+
     def __eq__(self, other: ITaskModel):  # type: ignore
         return self._index == other._index  # type: ignore
@@ -9,6 +9,7 @@ from ..Interfaces.ITaskProvider import ITaskProvider
 from ..Interfaces.ITaskModel import ITaskModel
 from ..Interfaces.ITaskJsonProvider import ITaskJsonProvider
 from ..taskmodels.ObsidianTaskModel import ObsidianTaskModel
+from ..taskjsonproviders.ObsidianVaultFileParser import CHECKBOX, tokenizeTaskLine
 from typing import Callable, List
 
 
@@ -19,7 +20,10 @@ class ObsidianTaskProvider(ITaskProvider):
         self.serviceRunning = True
         self.lastJson: TaskJsonType = {}
         self.lastTaskList: List[ITaskModel] = []
+        self.taskListVersion = 0
         self.onTaskListUpdatedCallbacks: list[Callable[[], None]] = []
+        # text of the task at each (file, line) when it was last read or written, to find it again before saving it
+        self.taskTexts: dict[tuple[str, int], str] = {}
         self.__disableThreading = disableThreading
         if not self.__disableThreading:
             self.service = threading.Thread(target=self.__serviceThread)
@@ -35,9 +39,11 @@ class ObsidianTaskProvider(ITaskProvider):
             newTaskList = self.__getTaskList()
             if not self.compare(self.lastTaskList, newTaskList):
                 self.lastTaskList = newTaskList
+                self.taskListVersion += 1
                 for callback in self.onTaskListUpdatedCallbacks:
                     callback()
-            threading.Event().wait(10)
+            # wakes up as soon as the vault changes instead of waiting the whole period
+            self.fileBroker.waitForVaultChanges(VaultRegistry.OBSIDIAN, 10)
 
     def __getTaskList(self) -> List[ITaskModel]:
         obsidianJson = self.TaskJsonProvider.getJson()
@@ -47,27 +53,48 @@ class ObsidianTaskProvider(ITaskProvider):
             self.lastJson = obsidianJson
         taskListJson = obsidianJson["tasks"]
         taskList: List[ITaskModel] = []
+        taskTexts: dict[tuple[str, int], str] = {}
         for task in taskListJson:
             try:
                 obsidianTask = ObsidianTaskModel(task["taskText"], task["track"], int(task["starts"]), int(task["due"]), float(task["severity"]), float(task["total_cost"]), float(task["effort_invested"]), task["status"], task["file"], int(task["line"]), task["calm"], task.get("raised"), task.get("waited"))
                 taskList.append(obsidianTask)
+                taskTexts[(obsidianTask.getFile(), obsidianTask.getLine())] = task["taskText"]
             except Exception as e:
                 print(f"Error while reading task: {e}")
                 continue
+        self.taskTexts = taskTexts
         return taskList
 
     def getTaskList(self) -> List[ITaskModel]:
         return self.lastTaskList
 
+    def getTaskListVersion(self) -> int:
+        return self.taskListVersion
+
     def getTaskListAttribute(self, string: str) -> list[dict[str, str]]:
         try:
             return self.lastJson[string]
         except Exception:
             return self.TaskJsonProvider.getJson()[string]
 
+    def _getTaskText(self, task: ITaskModel) -> str:
+        return task.getDescription().split("@")[0].replace(f"({task.getContext()})", "").strip()
+
+    def _getLineTaskText(self, line: str) -> str | None:
+        """
+        Gets the text of the task written in a line, whatever its status.
+
+        Returns:
+            str | None: The task text, None if the line is not a task.
+        """
+        body = line.strip()
+        if not body.startswith("- [") or body[4:5] != "]":
+            return None
+        return tokenizeTaskLine(CHECKBOX + body[5:])[0]
+
     def _getTaskLine(self, task: ITaskModel) -> str:
         context = task.getContext()
-        description = task.getDescription().split("@")[0].replace(f"({context})", "").strip()
+        description = self._getTaskText(task)
         start = str(task.getStart())
         due = str(task.getDue())
         severity = task.getSeverity()
@@ -90,7 +117,8 @@ class ObsidianTaskProvider(ITaskProvider):
         file = ""
         lineNumber = -1
         if not isinstance(task, ObsidianTaskModel) or task.getFile() == "" or task.getLine() == -1:
-            lines = self.fileBroker.readFileContent(FileRegistry.OBSIDIAN_TASKS_MD).split("\n")
+            content = self.fileBroker.readFileContent(FileRegistry.OBSIDIAN_TASKS_MD)
+            lines = content.split("\n")
             newLines: list[str] = []
 
             numLines = 1
@@ -104,20 +132,64 @@ class ObsidianTaskProvider(ITaskProvider):
             if isinstance(task, ObsidianTaskModel):
                 task.setFile("ObsidianTaskProvider.md")
                 task.setLine(numLines - 1)
+                self.taskTexts[(task.getFile(), task.getLine())] = self._getTaskText(task)
 
-            self.fileBroker.writeFileContent(FileRegistry.OBSIDIAN_TASKS_MD, "\n".join(newLines))
+            # the file is only rewritten when there are done tasks or empty lines to clean
+            if len(newLines) == len(lines) - (1 if lines[-1] == "" else 0) + 1:
+                separator = "\n" if len(content) > 0 and not content.endswith("\n") else ""
+                self.fileBroker.appendFileContent(FileRegistry.OBSIDIAN_TASKS_MD, separator + taskLine)
+            else:
+                self.fileBroker.writeFileContent(FileRegistry.OBSIDIAN_TASKS_MD, "\n".join(newLines))
         else:
             ObsidianTask: ObsidianTaskModel = task
             file = ObsidianTask.getFile()
             lineNumber = ObsidianTask.getLine()
-            fileLines = self.fileBroker.getVaultFileLines(VaultRegistry.OBSIDIAN, file)
-            if lineNumber >= len(fileLines):
-                lineNumber = len(fileLines)
-                fileLines.append(taskLine)
-            else:
-                lineOfInterest = fileLines[lineNumber]
-                fileLines[lineNumber] = lineOfInterest.split("- [")[0] + taskLine
-            self.fileBroker.writeVaultFileLines(VaultRegistry.OBSIDIAN, file, fileLines)
+            # the text the task had when it was read, the task itself may have been renamed since then
+            taskText = self.taskTexts.get((file, lineNumber), self._getTaskText(task))
+
+            def patchTaskLine(line: str) -> str | None:
+                # the file may have changed since it was parsed, only the line that holds this task is overwritten
+                if self._getLineTaskText(line) != taskText:
+                    return None
+                return line.split("- [")[0] + taskLine.rstrip("\n")
+
+            if not self.fileBroker.patchVaultFileLine(VaultRegistry.OBSIDIAN, file, lineNumber, patchTaskLine):
+                fileLines = self.fileBroker.getVaultFileLines(VaultRegistry.OBSIDIAN, file)
+                foundLine = self.__findTaskLine(fileLines, taskText, lineNumber)
+                if foundLine is not None:
+                    # the task moved, the file is rewritten with the task at its new line
+                    lineEnding = "\n" if fileLines[foundLine].endswith("\n") else ""
+                    fileLines[foundLine] = fileLines[foundLine].split("- [")[0] + taskLine.rstrip("\n") + lineEnding
+                    lineNumber = foundLine
+                elif lineNumber >= len(fileLines):
+                    # the task is not in the file yet, like the next action of a project
+                    if len(fileLines) > 0 and not fileLines[-1].endswith("\n"):
+                        fileLines[-1] += "\n"
+                    fileLines.append(taskLine)
+                    lineNumber = len(fileLines) - 1
+                else:
+                    print(f"Error while saving task {taskText}: it is no longer in {file}")
+                    return
+                self.fileBroker.writeVaultFileLines(VaultRegistry.OBSIDIAN, file, fileLines)
+                ObsidianTask.setLine(lineNumber)
+            self.taskTexts[(file, lineNumber)] = self._getTaskText(task)
+
+    def __findTaskLine(self, fileLines: list[str], taskText: str, lineNumber: int) -> int | None:
+        """
+        Looks for the line of a task that moved in its file.
+
+        Returns:
+            int | None: The line that holds the task, the nearest one to its last known line if
+            several tasks have the same text, None if the task is not in the file.
+        """
+        found = [number for number, line in enumerate(fileLines) if self._getLineTaskText(line) == taskText]
+        if len(found) == 0:
+            return None
+        return min(found, key=lambda number: abs(number - lineNumber))
+
+    def flush(self) -> None:
+        # tasks are written to the vault as soon as they are saved
+        pass
 
     def createDefaultTask(self, description: str) -> ObsidianTaskModel:
         starts = int(datetime.datetime.now().timestamp() * 1e3)
@@ -1,22 +1,60 @@
 import datetime
+import hashlib
 import threading
 from ..Interfaces.ITaskProvider import ITaskProvider
 from ..Interfaces.ITaskModel import ITaskModel
 from ..Interfaces.ITaskJsonProvider import ITaskJsonProvider
 from ..Interfaces.IFileBroker import IFileBroker, FileRegistry
+from ..Utils import TaskJsonType, TaskQuery
 from ..taskmodels.TaskModel import TaskModel
 from typing import Callable, List
 import json
 
 
+def getTaskListSignature(tasks: List[dict[str, str]]) -> str:
+    """
+    Identifies the content of a task list, so the journal is only replayed on the list its indices refer to.
+    """
+    return hashlib.sha1(json.dumps(tasks, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
 class TaskProvider(ITaskProvider):
 
-    def __init__(self, task_json_provider: ITaskJsonProvider, fileBroker: IFileBroker, disableThreading: bool = False):
+    def __init__(self, task_json_provider: ITaskJsonProvider, fileBroker: IFileBroker, disableThreading: bool = False, flushDelay: float = 0.0):
+        """
+        Params:
+            task_json_provider: The provider the task list is read from and saved to.
+            fileBroker: The file broker used to import tasks and to keep the journal.
+            disableThreading: If True, the service thread that notifies the callbacks is not started.
+            flushDelay: Seconds saved tasks are kept in memory before the task list is written.
+                With 0, every saved task is written right away. Otherwise saved tasks are also
+                appended to a journal, which is replayed on startup if the process stopped
+                before writing them. The journal starts with the signature of the task list its
+                indices refer to, and is only replayed on that same list.
+        """
         self.taskJsonProvider = task_json_provider
         self.fileBroker = fileBroker
         self.dict_task_list = self.taskJsonProvider.getJson()
         self.onTaskListUpdatedCallbacks: list[Callable[[], None]] = []
         self.__disableThreading = disableThreading
+        self.__flushDelay = flushDelay
+        self.__flushTimer: threading.Timer | None = None
+        self.__dirty = False
+        self.__taskListLoaded = False
+        # task models built from the last json read, reused while the provider returns the same json
+        self.__lastTaskJson: TaskJsonType | None = None
+        self.__taskModels: List[ITaskModel] = []
+        # the task list kept in memory changed since the task models were built
+        self.__taskModelsStale = False
+        self.__taskListVersion = 0
+        # task modifications when the task models were built, and the models by their position in the stored json
+        self.__taskModelsModifications = 0
+        self.__storedTaskModels: dict[int, ITaskModel] | None = None
+        # task list the indices of the journal refer to, its signature starts the journal once something is saved
+        self.__journalBase: List[dict[str, str]] | None = None
+        self.__journalStarted = False
+        # the timer thread flushes while commands are saving tasks
+        self.__lock = threading.RLock()
         if not self.__disableThreading:
             self.serviceRunning = True
             self.service = threading.Thread(target=self.__serviceThread)
@@ -32,6 +70,7 @@ class TaskProvider(ITaskProvider):
         if not self.__disableThreading:
             self.serviceRunning = False
             self.service.join()
+        self.flush()
 
     def __serviceThread(self) -> None:
         """
@@ -47,21 +86,81 @@ class TaskProvider(ITaskProvider):
         Gets the task list.
 
         This method reads the task list from the json file and creates a list of task models from it.
+        While saved tasks are waiting to be written, the task list kept in memory is newer than the
+        file, so the task models are built from it instead. While the json provider returns the same
+        json, the task models built from it are returned again.
 
         Returns:
             List[ITaskModel]: The task list."""
-        newTaskJson = self.taskJsonProvider.getJson()
-        self.dict_task_list = dict(newTaskJson)
-        self.dict_task_list["tasks"] = []
-        task_list: List[ITaskModel] = []
-        index = 0
-        for task in newTaskJson["tasks"]:
-            if task["status"] == "x":
-                continue
-            task_list.append(self.createTaskFromDict(task, index))
-            self.dict_task_list["tasks"].append(task)
-            index += 1
-        return task_list
+        with self.__lock:
+            if self.__dirty:
+                if self.__taskModelsStale:
+                    self.__buildTaskModels()
+                return list(self.__taskModels)
+
+            newTaskJson = self.taskJsonProvider.getJson()
+            if newTaskJson is self.__lastTaskJson:
+                return list(self.__taskModels)
+
+            self.dict_task_list = dict(newTaskJson)
+            self.dict_task_list["tasks"] = [task for task in newTaskJson["tasks"] if task["status"] != "x"]
+            self.__lastTaskJson = newTaskJson
+            self.__startJournalBase()
+
+            if not self.__taskListLoaded:
+                self.__taskListLoaded = True
+                if self.__flushDelay > 0 and self.__replayJournal(newTaskJson["tasks"]):
+                    self.flush()
+                    # the replayed tasks were just written, so the json read no longer matches the list
+                    self.__lastTaskJson = None
+
+            self.__buildTaskModels()
+            return list(self.__taskModels)
+
+    def __buildTaskModels(self) -> None:
+        # done tasks are skipped but keep their index, which is their position in the task list kept in memory
+        self.__taskModels = [self.createTaskFromDict(task, index) for index, task in enumerate(self.dict_task_list["tasks"]) if task["status"] != "x"]
+        self.__taskModelsStale = False
+        self.__taskModelsModifications = TaskModel.modifications
+        self.__storedTaskModels = None
+        self.__taskListVersion += 1
+
+    def getTaskListVersion(self) -> int:
+        """
+        Returns:
+            int: The times getTaskList built the task models again, because the json changed.
+        """
+        return self.__taskListVersion
+
+    def queryTasks(self, query: TaskQuery) -> List[ITaskModel] | None:
+        """
+        Finds the task models that may meet the query with the queries of the json provider.
+
+        The stored tasks match the task models only while no task was saved or modified since the
+        models were built from them, and the json provider still returns the same json. Otherwise
+        the tasks must be scanned.
+
+        Params:
+            query: The conditions to meet.
+
+        Returns:
+            List[ITaskModel]: The task models found, in task list order. None if the tasks must be scanned instead.
+        """
+        with self.__lock:
+            lastTaskJson = self.__lastTaskJson
+            if self.__dirty or lastTaskJson is None or TaskModel.modifications != self.__taskModelsModifications:
+                return None
+            if self.taskJsonProvider.getJson() is not lastTaskJson:
+                return None
+            rows = self.taskJsonProvider.queryTasks(query)
+            if rows is None:
+                return None
+            if self.__storedTaskModels is None:
+                # done tasks have no model, the other tasks have one in the same order
+                openPositions = [position for position, task in enumerate(lastTaskJson["tasks"]) if task["status"] != "x"]
+                self.__storedTaskModels = dict(zip(openPositions, self.__taskModels))
+            storedTaskModels = self.__storedTaskModels
+            return [storedTaskModels[position] for position, _ in rows if position in storedTaskModels]
 
     def createTaskFromDict(self, dict_task: dict[str, str], index: int) -> ITaskModel:
         """
@@ -104,31 +203,127 @@ class TaskProvider(ITaskProvider):
         Params:
             task: The task to be saved.
         """
-        task_list = self.getTaskList()
-        for index in range(len(task_list)):
-            if task_list[index] == task:
-                self.dict_task_list["tasks"][index] = dict[str, str](
-                    description=task.getDescription().split(" @ ")[0].strip(),
-                    context=task.getContext(),
-                    start=str(task.getStart().as_int()),
-                    due=str(task.getDue().as_int()),
-                    severity=str(task.getSeverity()),
-                    totalCost=str(task.getTotalCost().as_pomodoros()),
-                    investedEffort=str(task.getInvestedEffort().as_pomodoros()),
-                    status=task.getStatus(),
-                    calm="True" if task.getCalm() else "False",
-                    project=task.getProject(),
-                )
-
-                raises = task.getEventRaised()
-                waits = task.getEventWaited()
-                if isinstance(raises, str):
-                    self.dict_task_list["tasks"][index]["raised"] = raises
-                if isinstance(waits, str):
-                    self.dict_task_list["tasks"][index]["waited"] = waits
-                break
+        with self.__lock:
+            if not self.__taskListLoaded:
+                self.getTaskList()
+
+            index = int(task.getTaskUID())
+            taskDict = self.__getDictFromTask(task)
+            self.__storeTaskDict(index, taskDict)
+            self.__dirty = True
+
+            if self.__flushDelay <= 0:
+                self.flush()
+                return
+
+            record = json.dumps({"index": index, "task": taskDict}) + "\n"
+            if not self.__journalStarted and self.__journalBase is not None:
+                record = json.dumps({"base": getTaskListSignature(self.__journalBase)}) + "\n" + record
+                self.__journalStarted = True
+            self.fileBroker.appendFileContent(FileRegistry.STANDALONE_TASKS_JOURNAL, record)
+            if self.__flushTimer is None:
+                self.__flushTimer = threading.Timer(self.__flushDelay, self.flush)
+                self.__flushTimer.daemon = True
+                self.__flushTimer.start()
+
+    def flush(self) -> None:
+        """
+        Writes the saved tasks that are still kept in memory in a single write, and empties the journal.
+        """
+        with self.__lock:
+            if self.__flushTimer is not None:
+                self.__flushTimer.cancel()
+                self.__flushTimer = None
+            if not self.__dirty:
+                return
+            self.__dirty = False
+            self.taskJsonProvider.saveJson(self.dict_task_list)
+            if self.__flushDelay > 0:
+                # the indices of the next saved tasks refer to the list just written, done tasks included
+                self.__startJournalBase()
+                self.fileBroker.writeFileContent(FileRegistry.STANDALONE_TASKS_JOURNAL, "")
+
+    def __startJournalBase(self) -> None:
+        # a shallow copy is enough, saved tasks replace the dicts of the list instead of changing them
+        self.__journalBase = list(self.dict_task_list["tasks"])
+        self.__journalStarted = False
+
+    def __getDictFromTask(self, task: ITaskModel) -> dict[str, str]:
+        taskDict = dict[str, str](
+            description=task.getDescription().split(" @ ")[0].strip(),
+            context=task.getContext(),
+            start=str(task.getStart().as_int()),
+            due=str(task.getDue().as_int()),
+            severity=str(task.getSeverity()),
+            totalCost=str(task.getTotalCost().as_pomodoros()),
+            investedEffort=str(task.getInvestedEffort().as_pomodoros()),
+            status=task.getStatus(),
+            calm="True" if task.getCalm() else "False",
+            project=task.getProject(),
+        )
+
+        raises = task.getEventRaised()
+        waits = task.getEventWaited()
+        if isinstance(raises, str):
+            taskDict["raised"] = raises
+        if isinstance(waits, str):
+            taskDict["waited"] = waits
+        return taskDict
+
+    def __storeTaskDict(self, index: int, taskDict: dict[str, str]) -> None:
+        """
+        Replaces the task at the given index of the task list, tasks created after the list was read are appended.
+        """
+        tasks = self.dict_task_list["tasks"]
+        if index < 0:
+            return
+        if index < len(tasks):
+            tasks[index] = taskDict
+        else:
+            tasks.append(taskDict)
+        self.__taskModelsStale = True
+
+    def __replayJournal(self, storedTasks: List[dict[str, str]]) -> bool:
+        """
+        Applies the tasks saved by a previous run that stopped before writing them.
 
-        self.taskJsonProvider.saveJson(self.dict_task_list)
+        The indices of the journal refer either to the open tasks read from the file, or to every
+        stored task when the previous run had already written the list once. The journal is skipped
+        if the file matches neither, since it was written after the journal, like when the previous
+        run stopped right after writing the list but before emptying the journal.
+
+        Params:
+            storedTasks: The tasks read from the file, done tasks included.
+
+        Returns:
+            bool: True if any task was applied.
+        """
+        lines = [line for line in self.fileBroker.readFileContent(FileRegistry.STANDALONE_TASKS_JOURNAL).splitlines() if line.strip() != ""]
+        if len(lines) == 0:
+            return False
+        try:
+            base = json.loads(lines[0])["base"]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Error while replaying the tasks journal, it has no valid signature: {e}")
+            return False
+        if base == getTaskListSignature(storedTasks):
+            self.dict_task_list["tasks"] = list(storedTasks)
+        elif base != getTaskListSignature(self.dict_task_list["tasks"]):
+            print("The tasks journal doesn't match the stored tasks, they were written after it, ignoring it")
+            return False
+
+        replayed = False
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+                self.__storeTaskDict(int(record["index"]), dict(record["task"]))
+            except (ValueError, KeyError, TypeError) as e:
+                # the last record may be cut if the process stopped while writing it
+                print(f"Error while replaying the tasks journal, ignoring the rest of it: {e}")
+                break
+            replayed = True
+        self.__dirty = self.__dirty or replayed
+        return replayed
 
     def createDefaultTask(self, description: str) -> ITaskModel:
         """
@@ -162,8 +357,12 @@ class TaskProvider(ITaskProvider):
             project=""
         )
 
-        task = self.createTaskFromDict(default_task, len(self.dict_task_list["tasks"]))
-        self.dict_task_list["tasks"].append(default_task)
+        with self.__lock:
+            if not self.__taskListLoaded:
+                self.getTaskList()
+            task = self.createTaskFromDict(default_task, len(self.dict_task_list["tasks"]))
+            self.dict_task_list["tasks"].append(default_task)
+            self.__taskModelsStale = True
 
         return task
 
@@ -201,7 +400,9 @@ class TaskProvider(ITaskProvider):
         return True
 
     def _exportJson(self) -> bytearray:
-        jsonData = self.taskJsonProvider.getJson()
+        with self.__lock:
+            # the saved tasks that are not written yet are only in the task list kept in memory
+            jsonData = self.dict_task_list if self.__dirty else self.taskJsonProvider.getJson()
         jsonStr = json.dumps(jsonData, indent=4)
         return bytearray(jsonStr, "utf-8")
 
@@ -213,8 +414,12 @@ class TaskProvider(ITaskProvider):
         return supportedFormats[selectedFormat]()
 
     def _importJson(self) -> None:
-        self.dict_task_list = self.fileBroker.readFileContentJson(FileRegistry.LAST_RECEIVED_FILE)
-        self.taskJsonProvider.saveJson(self.dict_task_list)
+        with self.__lock:
+            # the imported list replaces the saved tasks that are not written yet, and is written right away
+            self.dict_task_list = self.fileBroker.readFileContentJson(FileRegistry.LAST_RECEIVED_FILE)
+            self.__lastTaskJson = None
+            self.__dirty = True
+            self.flush()
 
     def importTasks(self, selectedFormat: str) -> None:
         supportedFormats: dict[str, Callable[[], None]] = {
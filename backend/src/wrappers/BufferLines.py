@@ -0,0 +1,136 @@
+"""
+This module contains the helper used to work with single lines of a file
+read as raw bytes, usually memory mapped, without splitting the whole file.
+"""
+
+import io
+import locale
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+from src.Utils import VaultFileBuffer
+
+# bytes counted at once when looking for the line number of a line inside a buffer
+LINE_COUNT_CHUNK_SIZE = 1024 * 1024
+
+
+class BufferLines:
+    """
+    Locates and decodes single lines of a buffer. Lines end with "\n", "\r\n" or "\r"
+    like in universal newlines mode, and are decoded like a file opened in text mode.
+
+    Line numbers are counted in chunks while moving forward, so lineNumber and lineOffset
+    must be asked for in increasing order.
+    """
+
+    def __init__(self, buffer: VaultFileBuffer):
+        self.buffer = buffer
+        self.size = len(buffer)
+        self.encoding = locale.getpreferredencoding(False)
+        self.__countedUpTo = 0
+        self.__countedLines = 0
+
+    def lineStart(self, offset: int) -> int:
+        newline = self.buffer.rfind(b"\n", 0, offset)
+        carriageReturn = self.buffer.rfind(b"\r", newline + 1, offset)
+        return max(newline, carriageReturn) + 1
+
+    def lineEnd(self, start: int) -> tuple[int, int]:
+        """
+        Returns:
+            tuple: The offset where the content of the line starting at the given offset ends,
+            and the offset where the next line starts.
+        """
+        newline = self.buffer.find(b"\n", start)
+        end = self.size if newline < 0 else newline
+        carriageReturn = self.buffer.find(b"\r", start, end)
+        if carriageReturn >= 0:
+            end = carriageReturn
+        if end == self.size:
+            return end, end
+        if self.buffer[end:end + 2] == b"\r\n":
+            return end, end + 2
+        return end, end + 1
+
+    def decodeLine(self, start: int) -> tuple[str, int]:
+        """
+        Returns:
+            tuple: The line starting at the given offset, ending in "\n" unless it is the last one,
+            and the offset where the next line starts.
+        """
+        end, nextLine = self.lineEnd(start)
+        line = self.buffer[start:end].decode(self.encoding, errors="ignore")
+        return (line, nextLine) if end == nextLine else (line + "\n", nextLine)
+
+    def decodeLines(self, start: int, end: int) -> list[str]:
+        return io.TextIOWrapper(io.BytesIO(self.buffer[start:end]), errors="ignore").readlines()
+
+    def lineNumber(self, lineStart: int) -> int:
+        """
+        Number of the line starting at the given offset.
+        """
+        position = self.__countedUpTo
+        while position < lineStart:
+            chunkEnd = self.__chunkEnd(position, lineStart)
+            self.__countedLines += self.__countLineBreaks(position, chunkEnd)
+            position = chunkEnd
+        self.__countedUpTo = position
+        return self.__countedLines
+
+    def lineOffset(self, lineNumber: int) -> int | None:
+        """
+        Offset where the given line starts, None if the buffer has less lines.
+        """
+        position = self.__countedUpTo
+        line = self.__countedLines
+        while line < lineNumber and position < self.size:
+            chunkEnd = self.__chunkEnd(position, self.size)
+            lineBreaks = self.__countLineBreaks(position, chunkEnd)
+            if line + lineBreaks < lineNumber:
+                line += lineBreaks
+                position = chunkEnd
+                continue
+            # the line starts inside this chunk, walk it line by line
+            while line < lineNumber:
+                position = self.lineEnd(position)[1]
+                line += 1
+        self.__countedUpTo = position
+        self.__countedLines = line
+        return position if line == lineNumber and position < self.size else None
+
+    def lineCount(self) -> int:
+        lastLineStart = self.lineStart(self.size)
+        return self.lineNumber(lastLineStart) + (1 if lastLineStart < self.size else 0)
+
+    def __chunkEnd(self, position: int, limit: int) -> int:
+        chunkEnd = min(limit, position + LINE_COUNT_CHUNK_SIZE)
+        # never split a "\r\n" between two chunks, a "\r" followed by another one is a line break by itself
+        if self.buffer[chunkEnd - 1:chunkEnd] == b"\r" and self.buffer[chunkEnd:chunkEnd + 1] == b"\n":
+            chunkEnd = min(limit, chunkEnd + 1)
+        return chunkEnd
+
+    def __countLineBreaks(self, start: int, end: int) -> int:
+        chunk = self.buffer[start:end]
+        return chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+
+
+@contextmanager
+def openMappedFile(path: str) -> Iterator[VaultFileBuffer]:
+    """
+    Opens a file for reading its raw content in place, memory mapped.
+
+    Params:
+        path: The path of the file.
+
+    Returns:
+        Iterator[VaultFileBuffer]: Gives the content of the file, which is only valid inside the context.
+    """
+    with open(path, "rb") as file:
+        # empty files can't be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
@@ -6,44 +6,48 @@ for time amounts and time points, respectively.
 
 from dataclasses import dataclass
 import datetime
+import functools
 import typing
 from math import ceil
 
 
+# milliseconds in each unit of the time strings
+SECOND_MS = 1000
+MINUTE_MS = 60 * SECOND_MS
+POMODORO_MS = 25 * MINUTE_MS
+DAY_MS = 24 * 60 * MINUTE_MS
+
+# distinct time strings whose value is remembered, user input and configuration only repeat a few
+PARSE_CACHE_SIZE = 1024
+
+
 @dataclass
 class TimeAmount:
+    __slots__ = ("int_representation",)
     int_representation: int
     """
     This module contains the TimeAmount class, which is a wrapper for
         time amounts.
     It allows for easy manipulation of time amounts in a human-readable format.
+
+    Amounts known as numbers should be built with the from_* factories, which don't
+    format nor parse any string.
     """
 
     def __init__(self, str_representation: str) -> None:
-        conversionFunc = _convert_time_string_to_miliseconds if str_representation.find(":") == -1 else _convert_hour_string_to_miliseconds
-        self.int_representation = conversionFunc(
-            str_representation
-        )
+        self.int_representation = _parse_time_string(str_representation)
 
     def __add__(self, other: "TimeAmount") -> "TimeAmount":
-        result = TimeAmount("0.0p")
-        result.int_representation = self.int_representation + other.int_representation
-        return result
+        return TimeAmount.from_miliseconds(self.int_representation + other.int_representation)
 
     def __sub__(self, other: "TimeAmount") -> "TimeAmount":
-        result = TimeAmount("0.0p")
-        result.int_representation = self.int_representation - other.int_representation
-        return result
+        return TimeAmount.from_miliseconds(self.int_representation - other.int_representation)
 
     def __mul__(self, other: "TimeAmount") -> "TimeAmount":
-        result = TimeAmount("0.0p")
-        result.int_representation = self.int_representation * other.int_representation
-        return result
+        return TimeAmount.from_miliseconds(self.int_representation * other.int_representation)
 
     def __truediv__(self, other: "TimeAmount") -> "TimeAmount":
-        result = TimeAmount("0.0p")
-        result.int_representation = int(self.int_representation / other.int_representation)
-        return result
+        return TimeAmount.from_miliseconds(int(self.int_representation / other.int_representation))
 
     def __str__(self) -> str:
         return _convert_seconds_to_time_string(self.int_representation)
@@ -58,29 +62,80 @@ class TimeAmount:
         """
         Returns the time amount as a number of days.
         """
-        return int(self.int_representation / 86400000)
+        return int(self.int_representation / DAY_MS)
+
+    @staticmethod
+    def from_miliseconds(value: int) -> "TimeAmount":
+        result = TimeAmount.__new__(TimeAmount)
+        result.int_representation = value
+        return result
+
+    @staticmethod
+    def from_seconds(value: float) -> "TimeAmount":
+        return TimeAmount.from_miliseconds(int(value * SECOND_MS))
+
+    @staticmethod
+    def from_pomodoros(value: float) -> "TimeAmount":
+        return TimeAmount.from_miliseconds(int(value * POMODORO_MS))
+
+    @staticmethod
+    def from_days(value: float) -> "TimeAmount":
+        return TimeAmount.from_miliseconds(int(value * DAY_MS))
+
+    @staticmethod
+    def parse_cache_info() -> "functools._CacheInfo":
+        """
+        Returns the hits, misses and size of the cache of parsed time strings.
+        """
+        return _parse_time_string.cache_info()
 
 
 @dataclass
 class TimePoint:
-    timestamp: float
-    str_representation: str
     """
     This module contains the TimePoint class, which is a wrapper for time points.
     It allows for easy manipulation of time points in a human-readable format.
+
+    The time point is kept as milliseconds since the epoch. Its datetime and string forms
+    are only built when asked for, most callers just compare as_int values. The timestamp
+    and the string are still its dataclass fields, so asdict serializes it as before.
     """
+    __slots__ = ("_miliseconds", "_datetime", "_str")
+    if not typing.TYPE_CHECKING:
+        # the dataclass fields, read through the properties below
+        timestamp: float
+        str_representation: str
 
     def __init__(self, datetime_representation: datetime.datetime) -> None:
-        self.datetime_representation = datetime_representation
-        self.timestamp = datetime_representation.timestamp()
-        self.str_representation = datetime_representation.strftime("%Y-%m-%d")
+        self._miliseconds = int(datetime_representation.timestamp() * 1e3)
+        self._datetime: datetime.datetime | None = datetime_representation
+        self._str: str | None = None
+
+    @property
+    def datetime_representation(self) -> datetime.datetime:
+        if self._datetime is None:
+            self._datetime = datetime.datetime.fromtimestamp(self._miliseconds / 1e3)
+        return self._datetime
+
+    @property
+    def timestamp(self) -> float:
+        return self._miliseconds / 1e3
+
+    @property
+    def str_representation(self) -> str:
+        if self._str is None:
+            self._str = self.datetime_representation.strftime("%Y-%m-%d")
+        return self._str
 
     def __add__(self, other: TimeAmount) -> "TimePoint":
-        return TimePoint(datetime.datetime.fromtimestamp(self.datetime_representation.timestamp() + other.int_representation / 1000))
+        return TimePoint.from_int(self._miliseconds + other.int_representation)
 
     @typing.no_type_check
     def __eq__(self, other) -> bool:
-        return self.datetime_representation == other.datetime_representation
+        return self.as_int() == other.as_int()
+
+    def __repr__(self) -> str:
+        return f"TimePoint(timestamp={self.timestamp!r}, str_representation={self.str_representation!r})"
 
     def __str__(self) -> str:
         fullFormat = self.datetime_representation.strftime("%Y-%m-%dT%H:%M")
@@ -108,10 +163,14 @@ class TimePoint:
 
     @staticmethod
     def from_int(value: int) -> "TimePoint":
-        return TimePoint(datetime.datetime.fromtimestamp(value / 1e3))
+        result = TimePoint.__new__(TimePoint)
+        result._miliseconds = int(value)
+        result._datetime = None
+        result._str = None
+        return result
 
     def as_int(self) -> int:
-        return int(self.datetime_representation.timestamp() * 1e3)
+        return self._miliseconds
 
     def strip_time(self) -> "TimePoint":
         return TimePoint(self.datetime_representation.replace(hour=0, minute=0, second=0, microsecond=0))
@@ -120,6 +179,16 @@ class TimePoint:
 # Private helper functions in module
 
 
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_time_string(value: str) -> int:
+    """
+    Converts a time string in any of the accepted formats to miliseconds, remembering
+    the result for the strings parsed most recently.
+    """
+    conversionFunc = _convert_time_string_to_miliseconds if value.find(":") == -1 else _convert_hour_string_to_miliseconds
+    return conversionFunc(value)
+
+
 def _convert_hour_string_to_miliseconds(value: str) -> int:
     """
     Converts a string representing a time amount to miliseconds.
@@ -0,0 +1,187 @@
+"""
+This module contains the vault watchers used by the FileBroker to find out
+which files of a vault changed without walking the whole directory tree.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+from src.Interfaces.IVaultWatcher import IVaultWatcher
+
+# inotify constants, see <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class PollingVaultWatcher(IVaultWatcher):
+    """
+    Fallback watcher for platforms without inotify. It never knows what changed,
+    so every tick results in a full vault scan.
+    """
+
+    def __init__(self) -> None:
+        self.__disposed = threading.Event()
+
+    def popChanges(self) -> set[str] | None:
+        return None
+
+    def waitForChanges(self, timeout: float) -> bool:
+        self.__disposed.wait(timeout)
+        return False
+
+    def dispose(self) -> None:
+        self.__disposed.set()
+
+
+class InotifyVaultWatcher(IVaultWatcher):
+    """
+    Linux watcher that keeps an inotify watch on every directory of the vault
+    and collects the paths of the files that were written, created, moved or deleted.
+
+    Changes to the directory tree itself (new, moved or deleted directories) and
+    event queue overflows are reported as a full rescan.
+    """
+
+    def __init__(self, vaultPath: str, ignoredDirs: set[str] | None = None) -> None:
+        self.__vaultPath = vaultPath
+        self.__ignoredDirs = ignoredDirs if ignoredDirs is not None else set()
+        self.__libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = self.__libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        self.__fd: int = fd
+        self.__lock = threading.Lock()
+        self.__watches: dict[int, str] = {}
+        self.__changes: set[str] = set()
+        # nothing has been reported yet, so the first consumer has to do a full scan
+        self.__rescanNeeded = True
+        try:
+            self.__addWatchesRecursively(vaultPath)
+        except OSError:
+            os.close(self.__fd)
+            raise
+
+    def popChanges(self) -> set[str] | None:
+        with self.__lock:
+            self.__readEvents()
+            if self.__rescanNeeded:
+                self.__rescanNeeded = False
+                self.__changes = set()
+                return None
+            changes = self.__changes
+            self.__changes = set()
+            return changes
+
+    def waitForChanges(self, timeout: float) -> bool:
+        with self.__lock:
+            self.__readEvents()
+            if self.__rescanNeeded or len(self.__changes) > 0:
+                return True
+            fd = self.__fd
+        if fd < 0:
+            # disposed, there is nothing left to wait for
+            return False
+        try:
+            readable, _, _ = select.select([fd], [], [], timeout)
+        except (OSError, ValueError):
+            # the descriptor was closed by dispose while waiting
+            return False
+        return len(readable) > 0
+
+    def dispose(self) -> None:
+        with self.__lock:
+            if self.__fd >= 0:
+                os.close(self.__fd)
+                self.__fd = -1
+
+    def __addWatch(self, path: str) -> None:
+        wd = self.__libc.inotify_add_watch(self.__fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {path}: {os.strerror(errno)}")
+        self.__watches[wd] = path
+
+    def __addWatchesRecursively(self, path: str) -> None:
+        self.__addWatch(path)
+        for root, dirnames, _ in os.walk(path):
+            dirnames[:] = [dirname for dirname in dirnames if dirname not in self.__ignoredDirs]
+            for dirname in dirnames:
+                self.__addWatch(os.path.join(root, dirname))
+
+    def __readEvents(self) -> None:
+        if self.__fd < 0:
+            return
+        while True:
+            try:
+                data = os.read(self.__fd, _READ_SIZE)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                self.__processEvent(wd, mask, name)
+
+    def __processEvent(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            self.__rescanNeeded = True
+            return
+
+        if mask & IN_IGNORED:
+            self.__watches.pop(wd, None)
+            return
+
+        directory = self.__watches.get(wd, None)
+        if directory is None:
+            return
+
+        if mask & (IN_ISDIR | IN_DELETE_SELF | IN_MOVE_SELF):
+            if name in self.__ignoredDirs:
+                return
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self.__addWatchesRecursively(os.path.join(directory, name))
+                except OSError as e:
+                    print(f"Error while watching directory {name}: {e}")
+            self.__rescanNeeded = True
+            return
+
+        fullPath = os.path.join(directory, name)
+        self.__changes.add(fullPath[len(self.__vaultPath):])
+
+
+def createVaultWatcher(vaultPath: str, ignoredDirs: set[str] | None = None) -> IVaultWatcher:
+    """
+    Creates the best watcher available for the current platform, falling back
+    to polling when inotify is not available or the vault can't be watched.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyVaultWatcher(vaultPath, ignoredDirs)
+        except (OSError, AttributeError) as e:
+            print(f"Unable to watch vault {vaultPath}, falling back to polling: {e}")
+    return PollingVaultWatcher()
@@ -172,6 +172,14 @@ class TestCfdHeuristic(unittest.TestCase):
         self.assertIn(t2, task_objects)
         self.assertIn(t3, task_objects)
 
+    def test_sort_reads_today_once(self):
+        start = TimePoint(datetime.datetime(2026, 1, 5, 0, 0, 0))
+        tasks = [self._make_task(severity, "8p", "2p", start) for severity in range(1, 6)]
+
+        self.heuristic.sort(tasks)
+
+        self.mock_today.assert_called_once()
+
     # ------------------------------------------------------------------
     # getComment
     # ------------------------------------------------------------------
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.Interfaces.IFilter import IFilter
+from src.filters.ActiveTaskFilter import ActiveTaskFilter, InactiveTaskFilter
+from src.filters.CompositeFilter import CompositeFilter
+from src.filters.ContextPrefixTaskFilter import ContextPrefixTaskFilter
+from src.filters.WorkloadAbleFilter import WorkloadAbleFilter
+from src.taskmodels.TaskModel import TaskModel
+from src.wrappers.TimeManagement import TimePoint
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class TestCompositeFilter(unittest.TestCase):
+    def setUp(self):
+        now = TimePoint.now().as_int()
+        contexts = ["work", "home", "work:office", "errands", "homework"]
+        statuses = [" ", " ", "x", " "]
+        self.tasks = []
+        for i in range(60):
+            # tasks starting in the past and in the future, some of them done
+            start = now + (i % 5 - 3) * DAY_MS
+            self.tasks.append(TaskModel(f"Task {i}", contexts[i % 5], start, start + (i % 3) * DAY_MS, 1, 1, 0, statuses[i % 4], "False", "", i, None, None))
+        self.active = ActiveTaskFilter()
+        self.categories = [ContextPrefixTaskFilter(self.active, prefix) for prefix in ["work", "home", "errands"]]
+
+    def unionOfFilters(self, filters):
+        return [task for task in self.tasks if any(filterr.filter([task]) for filterr in filters)]
+
+    def test_filter_matches_union_of_filters(self):
+        cases = [
+            [],
+            [self.active],
+            [InactiveTaskFilter()],
+            self.categories,
+            [self.categories[1], self.active],
+            [self.active, InactiveTaskFilter()],
+            [WorkloadAbleFilter(self.active), self.categories[2]],
+            [ContextPrefixTaskFilter(None, "work"), ContextPrefixTaskFilter(None, "home:")],
+        ]
+        for filters in cases:
+            with self.subTest(filters=[filterr.getDescription() for filterr in filters]):
+                self.assertEqual(CompositeFilter(filters).filter(self.tasks), self.unionOfFilters(filters))
+
+    def test_shared_prefilter_checked_once_per_task(self):
+        active = MagicMock(spec=ActiveTaskFilter, wraps=self.active)
+        active.getPrefilter.return_value = None
+        categories = [ContextPrefixTaskFilter(active, prefix) for prefix in ["work", "home", "errands"]]
+
+        CompositeFilter(categories).filter(self.tasks)
+
+        self.assertEqual(active.accepts.call_count, len(self.tasks))
+        active.filter.assert_not_called()
+
+    def test_stops_at_first_filter_passed(self):
+        first = MagicMock(spec=IFilter)
+        first.getPrefilter.return_value = None
+        first.accepts.return_value = True
+        second = MagicMock(spec=IFilter)
+        second.getPrefilter.return_value = None
+
+        self.assertTrue(CompositeFilter([first, second]).accepts(self.tasks[0], 0))
+        second.accepts.assert_not_called()
+
+    def test_reads_clock_once(self):
+        with patch.object(TimePoint, "now", wraps=TimePoint.now) as now:
+            CompositeFilter(self.categories).filter(self.tasks)
+
+        now.assert_called_once()
+
+    def test_default_accepts_uses_filter(self):
+        class EvenFilter(IFilter):
+            def filter(self, tasks):
+                return [task for task in tasks if int(task.getTaskUID()) % 2 == 0]
+
+            def getDescription(self):
+                return "Even tasks"
+
+        self.assertEqual(CompositeFilter([EvenFilter()]).filter(self.tasks), self.tasks[::2])
+
+    def test_prefilter_checked_once_with_default_accepts(self):
+        active = MagicMock(spec=ActiveTaskFilter, wraps=self.active)
+        active.getPrefilter.return_value = None
+
+        class LongFilter(IFilter):
+            def filter(self, tasks):
+                return [task for task in active.filter(tasks) if task.calculateRemainingTime().as_days() >= 1.0]
+
+            def getPrefilter(self):
+                return active
+
+            def getDescription(self):
+                return "Long tasks"
+
+        filtered = CompositeFilter([LongFilter()]).filter(self.tasks)
+
+        # the filter of LongFilter checks the prefilter, it is not checked again before it
+        active.accepts.assert_not_called()
+        self.assertEqual(active.filter.call_count, len(self.tasks))
+        self.assertEqual(filtered, self.unionOfFilters([WorkloadAbleFilter(self.active)]))
+
+    def test_accepts_filters_not_deriving_from_ifilter(self):
+        class EvenFilter:
+            def filter(self, tasks):
+                return [task for task in tasks if int(task.getTaskUID()) % 2 == 0]
+
+        self.assertEqual(CompositeFilter([EvenFilter()]).filter(self.tasks), self.tasks[::2])
+
+
+if __name__ == "__main__":
+    unittest.main()
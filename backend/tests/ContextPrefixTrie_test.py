@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.filters import ContextPrefixTrie as ContextPrefixTrieModule
+from src.filters.ContextPrefixTrie import ContextPrefixTrie
+
+
+class TestContextPrefixTrie(unittest.TestCase):
+    def setUp(self):
+        self.prefixes = ["work", "home", "workstation", "w", "home"]
+        self.trie = ContextPrefixTrie(self.prefixes)
+
+    def test_matches_prefixes_the_context_starts_with(self):
+        for context in ["workstation:desk", "work", "wo", "home:garden", "", "garden", "Work"]:
+            with self.subTest(context=context):
+                expected = tuple(i for i, prefix in enumerate(self.prefixes) if context.startswith(prefix))
+                self.assertEqual(self.trie.getMatches(context), expected)
+                self.assertEqual(self.trie.matchesAny(context), len(expected) > 0)
+
+    def test_empty_prefix_matches_every_context(self):
+        trie = ContextPrefixTrie(["", "a"])
+
+        self.assertEqual(trie.getMatches("b"), (0,))
+        self.assertEqual(trie.getMatches("ab"), (0, 1))
+
+    def test_group_tasks_by_prefix(self):
+        tasks = [MagicMock(getContext=MagicMock(return_value=context)) for context in ["home", "workstation", "garden", "work"]]
+
+        groups = self.trie.groupTasks(tasks)
+
+        self.assertEqual(groups, [
+            [tasks[1], tasks[3]],
+            [tasks[0]],
+            [tasks[1]],
+            [tasks[1], tasks[3]],
+            [tasks[0]],
+        ])
+
+    def test_context_looked_up_once(self):
+        task = MagicMock(getContext=MagicMock(return_value="work"))
+
+        first = self.trie.getMatches("work")
+        self.trie.groupTasks([task, task])
+
+        self.assertIs(self.trie.getMatches("work"), first)
+
+    def test_cache_emptied_when_full(self):
+        size = ContextPrefixTrieModule.MATCH_CACHE_SIZE
+        ContextPrefixTrieModule.MATCH_CACHE_SIZE = 2
+        try:
+            for context in ["a", "b", "c"]:
+                self.trie.getMatches(context)
+            self.assertEqual(len(self.trie._ContextPrefixTrie__matches), 1)
+            self.assertEqual(self.trie.getMatches("work"), (0, 3))
+        finally:
+            ContextPrefixTrieModule.MATCH_CACHE_SIZE = size
+
+
+if __name__ == "__main__":
+    unittest.main()
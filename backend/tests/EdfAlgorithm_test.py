@@ -22,6 +22,20 @@ class TestEdfAlgorithm(unittest.TestCase):
         result = self.algorithm.apply(tasks)
         self.assertEqual(result, [self.mock_task1, self.mock_task2, self.mock_task3])
 
+    def test_applyTop_returns_first_tasks_by_due_date(self):
+        tasks = [self.mock_task3, self.mock_task1, self.mock_task2]
+
+        result = self.algorithm.applyTop(tasks, 2)
+
+        self.assertEqual(result, ([self.mock_task1, self.mock_task2], 3))
+        self.assertIn("3 tasks sorted by due date", self.algorithm.description)
+
+    def test_applyTop_keeps_order_of_equal_due_dates(self):
+        self.mock_task3.getDue.return_value = self.mock_task1.getDue.return_value
+        tasks = [self.mock_task3, self.mock_task2, self.mock_task1]
+
+        self.assertEqual(self.algorithm.applyTop(tasks, 2)[0], self.algorithm.apply(tasks)[:2])
+
 
 if __name__ == '__main__':
     unittest.main()
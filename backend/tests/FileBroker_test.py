@@ -1,3 +1,4 @@
+import tempfile
 import unittest
 import os
 from unittest.mock import patch, mock_open
@@ -57,32 +58,76 @@ class TestFileBroker(unittest.TestCase):
             filePath = os.path.join(self.jsonPath, "tasks.json")
             mock_file.assert_called_once_with(filePath, "w+")
 
-    @patch("os.walk")
-    @patch("os.path.getmtime")
-    def test_getVaultFiles_WhenFilesExist_ThenReturnFilePathsAndModificationTimes(self, mock_getmtime, mock_walk):
-        fakePath = os.path.join("fake", "vault", "path")
-        mock_walk.return_value = [
-            (fakePath, ("subdir",), ("file1.txt", "file2.txt")),
-            (os.path.join(fakePath, "subdir"), (), ("file3.txt",))
-        ]
-        mock_getmtime.side_effect = [1000.0, 2000.0, 3000.0]
+    def test_getVaultFiles_WhenFilesExist_ThenReturnFilePathsAndModificationTimes(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            self.createVaultFile(vaultPath, "file1.txt", 1000.0)
+            self.createVaultFile(vaultPath, os.path.join("subdir", "file3.txt"), 3000.0)
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+
+            files = fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN)
 
         expected_files = [
             (os.path.join("file1.txt"), 1000.0),
-            (os.path.join("file2.txt"), 2000.0),
             (os.path.join("subdir", "file3.txt"), 3000.0)
         ]
-
-        files = self.fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN)
         self.assertEqual(files, expected_files)
 
-    @patch("os.walk")
-    def test_getVaultFiles_WhenNoFilesExist_ThenReturnEmptyList(self, mock_walk):
-        mock_walk.return_value = []
+    def test_getVaultFiles_WhenNoFilesExist_ThenReturnEmptyList(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+            files = fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN)
+        self.assertEqual(files, [])
 
+    def test_getVaultFiles_WhenVaultDoesNotExist_ThenReturnEmptyList(self):
         files = self.fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN)
         self.assertEqual(files, [])
 
+    def test_walkVaultFiles_WhenIgnoredDirsAndExtensionsAreGiven_ThenTheyAreSkipped(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            self.createVaultFile(vaultPath, "note.md", 1000.0)
+            self.createVaultFile(vaultPath, "image.png", 1000.0)
+            self.createVaultFile(vaultPath, os.path.join(".obsidian", "workspace.md"), 1000.0)
+            self.createVaultFile(vaultPath, os.path.join("archive", "old.md"), 2000.0)
+            self.createVaultFile(vaultPath, os.path.join("archive", ".git", "HEAD.md"), 2000.0)
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+
+            files = [(path, stat.st_mtime) for path, stat in fileBroker.walkVaultFiles(VaultRegistry.OBSIDIAN, (".md",))]
+
+        self.assertEqual(files, [("note.md", 1000.0), (os.path.join("archive", "old.md"), 2000.0)])
+
+    def test_walkVaultFiles_WhenCallerStopsEarly_ThenRemainingDirectoriesAreNotVisited(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            self.createVaultFile(vaultPath, "note.md", 1000.0)
+            self.createVaultFile(vaultPath, os.path.join("subdir", "other.md"), 1000.0)
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+
+            with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+                first = next(fileBroker.walkVaultFiles(VaultRegistry.OBSIDIAN))
+
+        self.assertEqual(first[0], "note.md")
+        mock_scandir.assert_called_once_with(vaultPath)
+
+    def test_getVaultFiles_WhenIgnoredDirsAreConfigured_ThenDefaultsAreReplaced(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            self.createVaultFile(vaultPath, os.path.join(".obsidian", "workspace.md"), 1000.0)
+            self.createVaultFile(vaultPath, os.path.join("templates", "template.md"), 1000.0)
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath, ["templates"])
+
+            files = fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN)
+
+        self.assertEqual(files, [(os.path.join(".obsidian", "workspace.md"), 1000.0)])
+
+    def createVaultFile(self, vaultPath: str, relativePath: str, mtime: float) -> None:
+        fullPath = os.path.join(vaultPath, relativePath)
+        os.makedirs(os.path.dirname(fullPath), exist_ok=True)
+        with open(fullPath, "w") as file:
+            file.write("content")
+        os.utime(fullPath, (mtime, mtime))
+
     @patch("builtins.open", new_callable=mock_open, read_data="line1\nline2\nline3\n")
     def test_getVaultFileLines_WhenFileExists_ThenReturnFileLines(self, mock_file):
         lines = self.fileBroker.getVaultFileLines(VaultRegistry.OBSIDIAN, "testfile.md")
@@ -90,6 +135,107 @@ class TestFileBroker(unittest.TestCase):
         filePath = os.path.join(self.vaultPath, "testfile.md")
         mock_file.assert_called_once_with(filePath, "r", errors="ignore")
 
+    def test_openVaultFile_WhenFileExists_ThenGivesItsRawContent(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            with open(os.path.join(vaultPath, "tasks.md"), "wb") as file:
+                file.write(b"Intro\r\n- [ ] task\n")
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+
+            with fileBroker.openVaultFile(VaultRegistry.OBSIDIAN, "tasks.md") as buffer:
+                content = buffer[:]
+                taskOffset = buffer.find(b"- [ ]")
+
+        self.assertEqual(content, b"Intro\r\n- [ ] task\n")
+        self.assertEqual(taskOffset, 7)
+
+    def test_openVaultFile_WhenFileIsEmpty_ThenGivesEmptyContent(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            open(os.path.join(vaultPath, "empty.md"), "w").close()
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+
+            with fileBroker.openVaultFile(VaultRegistry.OBSIDIAN, "empty.md") as buffer:
+                self.assertEqual(buffer, b"")
+
+    def test_getVaultFileSignature_WhenSizeChangesWithSameMtime_ThenSignatureChanges(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+            self.assertIsNone(fileBroker.getVaultFileSignature(VaultRegistry.OBSIDIAN, "tasks.md"))
+
+            self.createVaultFile(vaultPath, "tasks.md", 1000.0)
+            signature = fileBroker.getVaultFileSignature(VaultRegistry.OBSIDIAN, "tasks.md")
+            with open(os.path.join(vaultPath, "tasks.md"), "a") as file:
+                file.write(" and more")
+            os.utime(os.path.join(vaultPath, "tasks.md"), (1000.0, 1000.0))
+
+            self.assertIsNotNone(signature)
+            self.assertNotEqual(fileBroker.getVaultFileSignature(VaultRegistry.OBSIDIAN, "tasks.md"), signature)
+
+    def test_patchVaultFileLine_WhenLengthIsKept_ThenLineIsWrittenInPlace(self):
+        content = self.patchVaultFile(b"intro\r\n- [ ] task\r\nend", 1, lambda line: line.replace("[ ]", "[x]"))
+        self.assertEqual(content, b"intro\r\n- [x] task\r\nend")
+
+    def test_patchVaultFileLine_WhenLengthChanges_ThenFileIsReplaced(self):
+        content = self.patchVaultFile(b"intro\r- [ ] task\nend\n", 1, lambda line: line + " [track:: work]")
+        self.assertEqual(content, b"intro\r- [ ] task [track:: work]\nend\n")
+
+    def test_patchVaultFileLine_WhenPatchRefuses_ThenFileIsUntouched(self):
+        content = self.patchVaultFile(b"intro\n- [ ] task\n", 0, lambda line: None, expectedResult=False)
+        self.assertEqual(content, b"intro\n- [ ] task\n")
+
+    def test_patchVaultFileLine_WhenLineDoesNotExist_ThenReturnsFalse(self):
+        content = self.patchVaultFile(b"intro\n- [ ] task\n", 2, lambda line: "- [ ] new", expectedResult=False)
+        self.assertEqual(content, b"intro\n- [ ] task\n")
+
+    def test_patchVaultFileLine_WhenCountingInSmallChunks_ThenTheRightLineIsPatched(self):
+        with patch("src.wrappers.BufferLines.LINE_COUNT_CHUNK_SIZE", 2):
+            content = self.patchVaultFile(b"a\r\n\r\rb\nc\r\nd", 4, lambda line: line.upper())
+        self.assertEqual(content, b"a\r\n\r\rb\nC\r\nd")
+
+    def test_patchVaultFileLine_WhenCarriageReturnsCrossAChunk_ThenTheRightLineIsPatched(self):
+        # the first chunk ends in "\r" and the next one starts with "\r\n"
+        with patch("src.wrappers.BufferLines.LINE_COUNT_CHUNK_SIZE", 2):
+            content = self.patchVaultFile(b"a\r\r\nb\nc\n- [ ] x\r\nend", 4, lambda line: line.replace("[ ]", "[x]") if line == "- [ ] x" else None)
+        self.assertEqual(content, b"a\r\r\nb\nc\n- [x] x\r\nend")
+
+    def patchVaultFile(self, content: bytes, lineNumber: int, patchLine, expectedResult: bool = True) -> bytes:
+        with tempfile.TemporaryDirectory() as vaultPath:
+            vaultPath += os.sep
+            with open(os.path.join(vaultPath, "note.md"), "wb") as file:
+                file.write(content)
+            fileBroker = FileBroker(self.jsonPath, self.appdata, vaultPath)
+
+            result = fileBroker.patchVaultFileLine(VaultRegistry.OBSIDIAN, "note.md", lineNumber, patchLine)
+
+            self.assertEqual(result, expectedResult)
+            self.assertEqual(os.listdir(vaultPath), ["note.md"])
+            with open(os.path.join(vaultPath, "note.md"), "rb") as file:
+                return file.read()
+
+    def test_getFileSignature_WhenFileIsWritten_ThenSignatureChanges(self):
+        with tempfile.TemporaryDirectory() as jsonPath:
+            fileBroker = FileBroker(jsonPath, self.appdata, self.vaultPath)
+            self.assertIsNone(fileBroker.getFileSignature(FileRegistry.STANDALONE_TASKS_JSON))
+
+            fileBroker.writeFileContent(FileRegistry.STANDALONE_TASKS_JSON, '{"tasks": []}')
+            signature = fileBroker.getFileSignature(FileRegistry.STANDALONE_TASKS_JSON)
+            fileBroker.writeFileContent(FileRegistry.STANDALONE_TASKS_JSON, '{"tasks": [{}]}')
+
+            self.assertIsNotNone(signature)
+            self.assertNotEqual(fileBroker.getFileSignature(FileRegistry.STANDALONE_TASKS_JSON), signature)
+
+    def test_connectDatabase_WhenFileDoesNotExist_ThenDatabaseIsCreated(self):
+        with tempfile.TemporaryDirectory() as jsonPath:
+            fileBroker = FileBroker(jsonPath, self.appdata, self.vaultPath)
+            connection = fileBroker.connectDatabase(FileRegistry.STANDALONE_TASKS_DB)
+            with connection:
+                connection.execute("CREATE TABLE test (value TEXT)")
+            connection.close()
+
+            self.assertEqual(os.listdir(jsonPath), ["tasks.sqlite3"])
+
     @patch("builtins.open", side_effect=FileNotFoundError)
     def test_getVaultFileLines_WhenFileDoesNotExist_ThenRaiseFileNotFoundError(self, mock_file):
         with self.assertRaises(FileNotFoundError):
@@ -97,6 +243,29 @@ class TestFileBroker(unittest.TestCase):
         filePath = os.path.join(self.vaultPath, "nonexistentfile.md")
         mock_file.assert_called_once_with(filePath, "r", errors="ignore")
 
+    @patch("os.walk")
+    @patch("os.path.getmtime")
+    def test_getVaultFiles_WhenPathsAreGiven_ThenOnlyExistingPathsAreChecked(self, mock_getmtime, mock_walk):
+        def getmtime(path):
+            if path.endswith("deleted.md"):
+                raise FileNotFoundError(path)
+            return 1000.0
+        mock_getmtime.side_effect = getmtime
+
+        files = self.fileBroker.getVaultFiles(VaultRegistry.OBSIDIAN, ["note.md", "deleted.md", "image.png"], (".md",))
+        self.assertEqual(files, [("note.md", 1000.0)])
+        mock_walk.assert_not_called()
+
+    @patch("src.FileBroker.createVaultWatcher")
+    def test_getVaultChanges_WhenCalledTwice_ThenWatcherIsCreatedOnce(self, mock_createVaultWatcher):
+        mock_createVaultWatcher.return_value.popChanges.return_value = {"note.md"}
+
+        self.assertEqual(self.fileBroker.getVaultChanges(VaultRegistry.OBSIDIAN), {"note.md"})
+        self.fileBroker.waitForVaultChanges(VaultRegistry.OBSIDIAN, 1)
+
+        mock_createVaultWatcher.assert_called_once_with(self.vaultPath, {".obsidian", ".git", ".trash"})
+        mock_createVaultWatcher.return_value.waitForChanges.assert_called_once_with(1)
+
 
 if __name__ == "__main__":
     unittest.main()
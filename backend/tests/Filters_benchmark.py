@@ -0,0 +1,82 @@
+"""
+Benchmark of filtering the task list with every category filter enabled, calling filter with
+a list of one task for every task and filter as the task list manager did before, against
+checking every task once with CompositeFilter.
+
+Filters 50k tasks with the category filters of config.json, each of them with the active
+task filter as prefilter, like the container builds them.
+
+Run from the backend directory:
+    python -m tests.Filters_benchmark
+"""
+
+import time
+
+from src.filters.ActiveTaskFilter import ActiveTaskFilter
+from src.filters.CompositeFilter import CompositeFilter
+from src.filters.ContextPrefixTaskFilter import ContextPrefixTaskFilter
+from src.taskmodels.TaskModel import TaskModel
+from src.wrappers.TimeManagement import TimePoint
+from tests.TaskModel_benchmark import DAY_MS
+
+TASK_COUNT = 50000
+REPEAT = 3
+PREFIXES = ["alert", "billable", "indoor", "aux_device", "bujo", "workstation", "outdoor"]
+
+
+def loadTasks() -> list[TaskModel]:
+    now = TimePoint.now().as_int()
+    # a few contexts match no category, so those tasks are checked against every filter
+    contexts = PREFIXES + ["inbox", "someday"]
+    return [
+        TaskModel(f"Task {i}", f"{contexts[i % len(contexts)]}:{i % 4}", now + (i % 10 - 7) * DAY_MS, now + (i % 90) * DAY_MS, 1 + i % 5, 1 + i % 8, i % 3, "x" if i % 13 == 0 else " ", "False", "", i, None, None)
+        for i in range(TASK_COUNT)
+    ]
+
+
+def perTaskFilter(filters, tasks):
+    newTaskList = []
+    for task in tasks:
+        for filterr in filters:
+            if filterr.filter([task]) and not isinstance(task.getEventWaited(), str):
+                newTaskList.append(task)
+                break
+    return newTaskList
+
+
+def compositeFilter(filters, tasks):
+    enabledFilters = CompositeFilter(filters)
+    now = TimePoint.now().as_int()
+    return [task for task in tasks if not isinstance(task.getEventWaited(), str) and enabledFilters.accepts(task, now)]
+
+
+def best(function) -> float:
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    tasks = loadTasks()
+    activeFilter = ActiveTaskFilter()
+    filters = [ContextPrefixTaskFilter(activeFilter, prefix) for prefix in PREFIXES]
+
+    expected = perTaskFilter(filters, tasks)
+    if compositeFilter(filters, tasks) != expected:
+        raise AssertionError("CompositeFilter keeps different tasks")
+
+    perTask = best(lambda: perTaskFilter(filters, tasks))
+    composite = best(lambda: compositeFilter(filters, tasks))
+
+    print(f"{TASK_COUNT} tasks, {len(filters)} category filters, {len(expected)} tasks kept, same tasks checked")
+    print(f"{'filtering':>15} {'filter all (s)':>15}")
+    print(f"{'per task':>15} {perTask:>15.3f}")
+    print(f"{'composite':>15} {composite:>15.3f}")
+    print(f"composite {perTask / composite:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,10 @@ from src.Interfaces.ITaskModel import ITaskModel
 from src.Interfaces.IHeuristic import IHeuristic
 from src.Interfaces.IStatisticsService import IStatisticsService
 from src.Interfaces.IFilter import IFilter
+from src.filters.ActiveTaskFilter import ActiveTaskFilter
+from src.filters.ContextPrefixTaskFilter import ContextPrefixTaskFilter
+from src.heuristics.TaskColumns import TaskColumns
+from src.taskmodels.TaskModel import TaskModel
 from src.Utils import WorkloadStats
 from src.wrappers.TimeManagement import TimeAmount, TimePoint
 
@@ -28,6 +32,15 @@ class TestGtdAlgorithm(unittest.TestCase):
             calmHeuristic=self.mock_calm_heuristic
         )
 
+    def evaluateAll(self, *values):
+        """Evaluates every task of the columns to the next value, the last one is kept for the following calls."""
+        remaining = list(values)
+
+        def evaluateColumns(columns):
+            value = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+            return [value] * len(columns.tasks)
+        return evaluateColumns
+
     def _make_workload_stats(self, workDone: dict[str, float] = None, workload_str: str = "4p"):
         """Helper to create a WorkloadStats with proper dict-based workDone."""
         if workDone is None:
@@ -56,12 +69,28 @@ class TestGtdAlgorithm(unittest.TestCase):
         assert len(result) == 1
         self.mock_filter.filter.assert_called_once_with(tasks)
 
+    def test_filter_ordered_categories_by_context_prefix(self):
+        active = ActiveTaskFilter()
+        categories = [(prefix, ContextPrefixTaskFilter(active, prefix), False) for prefix in ["alert", "work", "workstation"]]
+        algorithm = GtdAlgorithm(categories, [], (self.mock_heuristic, 0.2), self.mock_statistics_service, self.mock_calm_heuristic)
+        now = TimePoint.now().as_int()
+        tasks = [
+            TaskModel(f"Task {i}", context, now - 1000, now, 1, 1, 0, status, "False", "", i, None, None)
+            for i, (context, status) in enumerate([("home", " "), ("workstation", " "), ("alert", "x"), ("work", " "), ("alert", " ")])
+        ]
+
+        self.assertIsNotNone(algorithm.categoryTrie)
+        for count in range(len(tasks) + 1):
+            with self.subTest(count=count):
+                expected = next((category.filter(tasks[:count]) for _, category, _ in categories if category.filter(tasks[:count])), [])
+                self.assertEqual(algorithm._filterOrderedCategories(tasks[:count]), expected)
+
     def test_filter_by_heuristic(self):
-        self.mock_heuristic.evaluate.return_value = 0.6  # Above threshold
-        tasks = [self.mock_task]
-        result = self.algorithm._filterByHeuristic(self.mock_heuristic, 0.5, tasks)
+        self.mock_heuristic.evaluateColumns.return_value = [0.6]  # Above threshold
+        columns = TaskColumns([self.mock_task])
+        result = self.algorithm._filterByHeuristic(self.mock_heuristic, 0.5, columns)
         assert len(result) == 1
-        self.mock_heuristic.evaluate.assert_called_once_with(self.mock_task)
+        self.mock_heuristic.evaluateColumns.assert_called_once_with(columns)
 
     def test_filter_calm_tasks(self):
         self.mock_task.getCalm.return_value = False  # Not calm
@@ -79,7 +108,7 @@ class TestGtdAlgorithm(unittest.TestCase):
     def test_apply_with_heuristic_tasks(self):
         """Non-urgent task with heuristic above threshold should be returned via ordered heuristics."""
         self.mock_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")  # Not urgent
-        self.mock_heuristic.evaluate.return_value = 0.6  # Above threshold
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.6)  # Above threshold
         self.mock_filter.filter.return_value = [self.mock_task]
         tasks = [self.mock_task]
         result = self.algorithm.apply(tasks)
@@ -96,7 +125,7 @@ class TestGtdAlgorithm(unittest.TestCase):
         self.mock_statistics_service.getWorkloadStats.return_value = workStats
 
         self.mock_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")  # Not urgent
-        self.mock_heuristic.evaluate.side_effect = [0.4, 0.3]  # Below ordered threshold (0.5), above default (0.2)
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.4, 0.3)  # Below ordered threshold (0.5), above default (0.2)
         self.mock_filter.filter.return_value = []
         tasks = [self.mock_task]
         result = self.algorithm.apply(tasks)
@@ -116,7 +145,7 @@ class TestGtdAlgorithm(unittest.TestCase):
         calm_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")
 
         self.mock_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")  # Not urgent
-        self.mock_heuristic.evaluate.return_value = 0.4  # Below ordered threshold
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.4)  # Below ordered threshold
         self.mock_filter.filter.return_value = []
         self.mock_calm_heuristic.sort.return_value = [(calm_task, 1.0)]
 
@@ -141,7 +170,7 @@ class TestGtdAlgorithm(unittest.TestCase):
 
         self.mock_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")  # Not urgent
         # Below both ordered (0.5) and default (0.2) thresholds
-        self.mock_heuristic.evaluate.return_value = 0.1
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.1)
         self.mock_filter.filter.return_value = []
         self.mock_calm_heuristic.sort.return_value = [(calm_task, 1.0)]
 
@@ -162,13 +191,25 @@ class TestGtdAlgorithm(unittest.TestCase):
 
         self.mock_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")  # Not urgent
         # Below ordered threshold (0.5), above default threshold (0.2)
-        self.mock_heuristic.evaluate.side_effect = [0.4, 0.3]
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.4, 0.3)
         self.mock_filter.filter.return_value = []
 
         tasks = [self.mock_task]
         result = self.algorithm.apply(tasks)
         assert len(result) == 1
 
+    def test_apply_evaluates_every_heuristic_over_the_same_columns(self):
+        self.mock_statistics_service.getWorkloadStats.return_value = self._make_workload_stats()
+        self.mock_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")  # Not urgent
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.4, 0.3)
+        self.mock_filter.filter.return_value = []
+
+        self.algorithm.apply([self.mock_task])
+
+        (ordered,), (default,) = [call.args for call in self.mock_heuristic.evaluateColumns.call_args_list]
+        self.assertIs(ordered, default)
+        self.assertEqual(ordered.tasks, [self.mock_task])
+
     def test_use_calm_instead(self):
         """use_calm_instead should return calm tasks sorted by calm heuristic."""
         calm_task1 = Mock(spec=ITaskModel)
@@ -208,7 +249,7 @@ class TestGtdAlgorithm(unittest.TestCase):
         non_calm_task.getCalm.return_value = False
         non_calm_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")
 
-        self.mock_heuristic.evaluate.return_value = 0.6  # Above threshold
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.6)  # Above threshold
         self.mock_filter.filter.return_value = [non_calm_task]
 
         tasks = [calm_task, non_calm_task]
@@ -235,7 +276,7 @@ class TestGtdAlgorithm(unittest.TestCase):
         non_calm_task.getDue.return_value = TimePoint.today() + TimeAmount("1d")
 
         # Below ordered threshold, above default
-        self.mock_heuristic.evaluate.side_effect = [0.4, 0.3]
+        self.mock_heuristic.evaluateColumns.side_effect = self.evaluateAll(0.4, 0.3)
         self.mock_filter.filter.return_value = []
 
         tasks = [calm_task, non_calm_task]
@@ -29,6 +29,15 @@ class TestHeuristicAlgorithm(unittest.TestCase):
         result = self.algorithm.apply(tasks)
         self.assertEqual(result, [self.mock_task3, self.mock_task2, self.mock_task1])
 
+    def test_applyTop_uses_heuristic_top(self):
+        self.mock_heuristic.top.return_value = [(self.mock_task3, 1.0)]
+        tasks = [self.mock_task1, self.mock_task2, self.mock_task3]
+
+        result = self.algorithm.applyTop(tasks, 1)
+
+        self.mock_heuristic.top.assert_called_once_with(tasks, 1)
+        self.assertEqual(result, ([self.mock_task3], 3))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of sorting a task list with every heuristic, evaluating them task by task
+as they did before against evaluating them over TaskColumns.
+
+Sorts 100k tasks four ways:
+- scalar: every heuristic calls the task getters for every task
+- sort: every heuristic builds its own columns, which is what IHeuristic.sort does now
+- shared columns: the columns are built once and every heuristic sorts them, like a
+  list refresh of GtdAlgorithm or TelegramTaskListManager does
+- shared loops: the same, looping over the array columns even if NumPy is installed
+
+Run from the backend directory:
+    python -m tests.Heuristics_benchmark
+"""
+
+import time
+
+from src.heuristics.TaskColumns import TaskColumns
+from src.taskmodels.TaskModel import TaskModel
+from tests.TaskColumns_test import HEURISTICS
+from tests.TaskModel_benchmark import DAY_MS
+from src.wrappers.TimeManagement import TimePoint
+
+TASK_COUNT = 100000
+REPEAT = 3
+
+
+def loadTasks() -> list[TaskModel]:
+    now = TimePoint.now().as_int()
+    return [
+        TaskModel(f"Task {i}", "work", now - (i % 30) * DAY_MS, now + (i % 90 - 5) * DAY_MS, 1 + i % 5, 1 + i % 8, i % 3, " ", "False", "", i, None, None)
+        for i in range(TASK_COUNT)
+    ]
+
+
+def scalarSort(heuristic, tasks, reverse):
+    retval = [(task, heuristic.evaluate(task)) for task in tasks]
+    retval.sort(key=lambda x: x[1], reverse=reverse)
+    return retval
+
+
+def best(function) -> float:
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    tasks = loadTasks()
+    for heuristic, reverse in HEURISTICS:
+        if heuristic.sort(tasks) != scalarSort(heuristic, tasks, reverse):
+            raise AssertionError(f"{heuristic.getDescription()} sorts differently over columns")
+
+    scalar = best(lambda: [scalarSort(heuristic, tasks, reverse) for heuristic, reverse in HEURISTICS])
+    ownColumns = best(lambda: [heuristic.sort(tasks) for heuristic, _ in HEURISTICS])
+
+    def sharedColumns(vectorized: bool) -> None:
+        columns = TaskColumns(tasks, vectorized)
+        for heuristic, _ in HEURISTICS:
+            heuristic.sortColumns(columns)
+    shared = best(lambda: sharedColumns(True))
+    sharedLoops = best(lambda: sharedColumns(False))
+
+    print(f"{TASK_COUNT} tasks, {len(HEURISTICS)} heuristics, same ordering checked, NumPy {'used' if TaskColumns([]).vectorized else 'not installed'}")
+    print(f"{'evaluation':>15} {'sort all (s)':>13}")
+    print(f"{'scalar':>15} {scalar:>13.3f}")
+    print(f"{'sort':>15} {ownColumns:>13.3f}")
+    print(f"{'shared columns':>15} {shared:>13.3f}")
+    print(f"{'shared loops':>15} {sharedLoops:>13.3f}")
+    print(f"sort {scalar / ownColumns:.2f}x faster, shared columns {scalar / shared:.2f}x faster, shared loops {scalar / sharedLoops:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from src.taskjsonproviders.JournalTaskJsonProvider import JournalTaskJsonProvider
+from src.Interfaces.IFileBroker import IFileBroker, FileRegistry
+
+
+class TestJournalTaskJsonProvider(unittest.TestCase):
+    def setUp(self):
+        self.files = {
+            FileRegistry.STANDALONE_TASKS_JSON: json.dumps({
+                "tasks": [self.createTask("Task 1"), self.createTask("Task 2"), self.createTask("Task 3")],
+                "projects": [{"name": "Project1", "status": "closed"}]
+            }),
+            FileRegistry.STANDALONE_TASKS_LOG: ""
+        }
+        self.mockFileBroker = MagicMock(spec=IFileBroker)
+        self.mockFileBroker.readFileContent.side_effect = lambda registry: self.files[registry]
+        self.mockFileBroker.getFileSignature.side_effect = lambda registry: (hash(self.files[registry]), len(self.files[registry]), 0)
+        self.mockFileBroker.readFileContentJson.side_effect = lambda registry: json.loads(self.files[registry])
+        self.mockFileBroker.writeFileContent.side_effect = self.writeFile
+        self.mockFileBroker.writeFileContentJson.side_effect = lambda registry, content: self.writeFile(registry, json.dumps(content))
+        self.mockFileBroker.appendFileContent.side_effect = lambda registry, content: self.writeFile(registry, self.files[registry] + content)
+
+    def writeFile(self, registry, content):
+        self.files[registry] = content
+
+    def createTask(self, description, status=" "):
+        return {
+            "description": description,
+            "context": "work",
+            "start": "1625097600000",
+            "due": "1625184000000",
+            "severity": "1.0",
+            "totalCost": "2.0",
+            "investedEffort": "0.0",
+            "status": status,
+            "calm": "False",
+            "project": ""
+        }
+
+    def getLogRecords(self):
+        return [json.loads(line) for line in self.files[FileRegistry.STANDALONE_TASKS_LOG].splitlines()]
+
+    def restart(self):
+        return JournalTaskJsonProvider(self.mockFileBroker)
+
+    def test_getJson_reads_snapshot(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+
+        result = provider.getJson()
+
+        self.assertEqual([task["description"] for task in result["tasks"]], ["Task 1", "Task 2", "Task 3"])
+        self.assertNotIn("meta", result)
+
+    def test_saveJson_appends_only_changed_tasks(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+        taskJson = provider.getJson()
+        taskJson["tasks"][1]["status"] = "x"
+
+        provider.saveJson(taskJson)
+
+        self.mockFileBroker.writeFileContentJson.assert_not_called()
+        records = self.getLogRecords()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["start"], 1)
+        self.assertEqual(records[0]["delete"], 1)
+        self.assertEqual(records[0]["tasks"], [self.createTask("Task 2", "x")])
+        self.assertNotIn("projects", records[0])
+
+    def test_saveJson_records_removed_tasks(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+        taskJson = provider.getJson()
+        del taskJson["tasks"][1]
+
+        provider.saveJson(taskJson)
+
+        self.assertEqual(self.getLogRecords()[0]["tasks"], [])
+        self.assertEqual([task["description"] for task in provider.getJson()["tasks"]], ["Task 1", "Task 3"])
+
+    def test_saveJson_without_changes_writes_nothing(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+
+        provider.saveJson(provider.getJson())
+
+        self.mockFileBroker.appendFileContent.assert_not_called()
+        self.mockFileBroker.writeFileContentJson.assert_not_called()
+
+    def test_saveJson_records_project_changes(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+        taskJson = provider.getJson()
+        taskJson["projects"][0]["status"] = "open"
+        taskJson["tasks"].append(self.createTask("Define next action"))
+        # the injected task isn't stored, only the project change
+        taskJson["tasks"].pop()
+
+        provider.saveJson(taskJson)
+
+        self.assertEqual(self.getLogRecords()[0]["projects"], [{"name": "Project1", "status": "open"}])
+
+    def test_log_replayed_on_restart(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+        taskJson = provider.getJson()
+        taskJson["tasks"][0]["description"] = "Updated Task 1"
+        provider.saveJson(taskJson)
+        taskJson["tasks"][2]["description"] = "Updated Task 3"
+        provider.saveJson(taskJson)
+
+        result = self.restart().getJson()
+
+        self.assertEqual([task["description"] for task in result["tasks"]], ["Updated Task 1", "Task 2", "Updated Task 3"])
+
+    def test_cut_record_ignored_on_restart(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+        taskJson = provider.getJson()
+        taskJson["tasks"][0]["description"] = "Updated Task 1"
+        provider.saveJson(taskJson)
+        self.files[FileRegistry.STANDALONE_TASKS_LOG] += '{"snapshot":0,"start":2,"del'
+
+        result = self.restart().getJson()
+
+        self.assertEqual([task["description"] for task in result["tasks"]], ["Updated Task 1", "Task 2", "Task 3"])
+
+    def test_compaction_writes_snapshot_and_empties_log(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker, compactionRecords=2)
+        taskJson = provider.getJson()
+        taskJson["tasks"][0]["description"] = "Updated Task 1"
+        provider.saveJson(taskJson)
+        taskJson["tasks"][1]["description"] = "Updated Task 2"
+        provider.saveJson(taskJson)
+
+        self.mockFileBroker.writeFileContentJson.assert_called_once()
+        self.assertEqual(self.files[FileRegistry.STANDALONE_TASKS_LOG], "")
+        snapshot = json.loads(self.files[FileRegistry.STANDALONE_TASKS_JSON])
+        self.assertEqual(snapshot["meta"], [{"snapshot": "1"}])
+        self.assertEqual([task["description"] for task in snapshot["tasks"]], ["Updated Task 1", "Updated Task 2", "Task 3"])
+
+    def test_records_of_previous_snapshot_ignored(self):
+        # the process stopped after writing the snapshot but before emptying the log
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+        taskJson = provider.getJson()
+        del taskJson["tasks"][0]
+        provider.saveJson(taskJson)
+        log = self.files[FileRegistry.STANDALONE_TASKS_LOG]
+        provider.compact()
+        self.files[FileRegistry.STANDALONE_TASKS_LOG] = log
+
+        result = self.restart().getJson()
+
+        self.assertEqual([task["description"] for task in result["tasks"]], ["Task 2", "Task 3"])
+
+    def test_big_changes_compact_instead_of_appending(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+
+        provider.saveJson({"tasks": [self.createTask("Imported Task")], "projects": []})
+
+        self.mockFileBroker.appendFileContent.assert_not_called()
+        snapshot = json.loads(self.files[FileRegistry.STANDALONE_TASKS_JSON])
+        self.assertEqual([task["description"] for task in snapshot["tasks"]], ["Imported Task"])
+
+    def test_changes_made_in_place_are_saved(self):
+        provider = JournalTaskJsonProvider(self.mockFileBroker)
+        taskJson = provider.getJson()
+
+        taskJson["tasks"][0]["description"] = "Changed in place"
+        provider.saveJson(taskJson)
+
+        self.assertEqual(self.getLogRecords()[0]["tasks"][0]["description"], "Changed in place")
+
+
+if __name__ == "__main__":
+    unittest.main()
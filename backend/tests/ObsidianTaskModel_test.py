@@ -103,6 +103,24 @@ class TestObsidianTaskModel(unittest.TestCase):
         )
         self.assertFalse(self.task == other_task)
 
+    def test_not_eq_when_line_differs(self):
+        other_task = ObsidianTaskModel(
+            description="Test Task",
+            context="Test Context",
+            start=self.task.getStart().as_int(),
+            due=self.task.getDue().as_int(),
+            severity=3.0,
+            totalCost=4.0,
+            investedEffort=5.0,
+            status="Pending",
+            file="test_file.md",
+            line=11,
+            calm="True",
+            raised=None,
+            waited=None
+        )
+        self.assertFalse(self.task == other_task)
+
     def test_getProject(self):
         self.assertEqual(self.task.getProject(), "test_file:10")
 
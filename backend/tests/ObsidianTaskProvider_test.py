@@ -76,7 +76,7 @@ class TestObsidianTaskProvider(unittest.TestCase):
         task.getFile.return_value = "mockFile"
         task.getLine.return_value = 2
 
-        self.mockFileBroker.getVaultFileLines.return_value = ["- [x]", "", "- [ ] dummy"]
+        self.mockFileBroker.patchVaultFileLine.return_value = True
 
         # Act
         testClass = self.provider
@@ -84,13 +84,98 @@ class TestObsidianTaskProvider(unittest.TestCase):
 
         # Assert
         taskLine = testClass._getTaskLine(task)
+        registry, file, line, patch = self.mockFileBroker.patchVaultFileLine.call_args.args
+        self.assertEqual((registry, file, line), (VaultRegistry.OBSIDIAN, "mockFile", 2))
+        self.assertEqual(patch("\t- [ ] mock task [track:: work]"), "\t" + taskLine.rstrip("\n"))
+        self.mockFileBroker.writeVaultFileLines.assert_not_called()
+
+        pass
+
+    def test_saveTask_WhenLineIsNotATask_ThenPatchIsRefused(self):
+        # Arrange
+        task = self.createObsidianTask("mockFile", 1)
+        self.mockFileBroker.patchVaultFileLine.return_value = True
+
+        # Act
+        self.provider.saveTask(task)
+
+        # Assert
+        patch = self.mockFileBroker.patchVaultFileLine.call_args.args[3]
+        self.assertIsNone(patch("Some prose that moved here"))
+
+    def test_saveTask_WhenLineHoldsAnotherTask_ThenPatchIsRefused(self):
+        # Arrange
+        task = self.createObsidianTask("mockFile", 1)
+        self.mockFileBroker.patchVaultFileLine.return_value = True
+
+        # Act
+        self.provider.saveTask(task)
+
+        # Assert
+        patch = self.mockFileBroker.patchVaultFileLine.call_args.args[3]
+        self.assertIsNone(patch("- [ ] another task [track:: work]"))
+        self.assertIsNotNone(patch("- [x] mock task [track:: work]"))
+
+    def test_saveTask_WhenTaskMoved_ThenItIsFoundAndOverwritten(self):
+        # Arrange
+        task = self.createObsidianTask("mockFile", 1)
+        self.mockFileBroker.patchVaultFileLine.return_value = False
+        self.mockFileBroker.getVaultFileLines.return_value = ["# Notes\n", "- [ ] another task\n", "\t- [ ] mock task [track:: work]\n", "end"]
+
+        # Act
+        self.provider.saveTask(task)
+
+        # Assert
+        taskLine = self.provider._getTaskLine(task)
         self.mockFileBroker.writeVaultFileLines.assert_called_once_with(
             VaultRegistry.OBSIDIAN,
             "mockFile",
-            ["- [x]", "", taskLine]
+            ["# Notes\n", "- [ ] another task\n", "\t" + taskLine, "end"]
         )
+        task.setLine.assert_called_once_with(2)
 
-        pass
+    def test_saveTask_WhenTaskIsNoLongerInTheFile_ThenFileIsNotWritten(self):
+        # Arrange
+        task = self.createObsidianTask("mockFile", 1)
+        self.mockFileBroker.patchVaultFileLine.return_value = False
+        self.mockFileBroker.getVaultFileLines.return_value = ["# Notes\n", "- [ ] another task\n", "end"]
+
+        # Act
+        self.provider.saveTask(task)
+
+        # Assert
+        self.mockFileBroker.writeVaultFileLines.assert_not_called()
+
+    def test_saveTask_WhenTaskWasRenamed_ThenItsLineIsFoundByItsReadText(self):
+        # Arrange
+        self.mockTaskJsonProvider.getJson.return_value = self.GetCurrentTaskJson()
+        self.provider.exportTasks("json")
+        task = self.createObsidianTask("file 1", 1)
+        task.getDescription.return_value = "renamed task"
+        self.mockFileBroker.patchVaultFileLine.return_value = True
+
+        # Act
+        self.provider.saveTask(task)
+
+        # Assert
+        patch = self.mockFileBroker.patchVaultFileLine.call_args.args[3]
+        self.assertIsNotNone(patch("- [x] Task 1 [track:: track 1]"))
+        self.assertIsNone(patch("- [ ] renamed task [track:: track 1]"))
+        self.assertEqual(self.provider.taskTexts[("file 1", 1)], "renamed task")
+
+    def test_saveTask_WhenTaskHasNoFiledataAndNothingToClean_ThenTaskIsAppended(self):
+        # Arrange
+        task = self.createObsidianTask("", -1)
+        self.mockFileBroker.readFileContent.return_value = "- [ ] first\n- [ ] second"
+
+        # Act
+        self.provider.saveTask(task)
+
+        # Assert
+        taskLine = self.provider._getTaskLine(task)
+        self.mockFileBroker.appendFileContent.assert_called_once_with(FileRegistry.OBSIDIAN_TASKS_MD, "\n" + taskLine)
+        self.mockFileBroker.writeFileContent.assert_not_called()
+        task.setLine.assert_called_once_with(2)
 
     def test_saveTask_whenTryingToWriteToNonExistentLine_addsTaskToTheEnd(self):
         # Arrange
@@ -107,6 +192,7 @@ class TestObsidianTaskProvider(unittest.TestCase):
         task.getFile.return_value = "mockFile"
         task.getLine.return_value = 10  # Line number beyond file content length
 
+        self.mockFileBroker.patchVaultFileLine.return_value = False
         self.mockFileBroker.getVaultFileLines.return_value = ["- [x]", "", "- [ ] dummy"]  # Only 3 lines in file
 
         # Act
@@ -118,8 +204,24 @@ class TestObsidianTaskProvider(unittest.TestCase):
         self.mockFileBroker.writeVaultFileLines.assert_called_once_with(
             VaultRegistry.OBSIDIAN,
             "mockFile",
-            ["- [x]", "", "- [ ] dummy", taskLine]  # Task added at the end
+            ["- [x]", "", "- [ ] dummy\n", taskLine]  # Task added at the end, on a line of its own
         )
+        task.setLine.assert_called_once_with(3)
+
+    def createObsidianTask(self, file: str, line: int) -> MagicMock:
+        task = MagicMock(spec=ObsidianTaskModel)
+        task.getDescription.return_value = "mock task"
+        task.getContext.return_value = "mockContext"
+        task.getStart.return_value = TimePoint.today()
+        task.getDue.return_value = TimePoint.today()
+        task.getSeverity.return_value = 1.0
+        task.getTotalCost.return_value = TimeAmount("1p")
+        task.getInvestedEffort.return_value = TimeAmount("0p")
+        task.getStatus.return_value = " "
+        task.getCalm.return_value = True
+        task.getFile.return_value = file
+        task.getLine.return_value = line
+        return task
 
     def GetCurrentTaskJson(self) -> dict:
         return {
@@ -0,0 +1,155 @@
+import io
+import random
+import unittest
+from unittest.mock import patch
+
+from src.taskjsonproviders.ObsidianVaultFileParser import VAULT_ENTRY_MARKERS, ObsidianVaultFileParser, scanVaultBuffer, scanVaultLines, tokenizeTaskLine
+from src.Utils import TaskDiscoveryPolicies
+
+CORPUS = [
+    "- [ ] Task 1 [track::work]",
+    "- [ ] Buy milk",
+    "- [ ] Buy milk ",
+    "  - [ ] Indented task [track:: work] [severity:: 3] [due:: 2024-02-01]",
+    "- [ ] Task with link [[Some Note]] [track:: work]",
+    "- [ ] Task with [brackets] in the text [starts:: 2024-01-01T10:30]",
+    "- [ ] Task with url [url:: https://example.com/a?b=c] [track:: work]",
+    "- [ ] Task [a::b::c] [d:::e] [f:: g:] [h::]",
+    "- [ ] Task [unclosed:: value",
+    "- [ ] Task [no dual colon] [track:: work]",
+    "- [ ] Task [x] foo:: bar",
+    "- [ ] Task with colon: inside [track:: work]",
+    "- [ ] Task:: with dual colon in the text",
+    "- [ ] First - [ ] Second [track:: work]",
+    "- [ ] First [track:: work] - [ ] Second [track:: home]",
+    "- [ ] First [nested [track:: work]]",
+    "- [ ] [track:: work] Text after the fields",
+    "- [ ] Task [ track ::  spaced value  ]",
+    "- [ ] Task [track:: work]\n",
+    "- [ ] Task ending with colon:",
+    "- [ ] Task ending with bracket [",
+    "- [ ]",
+    "- [ ] - [ ]",
+    "- [ ]- [ ] [track:: work]",
+]
+
+FILE_CORPUS = [
+    b"",
+    b"Just prose\nwithout anything\n",
+    b"---\nproject: open\nseverity: 2\n---\n# Title\n- [ ] Task [track:: work]\n",
+    b"---\r\nproject: open\r\n---\r\n- [ ] Task\r\n  - [ ] Nested\r\n",
+    b"---\rproject: open\r---\r- [ ] Task\r",
+    b"Intro\n---\nproject: open\n- [ ] Task in an unclosed header\nkey: value",
+    b"- [ ] First\n- [ ] - [ ] Second\nNot a task - [ ]\n- [x] Done\n- [ ] Last without newline",
+    b"---\n---\n- [ ] Empty header\n",
+    b"  ---  \nproject: closed\n\t---\n",
+    b"---\nproject: open\n---\n",
+    b"---\nproject: open\n---\n\n\n",
+    b"Caf\xc3\xa9\n- [ ] T\xffask \xc3\n- [ ] \xe2\x9c\x93 done\n",
+    b"\r\n\r\n\r- [ ] After blank lines\n\r\n- [ ] Mixed\r",
+    b"-----\nproject: open\n--- \n- [ ]\n",
+]
+
+FILE_FUZZ_TOKENS = [b"\n", b"\r", b"\r\n", b"---", b"- [ ]", b"project", b": open", b"  ", b"text", b"[track:: work]", b"\xc3\xa9"]
+
+FUZZ_TOKENS = ["- [ ]", "[", "]", "::", ":", " ", "a", "key", "value", "2024-01-01", "\n", "[[", "]]", ":::"]
+
+
+def legacyTokenizeTaskLine(line: str) -> tuple[str, list[tuple[str, str]]]:
+    """
+    Split based implementation the tokenizer replaced, kept as the reference it is compared against.
+    """
+    lineMod = line + "[eol:: here]"
+    textAfterCheckbox = lineMod.split("- [ ]")[1]
+    textBeforeFirstDualColon = textAfterCheckbox.split("::")[0]
+    splittedByCorchetes = textBeforeFirstDualColon.split("[")
+    allButLast = splittedByCorchetes[:-1]
+    taskText = "[".join(allButLast).strip()
+
+    fields = []
+    lineData = line.split("- [ ]")[1].split("[")
+    for keyValueRegion in lineData[1:]:
+        try:
+            keyValue = keyValueRegion.split("::")
+            key = keyValue[0].strip()
+            value = keyValue[1].split("]")[0].strip()
+            fields.append((key, value))
+        except Exception:
+            pass
+    return taskText, fields
+
+
+class TestTokenizeTaskLine(unittest.TestCase):
+
+    def test_tokenizeTaskLine_SplitsTextAndFields(self):
+        taskText, fields = tokenizeTaskLine("- [ ] Task 1 [track:: work] [severity:: 3]")
+        self.assertEqual(taskText, "Task 1")
+        self.assertEqual(fields, [("track", "work"), ("severity", "3")])
+
+    def test_tokenizeTaskLine_MatchesLegacyParserOnCorpus(self):
+        for line in CORPUS:
+            with self.subTest(line=line):
+                self.assertEqual(tokenizeTaskLine(line), legacyTokenizeTaskLine(line))
+
+    def test_tokenizeTaskLine_MatchesLegacyParserOnRandomLines(self):
+        rng = random.Random(42)
+        for _ in range(5000):
+            line = "- [ ]" + "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 20)))
+            with self.subTest(line=line):
+                self.assertEqual(tokenizeTaskLine(line), legacyTokenizeTaskLine(line))
+
+
+class TestScanVaultBuffer(unittest.TestCase):
+
+    def assertScansMatch(self, content: bytes) -> None:
+        lines = io.TextIOWrapper(io.BytesIO(content), errors="ignore").readlines()
+        scan = scanVaultBuffer(content)
+        parser = ObsidianVaultFileParser(TaskDiscoveryPolicies("1", "1", "inbox", ["work"]))
+        self.assertEqual(parser.parseScan("note.md", scan), parser.parse("note.md", lines))
+
+        # files without markers are skipped without being scanned
+        if any(marker in content for marker in VAULT_ENTRY_MARKERS):
+            expected = scanVaultLines(lines)
+            self.assertEqual(scan.headerLines, expected.headerLines)
+            self.assertEqual(scan.taskLines, expected.taskLines)
+            self.assertEqual(scan.lineCount, expected.lineCount)
+
+    def test_scanVaultBuffer_PicksHeaderAndTaskLines(self):
+        scan = scanVaultBuffer(b"---\nproject: open\n---\nprose\n- [ ] Task\n")
+        self.assertEqual(scan.headerLines, ["project: open\n"])
+        self.assertEqual(scan.taskLines, [(4, "- [ ] Task\n")])
+        self.assertEqual(scan.lineCount, 5)
+
+    def test_scanVaultBuffer_WhenNoMarkerIsFound_ThenNothingIsDecoded(self):
+        scan = scanVaultBuffer(b"---\nseverity: 2\n---\n- [x] done\n")
+        self.assertEqual((scan.headerLines, scan.taskLines), ([], []))
+
+    def test_scanVaultBuffer_MatchesLineScanOnCorpus(self):
+        for content in FILE_CORPUS:
+            with self.subTest(content=content):
+                self.assertScansMatch(content)
+
+    def test_scanVaultBuffer_WhenCountingInSmallChunks_ThenLineNumbersAreKept(self):
+        with patch("src.wrappers.BufferLines.LINE_COUNT_CHUNK_SIZE", 3):
+            for content in FILE_CORPUS:
+                with self.subTest(content=content):
+                    self.assertScansMatch(content)
+
+    def test_scanVaultBuffer_WhenChunkEndsBeforeCarriageReturns_ThenLineBreaksAreCountedOnce(self):
+        # the first chunk ends in "\r" and the next one starts with "\r\n"
+        with patch("src.wrappers.BufferLines.LINE_COUNT_CHUNK_SIZE", 2):
+            scan = scanVaultBuffer(b"a\r\r\n- [ ] x")
+            self.assertScansMatch(b"a\r\r\n- [ ] x")
+        self.assertEqual(scan.taskLines, [(2, "- [ ] x")])
+        self.assertEqual(scan.lineCount, 3)
+
+    def test_scanVaultBuffer_MatchesLineScanOnRandomFiles(self):
+        rng = random.Random(42)
+        for _ in range(3000):
+            content = b"".join(rng.choice(FILE_FUZZ_TOKENS) for _ in range(rng.randint(0, 40)))
+            with self.subTest(content=content):
+                self.assertScansMatch(content)
+
+
+if __name__ == "__main__":
+    unittest.main()
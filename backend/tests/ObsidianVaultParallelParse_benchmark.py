@@ -0,0 +1,64 @@
+"""
+Cold start benchmark for the parallel parse mode of ObsidianVaultTaskJsonProvider.
+
+Writes a synthetic vault to a temporary directory and measures a cold getJson
+with 1, 2, 4 and 8 worker processes.
+
+Run from the backend directory:
+    python -m tests.ObsidianVaultParallelParse_benchmark
+"""
+
+import os
+import tempfile
+import time
+
+from src.FileBroker import FileBroker
+from src.taskjsonproviders.ObsidianVaultTaskJsonProvider import ObsidianVaultTaskJsonProvider
+from src.Utils import TaskDiscoveryPolicies
+
+NOTE_COUNT = 5000
+TASKS_PER_NOTE = 4
+PROSE_LINES_PER_NOTE = 40
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def writeVault(vaultPath: str) -> None:
+    for noteIndex in range(NOTE_COUNT):
+        directory = os.path.join(vaultPath, f"area{noteIndex % 20}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"note{noteIndex}.md"), "w") as file:
+            file.write("---\nseverity: 2\n---\n# Note\n")
+            for lineIndex in range(PROSE_LINES_PER_NOTE):
+                file.write(f"Some prose about the topic of note {noteIndex}, paragraph {lineIndex}.\n")
+            for taskIndex in range(TASKS_PER_NOTE):
+                file.write(f"- [ ] Task {noteIndex}-{taskIndex} [track:: work] [starts:: 2024-01-01] [due:: 2024-02-01] [remaining_cost:: 3] [invested:: 1]\n")
+
+
+def measure(vaultPath: str, workers: int) -> float:
+    fileBroker = FileBroker(vaultPath, vaultPath, vaultPath)
+    policies = TaskDiscoveryPolicies("0", "0", "inbox", ["work"])
+    provider = ObsidianVaultTaskJsonProvider(fileBroker, policies, workers)
+
+    start = time.perf_counter()
+    result = provider.getJson()
+    elapsed = time.perf_counter() - start
+
+    assert len(result["tasks"]) == NOTE_COUNT * TASKS_PER_NOTE
+    return elapsed
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as vaultPath:
+        vaultPath += os.sep
+        writeVault(vaultPath)
+        print(f"{NOTE_COUNT} notes, {NOTE_COUNT * TASKS_PER_NOTE} tasks, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'cold start (s)':>15} {'speedup':>8}")
+        baseline = 0.0
+        for workers in WORKER_COUNTS:
+            elapsed = measure(vaultPath, workers)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>15.3f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Parse time benchmark for ObsidianVaultTaskJsonProvider.
+
+Builds synthetic vaults with an increasing number of tasks and measures how long
+a cold getJson takes. Time per task should stay roughly constant as the vault grows.
+
+Then writes the biggest vault to disk and compares a cold getJson in a single process
+against the parallel parse, where each worker reads, scans and parses its own files.
+The speedup depends on the CPUs available, there is none on a single CPU machine, but
+the CPU time spent by the main process shows how much of the work is left serial.
+
+Run from the backend directory:
+    python -m tests.ObsidianVaultTaskJsonProvider_benchmark
+"""
+
+import os
+import tempfile
+import time
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+
+from src.FileBroker import FileBroker
+from src.taskjsonproviders.ObsidianVaultTaskJsonProvider import ObsidianVaultTaskJsonProvider
+from src.Interfaces.IFileBroker import IFileBroker
+from src.Utils import TaskDiscoveryPolicies
+
+TASKS_PER_FILE = 10
+TASK_COUNTS = [1000, 10000, 100000]
+WORKERS = max(2, os.cpu_count() or 1)
+
+
+def buildVault(taskCount: int) -> dict[str, list[str]]:
+    vault: dict[str, list[str]] = {}
+    for fileIndex in range(taskCount // TASKS_PER_FILE):
+        lines = ["---\n", "severity: 2\n", "---\n", "# Note\n"]
+        for taskIndex in range(TASKS_PER_FILE):
+            lines.append(f"- [ ] Task {fileIndex}-{taskIndex} [track:: work] [starts:: 2024-01-01] [due:: 2024-02-01] [remaining_cost:: 3] [invested:: 1]\n")
+        vault[f"notes/note{fileIndex}.md"] = lines
+    return vault
+
+
+def measure(taskCount: int) -> float:
+    vault = buildVault(taskCount)
+    fileBroker = MagicMock(spec=IFileBroker)
+    fileBroker.getVaultFiles.return_value = [(path, 100.0) for path in vault]
+    fileBroker.openVaultFile.side_effect = lambda registry, path: nullcontext("".join(vault[path]).encode())
+    policies = TaskDiscoveryPolicies("0", "0", "inbox", ["work"])
+    provider = ObsidianVaultTaskJsonProvider(fileBroker, policies)
+
+    start = time.perf_counter()
+    result = provider.getJson()
+    elapsed = time.perf_counter() - start
+
+    assert len(result["tasks"]) == taskCount
+    return elapsed
+
+
+def measureOnDisk(vaultPath: str, workers: int) -> tuple[float, float, int]:
+    fileBroker = FileBroker(vaultPath, vaultPath, vaultPath + os.sep)
+    provider = ObsidianVaultTaskJsonProvider(fileBroker, TaskDiscoveryPolicies("0", "0", "inbox", ["work"]), workers=workers)
+
+    start = time.perf_counter()
+    startCpu = time.process_time()
+    result = provider.getJson()
+    return time.perf_counter() - start, time.process_time() - startCpu, len(result["tasks"])
+
+
+def main() -> None:
+    print(f"{'tasks':>8} {'total (s)':>10} {'per task (us)':>14}")
+    for taskCount in TASK_COUNTS:
+        elapsed = measure(taskCount)
+        print(f"{taskCount:>8} {elapsed:>10.3f} {elapsed / taskCount * 1e6:>14.2f}")
+
+    taskCount = TASK_COUNTS[-1]
+    with tempfile.TemporaryDirectory() as vaultPath:
+        for path, lines in buildVault(taskCount).items():
+            os.makedirs(os.path.dirname(os.path.join(vaultPath, path)), exist_ok=True)
+            with open(os.path.join(vaultPath, path), "w") as file:
+                file.writelines(lines)
+
+        sequential, sequentialCpu, sequentialTasks = measureOnDisk(vaultPath, 1)
+        parallel, parallelCpu, parallelTasks = measureOnDisk(vaultPath, WORKERS)
+
+    assert sequentialTasks == parallelTasks == taskCount
+    print(f"{taskCount} tasks on disk, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'total (s)':>10} {'main CPU (s)':>13}")
+    print(f"{1:>8} {sequential:>10.3f} {sequentialCpu:>13.3f}")
+    print(f"{WORKERS:>8} {parallel:>10.3f} {parallelCpu:>13.3f}")
+    print(f"parallel {sequential / parallel:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock
+from contextlib import nullcontext
+from unittest.mock import MagicMock, patch
 from src.taskjsonproviders.ObsidianVaultTaskJsonProvider import ObsidianVaultTaskJsonProvider
-from src.Interfaces.IFileBroker import IFileBroker, VaultRegistry
-from src.wrappers.TimeManagement import TimePoint
+from src.Interfaces.IFileBroker import FileRegistry, IFileBroker, VaultRegistry
+from src.wrappers.TimeManagement import TimeAmount, TimePoint
 from src.Utils import TaskDiscoveryPolicies
 
 
@@ -10,6 +13,9 @@ class TestObsidianVaultTaskJsonProvider(unittest.TestCase):
 
     def setUp(self):
         self.mock_file_broker = MagicMock(spec=IFileBroker)
+        self.mock_file_broker.getVaultChanges.return_value = None
+        self.mock_file_broker.openVaultFile.side_effect = self.openVaultFile
+        self.mock_file_broker.getVaultFileSignature.return_value = (100, 10, 1)
         self.policies = TaskDiscoveryPolicies(
             context_missing_policy="0",
             date_missing_policy="0",
@@ -18,11 +24,16 @@ class TestObsidianVaultTaskJsonProvider(unittest.TestCase):
         )
         self.provider = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies)
 
+    def openVaultFile(self, registry, path):
+        # the files are served as raw content built from the lines returned by getVaultFileLines
+        lines = self.mock_file_broker.getVaultFileLines(registry, path)
+        return nullcontext("".join(line if line.endswith("\n") else line + "\n" for line in lines).encode())
+
     def test_empty_vault_returns_empty_dict(self):
         self.mock_file_broker.getVaultFiles.return_value = []
         result = self.provider.getJson()
         self.assertEqual(result, {})
-        self.mock_file_broker.getVaultFiles.assert_called_once_with(VaultRegistry.OBSIDIAN)
+        self.mock_file_broker.getVaultFiles.assert_called_once_with(VaultRegistry.OBSIDIAN, extensions=(".md",))
 
     def test_no_changes_returns_cached_json(self):
         # First call to set up cache
@@ -133,6 +144,57 @@ class TestObsidianVaultTaskJsonProvider(unittest.TestCase):
         result = self.provider.getJson()
         self.assertEqual(len(result["tasks"]), 1)
 
+    def test_failed_files_are_parsed_again(self):
+        self.mock_file_broker.getVaultFiles.return_value = [("valid.md", 100.0), ("invalid.md", 100.0)]
+        lines = {"valid.md": ["- [ ] Valid task [track::work]"], "invalid.md": None}
+
+        def mock_get_file_lines(registry, path):
+            if lines[path] is None:
+                raise Exception("Test error")
+            return lines[path]
+
+        self.mock_file_broker.getVaultFileLines.side_effect = mock_get_file_lines
+        self.provider.getJson()
+
+        lines["invalid.md"] = ["- [ ] Fixed task [track::work]"]
+        result = self.provider.getJson()
+
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Valid task", "Fixed task"])
+
+    def test_failed_files_are_parsed_again_with_vault_changes(self):
+        self.mock_file_broker.getVaultFiles.return_value = [("valid.md", 100.0), ("invalid.md", 100.0)]
+        lines = {"valid.md": ["- [ ] Valid task [track::work]"], "invalid.md": None}
+
+        def mock_get_file_lines(registry, path):
+            if lines[path] is None:
+                raise Exception("Test error")
+            return lines[path]
+
+        self.mock_file_broker.getVaultFileLines.side_effect = mock_get_file_lines
+        self.provider.getJson()
+
+        lines["invalid.md"] = ["- [ ] Fixed task [track::work]"]
+        self.mock_file_broker.getVaultChanges.return_value = set()
+        self.mock_file_broker.getVaultFiles.return_value = [("invalid.md", 100.0)]
+        result = self.provider.getJson()
+
+        self.mock_file_broker.getVaultFiles.assert_called_with(VaultRegistry.OBSIDIAN, {"invalid.md"})
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Valid task", "Fixed task"])
+
+    def test_undated_tasks_are_parsed_again_when_the_day_changes(self):
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Undated task [track::work]"]
+        policies = TaskDiscoveryPolicies("0", "1", "inbox", ["work"])
+        provider = ObsidianVaultTaskJsonProvider(self.mock_file_broker, policies)
+        yesterday = TimePoint.today() + TimeAmount("-1d")
+
+        with patch.object(TimePoint, "today", return_value=yesterday):
+            first = provider.getJson()["tasks"][0]["starts"]
+        second = provider.getJson()["tasks"][0]["starts"]
+
+        self.assertEqual(first, str(yesterday.as_int()))
+        self.assertEqual(second, str(TimePoint.today().as_int()))
+
     def test_saveJson_does_nothing(self):
         # saveJson should be a no-op
         self.provider.saveJson({"tasks": []})
@@ -170,6 +232,253 @@ class TestObsidianVaultTaskJsonProvider(unittest.TestCase):
         self.assertEqual(result["tasks"][0]["severity"], "3.0")
         self.assertEqual(result["tasks"][1]["taskText"], "Task 2")
 
+    def test_only_modified_files_are_parsed_again(self):
+        files = {
+            "a.md": ["- [ ] Task A [track::work]"],
+            "b.md": ["- [ ] Task B [track::work]"],
+        }
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: files[path]
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0), ("b.md", 100.0)]
+        self.provider.getJson()
+
+        files["b.md"] = ["- [ ] Task B updated [track::work]"]
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0), ("b.md", 200.0)]
+        self.mock_file_broker.getVaultFileLines.reset_mock()
+
+        result = self.provider.getJson()
+        self.mock_file_broker.getVaultFileLines.assert_called_once_with(VaultRegistry.OBSIDIAN, "b.md")
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task A", "Task B updated"])
+
+    def test_modified_file_keeps_its_position(self):
+        files = {
+            "a.md": ["- [ ] Task A [track::work]"],
+            "b.md": ["- [ ] Task B [track::work]"],
+        }
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: files[path]
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0), ("b.md", 100.0)]
+        self.provider.getJson()
+
+        files["a.md"] = ["- [ ] Task A updated [track::work]", "- [ ] Task A2 [track::work]"]
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 200.0), ("b.md", 100.0)]
+
+        result = self.provider.getJson()
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task A updated", "Task A2", "Task B"])
+
+    def test_reported_modified_file_keeps_its_position(self):
+        files = {
+            "a.md": ["- [ ] Task A [track::work]"],
+            "b.md": ["- [ ] Task B [track::work]"],
+        }
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: files[path]
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0), ("b.md", 100.0)]
+        self.provider.getJson()
+
+        files["a.md"] = ["- [ ] Task A updated [track::work]"]
+        files["c.md"] = ["- [ ] Task C [track::work]"]
+        self.mock_file_broker.getVaultChanges.return_value = {"a.md", "c.md"}
+        self.mock_file_broker.getVaultFiles.return_value = [("c.md", 200.0), ("a.md", 200.0)]
+
+        result = self.provider.getJson()
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task A updated", "Task B", "Task C"])
+
+    def test_deleted_file_tasks_and_projects_are_removed(self):
+        files = {
+            "a.md": ["- [ ] Task A [track::work]"],
+            "project.md": ["---", "project: open", "---"],
+        }
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: files[path]
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0), ("project.md", 100.0)]
+        result = self.provider.getJson()
+        self.assertEqual(len(result["tasks"]), 2)
+        self.assertEqual(len(result["projects"]), 1)
+
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.reset_mock()
+
+        result = self.provider.getJson()
+        self.mock_file_broker.getVaultFileLines.assert_not_called()
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task A"])
+        self.assertEqual(result["projects"], [])
+
+    def test_removed_task_line_is_dropped_from_modified_file(self):
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = [
+            "- [ ] Task 1 [track::work]",
+            "- [ ] Task 2 [track::work]"
+        ]
+        self.provider.getJson()
+
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 200.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = [
+            "- [ ] Task 1 [track::work]"
+        ]
+
+        result = self.provider.getJson()
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task 1"])
+
+    def test_reported_changes_only_check_changed_paths(self):
+        files = {
+            "a.md": ["- [ ] Task A [track::work]"],
+            "b.md": ["- [ ] Task B [track::work]"],
+        }
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: files[path]
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0), ("b.md", 100.0)]
+        self.provider.getJson()
+
+        files["b.md"] = ["- [ ] Task B updated [track::work]"]
+        self.mock_file_broker.getVaultChanges.return_value = {"b.md", "image.png"}
+        self.mock_file_broker.getVaultFiles.reset_mock()
+        self.mock_file_broker.getVaultFiles.return_value = [("b.md", 200.0)]
+        self.mock_file_broker.getVaultFileLines.reset_mock()
+
+        result = self.provider.getJson()
+        self.mock_file_broker.getVaultFiles.assert_called_once_with(VaultRegistry.OBSIDIAN, {"b.md"})
+        self.mock_file_broker.getVaultFileLines.assert_called_once_with(VaultRegistry.OBSIDIAN, "b.md")
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task A", "Task B updated"])
+
+    def test_no_reported_changes_skips_vault_scan(self):
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Task 1 [track::work]"]
+        first = self.provider.getJson()
+
+        self.mock_file_broker.getVaultChanges.return_value = set()
+        self.mock_file_broker.getVaultFiles.reset_mock()
+        self.mock_file_broker.getVaultFileLines.reset_mock()
+
+        result = self.provider.getJson()
+        self.mock_file_broker.getVaultFiles.assert_not_called()
+        self.mock_file_broker.getVaultFileLines.assert_not_called()
+        self.assertIs(result, first)
+
+    def test_reported_deleted_file_is_removed(self):
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Task 1 [track::work]"]
+        self.provider.getJson()
+
+        self.mock_file_broker.getVaultChanges.return_value = {"tasks.md"}
+        self.mock_file_broker.getVaultFiles.return_value = []
+
+        result = self.provider.getJson()
+        self.assertEqual(result["tasks"], [])
+
+    def test_parallel_parse_matches_sequential_parse(self):
+        with tempfile.TemporaryDirectory() as vaultPath:
+            paths = [f"note{i}.md" for i in range(10)]
+            for i, path in enumerate(paths):
+                with open(os.path.join(vaultPath, path), "w") as file:
+                    file.write("---\nproject: open\n---\n" if i % 3 == 0 else f"- [ ] Task {i} [track::work] [severity::{i}]\n")
+            # listed by the vault but deleted before it is read
+            paths.append("broken.md")
+
+            def get_file_lines(registry, path):
+                with open(os.path.join(vaultPath, path)) as file:
+                    return file.readlines()
+
+            self.mock_file_broker.getVaultFileLines.side_effect = get_file_lines
+            self.mock_file_broker.getVaultFilePath.side_effect = lambda registry, path: os.path.join(vaultPath, path)
+            self.mock_file_broker.getVaultFiles.return_value = [(path, 100.0) for path in paths]
+            sequential = self.provider.getJson()
+
+            parallelProvider = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, workers=2)
+            self.mock_file_broker.getVaultFileLines.reset_mock()
+            with patch("src.taskjsonproviders.ObsidianVaultTaskJsonProvider.PARALLEL_PARSE_MIN_FILES", 1):
+                parallel = parallelProvider.getJson()
+
+        # the workers read the files by themselves
+        self.mock_file_broker.getVaultFileLines.assert_not_called()
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(len(parallel["tasks"]), 10)
+        self.assertEqual(len(parallel["projects"]), 4)
+
+    def test_persistent_cache_is_saved_after_parsing(self):
+        self.mock_file_broker.readFileContentJson.return_value = {}
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Task 1 [track::work]"]
+        provider = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True)
+
+        result = provider.getJson()
+
+        self.mock_file_broker.readFileContentJson.assert_called_once_with(FileRegistry.OBSIDIAN_PARSE_CACHE)
+        registry, cache = self.mock_file_broker.writeFileContentJson.call_args.args
+        self.assertEqual(registry, FileRegistry.OBSIDIAN_PARSE_CACHE)
+        self.assertEqual(cache["files"], [{"path": "tasks.md", "mtime": "100.0", "signature": "100:10:1"}])
+        self.assertEqual(cache["tasks"], result["tasks"])
+
+    def test_persistent_cache_avoids_parsing_unchanged_files(self):
+        self.mock_file_broker.readFileContentJson.return_value = {}
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0), ("project.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: (
+            ["- [ ] Task 1 [track::work]"] if path == "tasks.md" else ["---", "project: open", "---"])
+        first = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True).getJson()
+
+        self.mock_file_broker.readFileContentJson.return_value = self.mock_file_broker.writeFileContentJson.call_args.args[1]
+        self.mock_file_broker.getVaultFileLines.reset_mock()
+        self.mock_file_broker.writeFileContentJson.reset_mock()
+        restarted = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True).getJson()
+
+        self.mock_file_broker.getVaultFileLines.assert_not_called()
+        self.mock_file_broker.writeFileContentJson.assert_not_called()
+        self.assertEqual(restarted, first)
+
+    def test_persistent_cache_reparses_modified_files(self):
+        self.mock_file_broker.readFileContentJson.return_value = {}
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Task 1 [track::work]"]
+        ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True).getJson()
+
+        self.mock_file_broker.readFileContentJson.return_value = self.mock_file_broker.writeFileContentJson.call_args.args[1]
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 200.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Task 2 [track::work]"]
+        result = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True).getJson()
+
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task 2"])
+
+    def test_persistent_cache_reparses_files_with_other_signature(self):
+        self.mock_file_broker.readFileContentJson.return_value = {}
+        self.mock_file_broker.getVaultFiles.return_value = [("a.md", 100.0), ("b.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: [f"- [ ] Task {path} [track::work]"]
+        ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True).getJson()
+
+        # same mtime, but the size of a.md changed while the app was stopped
+        self.mock_file_broker.readFileContentJson.return_value = self.mock_file_broker.writeFileContentJson.call_args.args[1]
+        self.mock_file_broker.getVaultFileSignature.side_effect = lambda registry, path: (100, 20, 1) if path == "a.md" else (100, 10, 1)
+        self.mock_file_broker.getVaultFileLines.reset_mock()
+        self.mock_file_broker.getVaultFileLines.side_effect = lambda registry, path: [f"- [ ] Task {path} updated [track::work]"]
+        result = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True).getJson()
+
+        self.mock_file_broker.getVaultFileLines.assert_called_once_with(VaultRegistry.OBSIDIAN, "a.md")
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task a.md updated", "Task b.md"])
+
+    def test_persistent_cache_without_signatures_is_parsed_again(self):
+        self.mock_file_broker.readFileContentJson.return_value = {
+            "meta": [{"fingerprint": self.provider._ObsidianVaultTaskJsonProvider__parser.getFingerprint()}],
+            "files": [{"path": "tasks.md", "mtime": "100.0"}],
+            "tasks": [{"file": "tasks.md", "line": "1", "taskText": "Stale task"}],
+            "projects": []
+        }
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Task 1 [track::work]"]
+
+        result = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True).getJson()
+
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task 1"])
+
+    def test_persistent_cache_with_other_fingerprint_is_ignored(self):
+        self.mock_file_broker.readFileContentJson.return_value = {
+            "meta": [{"fingerprint": "stale"}],
+            "files": [{"path": "tasks.md", "mtime": "100.0"}],
+            "tasks": [{"file": "tasks.md", "line": "1", "taskText": "Stale task"}],
+            "projects": []
+        }
+        self.mock_file_broker.getVaultFiles.return_value = [("tasks.md", 100.0)]
+        self.mock_file_broker.getVaultFileLines.return_value = ["- [ ] Task 1 [track::work]"]
+        provider = ObsidianVaultTaskJsonProvider(self.mock_file_broker, self.policies, persistentCache=True)
+
+        result = provider.getJson()
+
+        self.mock_file_broker.getVaultFileLines.assert_called_once()
+        self.assertEqual([task["taskText"] for task in result["tasks"]], ["Task 1"])
+
 
 if __name__ == "__main__":
     unittest.main()
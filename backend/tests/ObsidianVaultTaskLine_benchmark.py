@@ -0,0 +1,38 @@
+"""
+Micro-benchmark of the task line tokenizer of ObsidianVaultFileParser against
+the split based implementation it replaced.
+
+Run from the backend directory:
+    python -m tests.ObsidianVaultTaskLine_benchmark
+"""
+
+import timeit
+
+from src.taskjsonproviders.ObsidianVaultFileParser import tokenizeTaskLine
+from tests.ObsidianVaultFileParser_test import CORPUS, legacyTokenizeTaskLine
+
+LINES = [
+    "- [ ] Plain task without fields",
+    "- [ ] Task [track:: work]",
+    "- [ ] Task with link [[Some Note]] [track:: work] [starts:: 2024-01-01] [due:: 2024-02-01] [remaining_cost:: 3] [invested:: 1]",
+] + CORPUS
+REPEAT = 5
+NUMBER = 20000
+
+
+def measure(tokenize) -> float:
+    timer = timeit.Timer(lambda: [tokenize(line) for line in LINES])
+    return min(timer.repeat(REPEAT, NUMBER)) / (NUMBER * len(LINES))
+
+
+def main() -> None:
+    legacy = measure(legacyTokenizeTaskLine)
+    current = measure(tokenizeTaskLine)
+    print(f"{'tokenizer':>10} {'us/line':>8}")
+    print(f"{'legacy':>10} {legacy * 1e6:>8.3f}")
+    print(f"{'current':>10} {current * 1e6:>8.3f}")
+    print(f"speedup {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
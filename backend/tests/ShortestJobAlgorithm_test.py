@@ -21,6 +21,13 @@ class TestShortestJobAlgorithm(unittest.TestCase):
         result = self.algorithm.apply(tasks)
         self.assertEqual(result, [self.mock_task3, self.mock_task2, self.mock_task1])
 
+    def test_applyTop_returns_shortest_tasks(self):
+        tasks = [self.mock_task1, self.mock_task2, self.mock_task3]
+
+        result = self.algorithm.applyTop(tasks, 1)
+
+        self.assertEqual(result, ([self.mock_task3], 3))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,152 @@
+import sqlite3
+import unittest
+from unittest.mock import MagicMock
+
+from src.taskjsonproviders.SqliteTaskJsonProvider import SqliteTaskJsonProvider, TaskQuery
+from src.Interfaces.IFileBroker import IFileBroker, FileRegistry
+from src.taskproviders.TaskProvider import TaskProvider
+
+
+class TestSqliteTaskJsonProvider(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.mockFileBroker = MagicMock(spec=IFileBroker)
+        self.mockFileBroker.connectDatabase.return_value = self.connection
+        self.mockFileBroker.readFileContentJson.return_value = {
+            "tasks": [
+                self.createTask("Write report", "work.office", "1000", "5000"),
+                self.createTask("Buy milk", "home", "2000", "3000", calm="True"),
+                self.createTask("Old task", "work", "500", "600", status="x"),
+                self.createTask("Call plumber", "home", "4000", "9000", waited="plumber"),
+                self.createTask("Ship ÉCLAIRS", "work", "1500", "8000", raised="shipped"),
+            ],
+            "projects": [{"name": "Project1", "status": "closed"}]
+        }
+        self.provider = SqliteTaskJsonProvider(self.mockFileBroker)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def createTask(self, description, context, start, due, status=" ", calm="False", raised=None, waited=None):
+        task = {
+            "description": description,
+            "context": context,
+            "start": start,
+            "due": due,
+            "severity": "1.0",
+            "totalCost": "2.0",
+            "investedEffort": "0.0",
+            "status": status,
+            "calm": calm,
+            "project": ""
+        }
+        if raised is not None:
+            task["raised"] = raised
+        if waited is not None:
+            task["waited"] = waited
+        return task
+
+    def getDescriptions(self, results):
+        return [task["description"] for _, task in results]
+
+    def test_tasks_imported_on_first_run(self):
+        result = self.provider.getJson()
+
+        self.mockFileBroker.readFileContentJson.assert_called_once_with(FileRegistry.STANDALONE_TASKS_JSON)
+        self.assertEqual(result["tasks"], self.mockFileBroker.readFileContentJson.return_value["tasks"])
+        self.assertEqual(result["projects"], [{"name": "Project1", "status": "closed"}])
+
+    def test_tasks_not_imported_again(self):
+        self.mockFileBroker.readFileContentJson.reset_mock()
+
+        SqliteTaskJsonProvider(self.mockFileBroker)
+
+        self.mockFileBroker.readFileContentJson.assert_not_called()
+
+    def test_saveJson_writes_only_changed_tasks(self):
+        taskJson = self.provider.getJson()
+        taskJson["tasks"][1]["description"] = "Buy oat milk"
+        changes = self.connection.total_changes
+
+        self.provider.saveJson(taskJson)
+
+        # one task row, plus the projects that are always rewritten
+        self.assertEqual(self.connection.total_changes - changes, 1 + 1 + len(taskJson["projects"]))
+        self.assertEqual(self.provider.getJson()["tasks"][1]["description"], "Buy oat milk")
+
+    def test_saveJson_removes_dropped_tasks(self):
+        taskJson = self.provider.getJson()
+        del taskJson["tasks"][2]
+
+        self.provider.saveJson(taskJson)
+
+        self.assertEqual([task["description"] for task in self.provider.getJson()["tasks"]], ["Write report", "Buy milk", "Call plumber", "Ship ÉCLAIRS"])
+        self.assertEqual(self.getDescriptions(self.provider.queryTasks(TaskQuery(raised="shipped"))), ["Ship ÉCLAIRS"])
+
+    def test_query_open_tasks_by_context_prefix(self):
+        results = self.provider.queryTasks(TaskQuery(openOnly=True, contextPrefix="work"))
+
+        self.assertEqual(self.getDescriptions(results), ["Write report", "Ship ÉCLAIRS"])
+        self.assertEqual([position for position, _ in results], [0, 4])
+
+    def test_query_by_dates(self):
+        self.assertEqual(self.getDescriptions(self.provider.queryTasks(TaskQuery(startBefore=1500))), ["Write report", "Old task"])
+        self.assertEqual(self.getDescriptions(self.provider.queryTasks(TaskQuery(startAfter=1500, dueBefore=9000))), ["Buy milk"])
+        self.assertEqual(self.getDescriptions(self.provider.queryTasks(TaskQuery(openOnly=True, dueAfter=5000))), ["Call plumber", "Ship ÉCLAIRS"])
+
+    def test_query_urgent_tasks(self):
+        results = self.provider.queryTasks(TaskQuery(openOnly=True, dueBefore=8500, calm=False, waiting=False))
+
+        self.assertEqual(self.getDescriptions(results), ["Write report", "Ship ÉCLAIRS"])
+
+    def test_query_events(self):
+        self.assertEqual(self.getDescriptions(self.provider.queryTasks(TaskQuery(waited="plumber"))), ["Call plumber"])
+        self.assertEqual(self.getDescriptions(self.provider.queryTasks(TaskQuery(waiting=True))), ["Call plumber"])
+        self.assertEqual(self.getDescriptions(self.provider.queryTasks(TaskQuery(raised="shipped"))), ["Ship ÉCLAIRS"])
+
+    def test_query_search_terms_ignore_case(self):
+        results = self.provider.queryTasks(TaskQuery(openOnly=True, searchTerms=["MILK", "éclairs"]))
+
+        self.assertEqual(self.getDescriptions(results), ["Buy milk", "Ship ÉCLAIRS"])
+
+    def test_queries_use_indexes(self):
+        plan = self.connection.execute("EXPLAIN QUERY PLAN SELECT position FROM tasks WHERE context >= ? AND context < ?", ("work", "work\U0010ffff")).fetchall()
+
+        self.assertIn("tasks_context", str(plan))
+
+    def test_query_injected_tasks_always_returned(self):
+        taskJson = self.provider.getJson()
+        taskJson["projects"].append({"name": "Project2", "status": "open"})
+        self.provider.saveJson(taskJson)
+        self.connection.execute("DELETE FROM tasks WHERE position = 5")
+
+        results = self.provider.queryTasks(TaskQuery(contextPrefix="work"))
+
+        self.assertEqual(self.getDescriptions(results), ["Write report", "Old task", "Ship ÉCLAIRS", "Define next action"])
+        self.assertEqual(results[-1][0], 5)
+
+    def test_task_provider_answers_queries_with_its_models(self):
+        taskProvider = TaskProvider(self.provider, self.mockFileBroker, disableThreading=True)
+        taskList = taskProvider.getTaskList()
+
+        results = taskProvider.queryTasks(TaskQuery(openOnly=True, contextPrefix="work"))
+
+        # the done task has no model, the tasks after it keep their models
+        self.assertEqual(results, [taskList[0], taskList[3]])
+
+    def test_getJson_cache_follows_the_database_signature(self):
+        signatures = {FileRegistry.STANDALONE_TASKS_JSON: (1, 1, 1), FileRegistry.STANDALONE_TASKS_DB: (1, 1, 2)}
+        self.mockFileBroker.getFileSignature.side_effect = lambda registry: signatures[registry]
+        first = self.provider.getJson()
+
+        # tasks.json is only read on the first run, its changes don't matter
+        signatures[FileRegistry.STANDALONE_TASKS_JSON] = (2, 1, 1)
+        self.assertIs(self.provider.getJson(), first)
+
+        self.connection.execute("UPDATE tasks SET data = ? WHERE position = 0", ('{"description": "Changed elsewhere", "status": " "}',))
+        signatures[FileRegistry.STANDALONE_TASKS_DB] = (2, 1, 2)
+        self.assertEqual(self.provider.getJson()["tasks"][0]["description"], "Changed elsewhere")
+
+
+if __name__ == "__main__":
+    unittest.main()
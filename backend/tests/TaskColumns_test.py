@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.Interfaces.IHeuristic import IHeuristic
+from src.heuristics.CfdHeuristic import CfdHeuristic
+from src.heuristics.DaysToThresholdHeuristic import DaysToThresholdHeuristic
+from src.heuristics.RemainingEffortHeuristic import RemainingEffortHeuristic
+from src.heuristics.SlackHeuristic import SlackHeuristic
+from src.heuristics.StartTimeHeuristic import StartTimeHeuristic
+from src.heuristics.TaskColumns import TaskColumns
+from src.heuristics.WorkloadHeuristic import WorkloadHeuristic
+from src.taskmodels.TaskModel import TaskModel
+from src.wrappers.TimeManagement import TimeAmount, TimePoint
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# heuristic and whether its scalar sort goes from the highest value to the lowest
+HEURISTICS = [
+    (SlackHeuristic(TimeAmount("4p")), True),
+    (SlackHeuristic(TimeAmount("4p"), daysOffset=2), True),
+    (RemainingEffortHeuristic(TimeAmount("4p"), 1), True),
+    (DaysToThresholdHeuristic(TimeAmount("4p"), 0.5), False),
+    (CfdHeuristic(TimeAmount("4p")), False),
+    (WorkloadHeuristic(), True),
+    (StartTimeHeuristic(), False),
+]
+
+
+class TestTaskColumns(unittest.TestCase):
+    def setUp(self):
+        now = TimePoint.now().as_int()
+        self.tasks = []
+        for i in range(200):
+            # repeated values give ties, due dates in the past give tasks with no days left
+            start = now - (i % 11) * DAY_MS
+            due = now + (i % 7 - 2) * DAY_MS
+            self.tasks.append(TaskModel(f"Task {i}", "work", start, due, 1 + i % 3, i % 5 * 0.5, i % 4, " ", "False", "", i, None, None))
+        # remaining cost equal to the work that fits in the days left, the slack divisor is zero
+        self.tasks.append(TaskModel("Exact fit", "work", now, now + 3 * DAY_MS, 1, 12, 0, " ", "False", "", 200, None, None))
+
+    def scalarSort(self, heuristic, tasks, reverse):
+        retval = [(task, heuristic.evaluate(task)) for task in tasks]
+        retval.sort(key=lambda x: x[1], reverse=reverse)
+        return retval
+
+    def test_sort_matches_scalar_evaluation(self):
+        for heuristic, reverse in HEURISTICS:
+            with self.subTest(heuristic=heuristic.getDescription()):
+                self.assertEqual(heuristic.sort(self.tasks), self.scalarSort(heuristic, self.tasks, reverse))
+
+    def test_top_matches_first_sorted_tasks(self):
+        for heuristic, _ in HEURISTICS:
+            for count in [0, 1, 5, len(self.tasks) + 1]:
+                with self.subTest(heuristic=heuristic.getDescription(), count=count):
+                    self.assertEqual(heuristic.top(self.tasks, count), heuristic.sort(self.tasks)[:count])
+
+    def test_evaluateColumns_matches_evaluate(self):
+        for vectorized in [False, True]:
+            columns = TaskColumns(self.tasks, vectorized)
+            for heuristic, _ in HEURISTICS:
+                with self.subTest(heuristic=heuristic.getDescription(), vectorized=columns.vectorized):
+                    self.assertEqual(heuristic.evaluateColumns(columns), [heuristic.evaluate(task) for task in self.tasks])
+
+    def test_sortColumns_same_order_with_and_without_numpy(self):
+        for heuristic, _ in HEURISTICS:
+            with self.subTest(heuristic=heuristic.getDescription()):
+                self.assertEqual(heuristic.sortColumns(TaskColumns(self.tasks)), heuristic.sortColumns(TaskColumns(self.tasks, vectorized=False)))
+
+    def test_evaluateColumns_of_empty_list(self):
+        for vectorized in [False, True]:
+            for heuristic, _ in HEURISTICS:
+                with self.subTest(heuristic=heuristic.getDescription(), vectorized=vectorized):
+                    self.assertEqual(heuristic.evaluateColumns(TaskColumns([], vectorized)), [])
+
+    def test_columns_shared_between_heuristics(self):
+        task = MagicMock()
+        task.getSeverity.return_value = 2
+        task.getTotalCost.return_value = TimeAmount("10p")
+        task.calculateRemainingTime.return_value = TimeAmount("4d")
+        columns = TaskColumns([task, task])
+
+        SlackHeuristic(TimeAmount("4p")).sortColumns(columns)
+        RemainingEffortHeuristic(TimeAmount("4p"), 1).sortColumns(columns)
+
+        self.assertEqual(task.getTotalCost.call_count, 2)
+        self.assertEqual(task.calculateRemainingTime.call_count, 2)
+        task.getStart.assert_not_called()
+
+    def test_sort_keeps_task_order_on_ties(self):
+        columns = TaskColumns(self.tasks[:4])
+
+        result = columns.sort([1.0, 2.0, 1.0, 2.0], reverse=True)
+
+        self.assertEqual([task for task, _ in result], [self.tasks[1], self.tasks[3], self.tasks[0], self.tasks[2]])
+
+    def test_sort_direction_taken_from_heuristic(self):
+        heuristic = MagicMock(spec=SlackHeuristic)
+        heuristic.evaluateColumns.return_value = [1.0, 3.0, 2.0]
+        columns = TaskColumns(self.tasks[:3])
+
+        heuristic.sortDescending = True
+        self.assertEqual([value for _, value in IHeuristic.sortColumns(heuristic, columns)], [3.0, 2.0, 1.0])
+        heuristic.sortDescending = False
+        self.assertEqual([value for _, value in IHeuristic.topColumns(heuristic, columns, 2)], [1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -135,6 +135,91 @@ class TestTaskJsonProvider(unittest.TestCase):
         # Assert
         self.mock_file_broker.writeFileContentJson.assert_called_once_with(FileRegistry.STANDALONE_TASKS_JSON, mock_json)
 
+    def test_getJson_when_project_listed_twice_then_one_task_injected(self):
+        """Test that an open project gets a single next action even if it appears twice."""
+        # Arrange
+        self.mock_file_broker.readFileContentJson.return_value = {
+            "tasks": [{"description": "Done", "project": "Project1", "status": "x"}],
+            "projects": [{"name": "Project1", "status": "open"}, {"name": "Project1", "status": "open"}]
+        }
+
+        # Act
+        result = self.provider.getJson()
+
+        # Assert
+        injected = [task for task in result["tasks"] if task["description"] == "Define next action"]
+        self.assertEqual(len(injected), 1)
+
+    def test_getJson_when_same_json_read_again_then_tasks_not_injected_twice(self):
+        """Test that the injection doesn't duplicate tasks when it runs again over the same json."""
+        # Arrange
+        self.mock_file_broker.getFileSignature.return_value = None
+        self.mock_file_broker.readFileContentJson.return_value = {
+            "tasks": [],
+            "projects": [{"name": "Project1", "status": "open"}]
+        }
+
+        # Act
+        self.provider.getJson()
+        result = self.provider.getJson()
+
+        # Assert
+        self.assertEqual(len(result["tasks"]), 1)
+
+    def test_getJson_when_file_unchanged_then_file_not_read_again(self):
+        """Test that the file is read only once while its signature doesn't change."""
+        # Arrange
+        self.mock_file_broker.getFileSignature.return_value = (1, 10, 1)
+        self.mock_file_broker.readFileContentJson.return_value = {"tasks": [], "projects": []}
+
+        # Act
+        first = self.provider.getJson()
+        second = self.provider.getJson()
+
+        # Assert
+        self.mock_file_broker.readFileContentJson.assert_called_once()
+        self.assertIs(first, second)
+
+    def test_getJson_when_file_changes_then_file_read_again(self):
+        """Test that a different signature invalidates the cached json."""
+        # Arrange
+        self.mock_file_broker.getFileSignature.side_effect = [(1, 10, 1), (2, 10, 1)]
+        self.mock_file_broker.readFileContentJson.return_value = {"tasks": [], "projects": []}
+
+        # Act
+        self.provider.getJson()
+        self.provider.getJson()
+
+        # Assert
+        self.assertEqual(self.mock_file_broker.readFileContentJson.call_count, 2)
+
+    def test_getJson_after_saveJson_then_file_read_again(self):
+        """Test that saving invalidates the cached json, even if the signature looks the same."""
+        # Arrange
+        self.mock_file_broker.getFileSignature.return_value = (1, 10, 1)
+        self.mock_file_broker.readFileContentJson.return_value = {"tasks": [], "projects": []}
+
+        # Act
+        self.provider.getJson()
+        self.provider.saveJson({"tasks": [], "projects": []})
+        self.provider.getJson()
+
+        # Assert
+        self.assertEqual(self.mock_file_broker.readFileContentJson.call_count, 2)
+
+    def test_getJson_when_file_missing_then_nothing_cached(self):
+        """Test that nothing is cached when the file can't be checked."""
+        # Arrange
+        self.mock_file_broker.getFileSignature.return_value = None
+        self.mock_file_broker.readFileContentJson.return_value = {"tasks": [], "projects": []}
+
+        # Act
+        self.provider.getJson()
+        self.provider.getJson()
+
+        # Assert
+        self.assertEqual(self.mock_file_broker.readFileContentJson.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,122 @@
+"""
+Memory and throughput benchmark of TaskModel against the model without slots nor
+cached values it replaced.
+
+Loads 100k tasks, then sorts them twice with a heuristic and once by start date,
+like the task list does when it is shown and then refreshed.
+
+Run from the backend directory:
+    python -m tests.TaskModel_benchmark
+"""
+
+import datetime
+import time
+import tracemalloc
+from math import ceil
+
+from src.heuristics.RemainingEffortHeuristic import RemainingEffortHeuristic
+from src.taskmodels.TaskModel import TaskModel
+from src.wrappers.TimeManagement import TimeAmount, TimePoint
+
+TASK_COUNT = 100000
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class LegacyTaskModel(TaskModel):
+    """
+    Task model as it was before: every getter builds new objects.
+    """
+
+    def getStart(self) -> TimePoint:
+        return TimePoint(datetime.datetime.fromtimestamp(self._start / 1e3))
+
+    def getDue(self) -> TimePoint:
+        return TimePoint(datetime.datetime.fromtimestamp(self._due / 1e3)).strip_time()
+
+    def getTotalCost(self) -> TimeAmount:
+        return TimeAmount(f"{self._totalCost}p")
+
+    def getInvestedEffort(self) -> TimeAmount:
+        return TimeAmount(f"{self._investedEffort}p")
+
+    def calculateRemainingTime(self) -> TimeAmount:
+        d = (self.getDue().as_int() - TimePoint.now().as_int()) / DAY_MS
+        return TimeAmount(f"{ceil(max(0, d))}d")
+
+
+class LegacyTaskModelFields:
+    """
+    Fields of the task model as it was before, stored in the __dict__ of every instance.
+    """
+
+    def __init__(self, description: str, context: str, start: int, due: int, severity: float, totalCost: float, investedEffort: float, status: str, calm: str, project: str, index: int, raised: str | None, waited: str | None):
+        self._description = description
+        self._context = context
+        self._start = int(start)
+        self._due = int(due)
+        self._severity = float(severity)
+        self._totalCost = float(totalCost)
+        self._investedEffort = float(investedEffort)
+        self._status = status
+        self._calm = True if calm.upper().startswith("TRUE") else False
+        self._project = project
+        self._index = index
+        self._raised = raised
+        self._waited = waited
+
+
+def loadTasks(modelClass: type[TaskModel]) -> list[TaskModel]:
+    now = TimePoint.now().as_int()
+    return [
+        modelClass(f"Task {i}", "work", now - (i % 30) * DAY_MS, now + (i % 90) * DAY_MS, 1 + i % 5, 1 + i % 8, i % 3, " ", "False", "", i, None, None)
+        for i in range(TASK_COUNT)
+    ]
+
+
+def measure(modelClass: type) -> tuple[float, float, float, float]:
+    """
+    Returns:
+        tuple: Seconds to load the tasks, seconds of the first and the repeated sort, and bytes per task.
+    """
+    start = time.perf_counter()
+    tasks = loadTasks(modelClass)
+    loadTime = time.perf_counter() - start
+
+    heuristic = RemainingEffortHeuristic(TimeAmount("8p"), 1)
+    sortTimes = []
+    for _ in range(2):
+        start = time.perf_counter()
+        heuristic.sort(tasks)
+        sorted(tasks, key=lambda task: task.getStart().as_int())
+        sortTimes.append(time.perf_counter() - start)
+
+    return loadTime, sortTimes[0], sortTimes[1], measureMemory(modelClass)
+
+
+def measureMemory(modelClass: type) -> float:
+    """
+    Bytes allocated per task, without its strings, which are the same for every model.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [modelClass("", "", 0, 0, 1, 1, 0, " ", "False", "", i, None, None) for i in range(TASK_COUNT)]
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del tasks
+    return memory / TASK_COUNT
+
+
+def main() -> None:
+    print(f"{TASK_COUNT} tasks")
+    print(f"{'model':>8} {'load (s)':>9} {'1st sort (s)':>13} {'2nd sort (s)':>13}")
+    results = {}
+    for name, modelClass in [("legacy", LegacyTaskModel), ("current", TaskModel)]:
+        results[name] = measure(modelClass)
+        loadTime, firstSort, secondSort, _ = results[name]
+        print(f"{name:>8} {loadTime:>9.3f} {firstSort:>13.3f} {secondSort:>13.3f}")
+    print(f"bytes per task: {measureMemory(LegacyTaskModelFields):.0f} with a __dict__, {results['current'][3]:.0f} with __slots__")
+    print(f"sort {results['legacy'][1] / results['current'][1]:.2f}x faster, repeated sort {results['legacy'][2] / results['current'][2]:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
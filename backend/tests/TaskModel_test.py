@@ -1,5 +1,11 @@
+import datetime
 import unittest
+from unittest.mock import patch
+
 from src.taskmodels.TaskModel import TaskModel
+from src.wrappers.TimeManagement import TimeAmount, TimePoint
+
+DAY_MS = 24 * 60 * 60 * 1000
 
 
 class TestTaskModel(unittest.TestCase):
@@ -47,6 +53,104 @@ class TestTaskModel(unittest.TestCase):
         # Description should include the project name appended with " @ "
         self.assertEqual(task.getDescription(), "Test task @ TestProject")
 
+    def createTask(self, start=0, due=0):
+        return TaskModel(
+            description="Test task",
+            context="Test context",
+            start=start,
+            due=due,
+            severity=1.0,
+            totalCost=2.0,
+            investedEffort=0.5,
+            status=" ",
+            calm="false",
+            project="",
+            index=1,
+            raised=None,
+            waited=None
+        )
+
+    def test_task_has_no_dict(self):
+        """Test that tasks only store their slots"""
+        task = self.createTask()
+
+        self.assertFalse(hasattr(task, "__dict__"))
+        with self.assertRaises(AttributeError):
+            task.unknownAttribute = 1
+
+    def test_derived_values_are_cached(self):
+        """Test that getters return the same object until the value changes"""
+        task = self.createTask(start=DAY_MS, due=2 * DAY_MS)
+
+        self.assertIs(task.getStart(), task.getStart())
+        self.assertIs(task.getDue(), task.getDue())
+        self.assertIs(task.getTotalCost(), task.getTotalCost())
+        self.assertIs(task.getInvestedEffort(), task.getInvestedEffort())
+        self.assertEqual(task.getTotalCost().as_pomodoros(), 2.0)
+
+    def test_setters_invalidate_cached_values(self):
+        """Test that setters clear the cached values they change"""
+        task = self.createTask(start=0, due=0)
+        task.getStart()
+        task.getDue()
+        task.getTotalCost()
+        task.getInvestedEffort()
+
+        newStart = TimePoint.from_string("2030-01-02T10:00")
+        task.setStart(newStart)
+        task.setTotalCost(TimeAmount("3p"))
+        task.setInvestedEffort(TimeAmount("1p"))
+
+        self.assertEqual(task.getStart().as_int(), newStart.as_int())
+        # the due date is moved to the start day
+        self.assertEqual(task.getDue().as_int(), newStart.strip_time().as_int())
+        self.assertEqual(task.getTotalCost().as_pomodoros(), 3.0)
+        self.assertEqual(task.getInvestedEffort().as_pomodoros(), 1.0)
+
+        newDue = TimePoint.from_string("2029-12-31")
+        task.setDue(newDue)
+
+        self.assertEqual(task.getDue().as_int(), newDue.as_int())
+        self.assertEqual(task.getStart().as_int(), newDue.as_int())
+
+    def test_remaining_time_recalculated_when_minute_changes(self):
+        """Test that the remaining time is kept during a minute and recalculated after it"""
+        due = TimePoint.from_string("2030-01-10")
+        task = self.createTask(due=due.as_int())
+        first = datetime.datetime(2030, 1, 7, 23, 59, 0)
+        second = datetime.datetime(2030, 1, 8, 0, 0, 0)
+
+        with patch("src.taskmodels.TaskModel.datetime") as mockDatetime:
+            mockDatetime.datetime.now.return_value = first
+            mockDatetime.datetime.fromtimestamp.side_effect = datetime.datetime.fromtimestamp
+            mockDatetime.timedelta = datetime.timedelta
+            firstRemaining = task.calculateRemainingTime()
+            self.assertIs(task.calculateRemainingTime(), firstRemaining)
+
+            mockDatetime.datetime.now.return_value = second
+            secondRemaining = task.calculateRemainingTime()
+
+        self.assertEqual(firstRemaining.as_days(), 3)
+        self.assertEqual(secondRemaining.as_days(), 2)
+
+    def test_remaining_time_invalidated_by_setDue(self):
+        """Test that changing the due date recalculates the remaining time"""
+        task = self.createTask(due=TimePoint.today().as_int())
+        self.assertEqual(task.calculateRemainingTime().as_days(), 0)
+
+        task.setDue((TimePoint.today() + TimeAmount("5d")).strip_time())
+
+        self.assertGreaterEqual(task.calculateRemainingTime().as_days(), 4)
+
+    def test_fingerprint_follows_content(self):
+        """Test that fingerprints match for equal content and stop matching after a change"""
+        task = self.createTask(start=DAY_MS, due=2 * DAY_MS)
+        fingerprint = task.getFingerprint()
+
+        self.assertEqual(fingerprint, self.createTask(start=DAY_MS, due=2 * DAY_MS).getFingerprint())
+        task.setSeverity(3.0)
+        self.assertNotEqual(task.getFingerprint(), fingerprint)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,9 +2,10 @@ import unittest
 from unittest.mock import MagicMock
 import json
 
-from src.taskproviders.TaskProvider import TaskProvider
+from src.taskproviders.TaskProvider import TaskProvider, getTaskListSignature
 from src.Interfaces.ITaskJsonProvider import ITaskJsonProvider
 from src.Interfaces.IFileBroker import IFileBroker, FileRegistry
+from src.Utils import TaskQuery
 
 
 class TestTaskProvider(unittest.TestCase):
@@ -132,6 +133,67 @@ class TestTaskProvider(unittest.TestCase):
         saved_task = next(t for t in self.task_provider.dict_task_list["tasks"] if t["description"] == "Updated Task 1")
         self.assertIsNotNone(saved_task)
 
+    def test_get_task_list_reuses_models_while_json_unchanged(self):
+        first = self.task_provider.getTaskList()
+        second = self.task_provider.getTaskList()
+
+        self.assertIsNot(first, second)
+        self.assertIs(first[0], second[0])
+
+    def test_get_task_list_rebuilds_models_when_json_changes(self):
+        first = self.task_provider.getTaskList()
+        self.mock_task_json_provider.getJson.return_value = dict(self.sample_tasks)
+
+        second = self.task_provider.getTaskList()
+
+        self.assertIsNot(first[0], second[0])
+
+    def test_task_list_version_changes_with_json(self):
+        self.task_provider.getTaskList()
+        version = self.task_provider.getTaskListVersion()
+
+        self.task_provider.getTaskList()
+        self.assertEqual(self.task_provider.getTaskListVersion(), version)
+
+        self.mock_task_json_provider.getJson.return_value = dict(self.sample_tasks)
+        self.task_provider.getTaskList()
+        self.assertGreater(self.task_provider.getTaskListVersion(), version)
+
+    def test_query_tasks_maps_stored_positions_to_models(self):
+        task_list = self.task_provider.getTaskList()
+        # the completed task at position 1 has no model
+        self.mock_task_json_provider.queryTasks.return_value = [(1, self.sample_tasks["tasks"][1]), (2, self.sample_tasks["tasks"][2])]
+
+        result = self.task_provider.queryTasks(TaskQuery(contextPrefix="o"))
+
+        self.mock_task_json_provider.queryTasks.assert_called_once_with(TaskQuery(contextPrefix="o"))
+        self.assertEqual(result, [task_list[1]])
+
+    def test_query_tasks_not_answered_after_tasks_change(self):
+        task_list = self.task_provider.getTaskList()
+        self.mock_task_json_provider.queryTasks.return_value = []
+
+        task_list[0].setDescription("Changed")
+        self.assertIsNone(self.task_provider.queryTasks(TaskQuery()))
+
+        self.task_provider.getTaskList()
+        self.mock_task_json_provider.getJson.return_value = dict(self.sample_tasks)
+        self.assertIsNone(self.task_provider.queryTasks(TaskQuery()))
+
+    def test_query_tasks_not_answered_when_provider_cannot_query(self):
+        self.task_provider.getTaskList()
+        self.mock_task_json_provider.queryTasks.return_value = None
+
+        self.assertIsNone(self.task_provider.queryTasks(TaskQuery()))
+
+    def test_save_new_task(self):
+        task = self.task_provider.createDefaultTask("New Task")
+
+        self.task_provider.saveTask(task)
+
+        savedJson = self.mock_task_json_provider.saveJson.call_args[0][0]
+        self.assertEqual([t["description"] for t in savedJson["tasks"]], ["Task 1", "Task 3", "New Task"])
+
     def test_create_default_task(self):
         # Create a default task
         task = self.task_provider.createDefaultTask("New Task")
@@ -198,5 +260,208 @@ class TestTaskProvider(unittest.TestCase):
         self.assertIn(mock_callback, self.task_provider.onTaskListUpdatedCallbacks)
 
 
+class TestTaskProviderWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.mock_task_json_provider = MagicMock(spec=ITaskJsonProvider)
+        self.mock_file_broker = MagicMock(spec=IFileBroker)
+        self.mock_file_broker.readFileContent.return_value = ""
+        self.mock_task_json_provider.getJson.side_effect = lambda: {
+            "tasks": [self.createTaskDict("Task 1"), self.createTaskDict("Task 2")]
+        }
+
+        # the delay is long enough for the timer to never fire during a test
+        self.task_provider = TaskProvider(
+            self.mock_task_json_provider,
+            self.mock_file_broker,
+            disableThreading=True,
+            flushDelay=60
+        )
+
+    def tearDown(self):
+        self.task_provider.dispose()
+
+    def createTaskDict(self, description):
+        return {
+            "description": description,
+            "context": "work",
+            "start": "1625097600000",
+            "due": "1625184000000",
+            "severity": "1.0",
+            "totalCost": "2.0",
+            "investedEffort": "0.0",
+            "status": " ",
+            "calm": "False",
+            "project": ""
+        }
+
+    def getJournal(self):
+        return "".join(
+            call[0][1]
+            for call in self.mock_file_broker.appendFileContent.call_args_list
+            if call[0][0] == FileRegistry.STANDALONE_TASKS_JOURNAL
+        )
+
+    def getJournalRecords(self):
+        return [json.loads(line) for line in self.getJournal().splitlines()]
+
+    def createJournal(self, tasks, records):
+        journal = json.dumps({"base": getTaskListSignature(tasks)}) + "\n"
+        return journal + "".join(json.dumps(record) + "\n" for record in records)
+
+    def restartTaskProvider(self, storedJson, journal):
+        # the previous provider is dropped without being disposed, like a process that stopped
+        self.mock_task_json_provider.getJson.side_effect = lambda: storedJson
+        self.mock_task_json_provider.saveJson.reset_mock()
+        self.mock_file_broker.readFileContent.return_value = journal
+        self.task_provider = TaskProvider(
+            self.mock_task_json_provider,
+            self.mock_file_broker,
+            disableThreading=True,
+            flushDelay=60
+        )
+
+    def test_saved_tasks_written_once_on_flush(self):
+        task_list = self.task_provider.getTaskList()
+        task_list[0].setStatus("x")
+        task_list[1].setDescription("Updated Task 2")
+
+        self.task_provider.saveTask(task_list[0])
+        self.task_provider.saveTask(task_list[1])
+        self.mock_task_json_provider.saveJson.assert_not_called()
+
+        self.task_provider.flush()
+
+        self.mock_task_json_provider.saveJson.assert_called_once()
+        savedJson = self.mock_task_json_provider.saveJson.call_args[0][0]
+        self.assertEqual(savedJson["tasks"][0]["status"], "x")
+        self.assertEqual(savedJson["tasks"][1]["description"], "Updated Task 2")
+        self.mock_file_broker.writeFileContent.assert_called_once_with(FileRegistry.STANDALONE_TASKS_JOURNAL, "")
+
+    def test_saved_tasks_appended_to_journal(self):
+        task_list = self.task_provider.getTaskList()
+        task_list[1].setDescription("Updated Task 2")
+
+        self.task_provider.saveTask(task_list[1])
+
+        records = self.getJournalRecords()
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["base"], getTaskListSignature([self.createTaskDict("Task 1"), self.createTaskDict("Task 2")]))
+        self.assertEqual(records[1]["index"], 1)
+        self.assertEqual(records[1]["task"]["description"], "Updated Task 2")
+
+    def test_flush_without_saved_tasks_writes_nothing(self):
+        self.task_provider.getTaskList()
+
+        self.task_provider.flush()
+
+        self.mock_task_json_provider.saveJson.assert_not_called()
+        self.mock_file_broker.writeFileContent.assert_not_called()
+
+    def test_get_task_list_reads_saved_tasks_from_memory(self):
+        task_list = self.task_provider.getTaskList()
+        task_list[0].setStatus("x")
+        self.task_provider.saveTask(task_list[0])
+        new_task = self.task_provider.createDefaultTask("New Task")
+        self.task_provider.saveTask(new_task)
+        self.mock_task_json_provider.getJson.reset_mock()
+
+        task_list = self.task_provider.getTaskList()
+
+        self.mock_task_json_provider.saveJson.assert_not_called()
+        self.mock_task_json_provider.getJson.assert_not_called()
+        self.assertEqual([task.getDescription() for task in task_list], ["Task 2", "New Task"])
+        # done tasks keep the index of the other tasks
+        self.assertEqual([task.getTaskUID() for task in task_list], ["1", "2"])
+
+    def test_dispose_writes_saved_tasks(self):
+        task_list = self.task_provider.getTaskList()
+        task_list[0].setDescription("Updated Task 1")
+        self.task_provider.saveTask(task_list[0])
+
+        self.task_provider.dispose()
+
+        self.mock_task_json_provider.saveJson.assert_called_once()
+        self.assertEqual(self.mock_task_json_provider.saveJson.call_args[0][0]["tasks"][0]["description"], "Updated Task 1")
+
+    def test_export_includes_saved_tasks_without_writing_them(self):
+        task_list = self.task_provider.getTaskList()
+        task_list[0].setDescription("Updated Task 1")
+        self.task_provider.saveTask(task_list[0])
+
+        exported = json.loads(self.task_provider.exportTasks("json").decode("utf-8"))
+
+        self.mock_task_json_provider.saveJson.assert_not_called()
+        self.assertEqual(exported["tasks"][0]["description"], "Updated Task 1")
+
+    def test_journal_replayed_on_startup(self):
+        self.mock_file_broker.readFileContent.return_value = self.createJournal(
+            [self.createTaskDict("Task 1"), self.createTaskDict("Task 2")],
+            [{"index": 0, "task": self.createTaskDict("Journaled Task")}, {"index": 2, "task": self.createTaskDict("New Task")}]
+        )
+
+        task_list = self.task_provider.getTaskList()
+
+        self.assertEqual([task.getDescription() for task in task_list], ["Journaled Task", "Task 2", "New Task"])
+        self.mock_task_json_provider.saveJson.assert_called_once()
+        self.mock_file_broker.writeFileContent.assert_called_once_with(FileRegistry.STANDALONE_TASKS_JOURNAL, "")
+
+    def test_journal_cut_record_ignored(self):
+        journal = self.createJournal(
+            [self.createTaskDict("Task 1"), self.createTaskDict("Task 2")],
+            [{"index": 0, "task": self.createTaskDict("Journaled Task")}]
+        )
+        journal += '{"index": 1, "task": {"descr'
+        self.mock_file_broker.readFileContent.return_value = journal
+
+        task_list = self.task_provider.getTaskList()
+
+        self.assertEqual([task.getDescription() for task in task_list], ["Journaled Task", "Task 2"])
+
+    def test_journal_without_signature_ignored(self):
+        self.mock_file_broker.readFileContent.return_value = json.dumps({"index": 0, "task": self.createTaskDict("Journaled Task")}) + "\n"
+
+        task_list = self.task_provider.getTaskList()
+
+        self.assertEqual([task.getDescription() for task in task_list], ["Task 1", "Task 2"])
+        self.mock_task_json_provider.saveJson.assert_not_called()
+
+    def test_journal_ignored_after_crash_between_write_and_truncate(self):
+        task_list = self.task_provider.getTaskList()
+        task_list[0].setStatus("x")
+        task_list[1].setDescription("Updated Task 2")
+        self.task_provider.saveTask(task_list[0])
+        self.task_provider.saveTask(task_list[1])
+        self.mock_file_broker.writeFileContent.side_effect = RuntimeError("crash before the journal is emptied")
+        with self.assertRaises(RuntimeError):
+            self.task_provider.flush()
+        self.mock_file_broker.writeFileContent.side_effect = None
+        storedJson = json.loads(json.dumps(self.mock_task_json_provider.saveJson.call_args[0][0]))
+
+        self.restartTaskProvider(storedJson, self.getJournal())
+        task_list = self.task_provider.getTaskList()
+
+        # the done task is filtered out, so replaying the journal would write its index over the updated task
+        self.assertEqual([task.getDescription() for task in task_list], ["Updated Task 2"])
+        self.assertEqual(task_list[0].getStatus(), " ")
+        self.mock_task_json_provider.saveJson.assert_not_called()
+
+    def test_journal_written_after_flush_replayed_on_stored_tasks(self):
+        task_list = self.task_provider.getTaskList()
+        task_list[0].setStatus("x")
+        self.task_provider.saveTask(task_list[0])
+        self.task_provider.flush()
+        self.mock_file_broker.appendFileContent.reset_mock()
+        storedJson = json.loads(json.dumps(self.mock_task_json_provider.saveJson.call_args[0][0]))
+        # saved before the task list is read again, so the index still counts the done task
+        task_list[1].setDescription("Updated Task 2")
+        self.task_provider.saveTask(task_list[1])
+
+        self.restartTaskProvider(storedJson, self.getJournal())
+        task_list = self.task_provider.getTaskList()
+
+        self.assertEqual([task.getDescription() for task in task_list], ["Updated Task 2"])
+        self.mock_task_json_provider.saveJson.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
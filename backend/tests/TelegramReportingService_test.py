@@ -166,6 +166,30 @@ class TestTelegramReportingService(unittest.TestCase):
         self.taskProvider.compare.assert_called_once_with(mockTaskList2, mockTaskList1)
         self.assertEqual(self.telegramReportingService._TelegramReportingService__lastModelList, mockTaskList2)
 
+    def test_hasFilteredListChanged_same_version(self) -> None:
+        # Arrange
+        self.task_list_manager.get_filtered_list_version.return_value = 3
+        self.taskProvider.compare.return_value = False
+        self.telegramReportingService.hasFilteredListChanged()
+
+        # Act
+        result = self.telegramReportingService.hasFilteredListChanged()
+
+        # Assert
+        self.assertFalse(result)
+        self.taskProvider.compare.assert_called_once()
+
+    def test_onTaskListUpdated_same_version(self) -> None:
+        # Arrange
+        self.taskProvider.getTaskListVersion.return_value = 3
+        self.telegramReportingService.onTaskListUpdated()
+
+        # Act
+        self.telegramReportingService.onTaskListUpdated()
+
+        # Assert
+        self.task_list_manager.update_taskList.assert_called_once()
+
     def test_listCommand(self) -> None:
         # Arrange
         self.telegramReportingService.sendTaskList = AsyncMock()
@@ -1,6 +1,10 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+from src.Interfaces.IFilter import IFilter
+from src.Interfaces.ITaskProvider import ITaskProvider
 from src.TelegramTaskListManager import TelegramTaskListManager
+from src.taskmodels.TaskModel import TaskModel
+from src.Utils import TaskQuery
 from src.wrappers.TimeManagement import TimeAmount, TimePoint
 
 
@@ -113,12 +117,110 @@ class TestTelegramTaskListManager(unittest.TestCase):
         manager = TelegramTaskListManager(self.task_list, [], self.heuristics, filters, self.statistics_service)
         # Heuristic sort will be called, so mock it to return tasks in reverse order
         heuristic_mock = MagicMock()
-        heuristic_mock.sort.return_value = list(reversed([(t, 0) for t in self.task_list]))
+        heuristic_mock.sortColumns.return_value = list(reversed([(t, 0) for t in self.task_list]))
         manager._TelegramTaskListManager__heuristicList = [("Priority", heuristic_mock)]
         manager._TelegramTaskListManager__selectedHeuristic = ("Priority", heuristic_mock)
         filtered = manager.filtered_task_list
         self.assertEqual(filtered, list(reversed(self.task_list)))
 
+    def test_get_task_list_content_selects_only_the_page(self):
+        filters = [("Active", MagicMock(), True)]
+        heuristic_mock = MagicMock()
+        heuristic_mock.evaluate.return_value = 1.0
+        heuristic_mock.topColumns.return_value = [(self.task3, 3.0), (self.task1, 1.0)]
+        manager = TelegramTaskListManager(self.task_list, [], [("Priority", heuristic_mock)], filters, self.statistics_service, tasksPerPage=2)
+
+        content = manager.get_task_list_content()
+
+        heuristic_mock.topColumns.assert_called_once()
+        columns, count = heuristic_mock.topColumns.call_args.args
+        self.assertEqual((columns.tasks, count), (self.task_list, 2))
+        heuristic_mock.sortColumns.assert_not_called()
+        self.assertEqual([task.description for task in content.tasks], ["Task 3", "Task 1"])
+        self.assertEqual(content.total_tasks, 3)
+        self.assertEqual(content.total_pages, 2)
+
+    def test_get_task_list_content_with_algorithm(self):
+        filters = [("Active", MagicMock(), True)]
+        heuristic_mock = MagicMock()
+        heuristic_mock.evaluate.return_value = 1.0
+        heuristic_mock.sortColumns.return_value = [(self.task2, 2.0), (self.task1, 1.0), (self.task3, 0.0)]
+        algorithm_mock = MagicMock()
+        algorithm_mock.applyTop.return_value = ([self.task2, self.task1, self.task3], 3)
+        manager = TelegramTaskListManager(self.task_list, [("Algorithm", algorithm_mock)], [("Priority", heuristic_mock)], filters, self.statistics_service, tasksPerPage=2)
+        manager.next_page()
+
+        content = manager.get_task_list_content()
+
+        # the algorithm keeps the heuristic order for tasks it considers equal, so it gets the whole sorted list
+        algorithm_mock.applyTop.assert_called_once_with([self.task2, self.task1, self.task3], 4)
+        algorithm_mock.apply.assert_not_called()
+        self.assertEqual([task.description for task in content.tasks], ["Task 3"])
+        self.assertEqual(content.total_pages, 2)
+
+    def createCachedManager(self, tasks):
+        heuristic_mock = MagicMock()
+        heuristic_mock.sortColumns.side_effect = lambda columns: [(task, 0) for task in columns.tasks]
+        manager = TelegramTaskListManager(tasks, [], [("First", heuristic_mock), ("Second", heuristic_mock)], [("Active", MagicMock(), True)], self.statistics_service)
+        return manager, heuristic_mock
+
+    def test_filtered_task_list_reused_while_nothing_changes(self):
+        manager, heuristic_mock = self.createCachedManager(self.task_list)
+
+        first = manager.filtered_task_list
+        first.pop()
+        second = manager.filtered_task_list
+
+        heuristic_mock.sortColumns.assert_called_once()
+        self.assertEqual(second, self.task_list)
+        self.assertEqual(manager.get_filtered_list_cache_info(), (1, 1))
+
+    def test_filtered_task_list_recomputed_after_changes(self):
+        manager, heuristic_mock = self.createCachedManager(list(self.task_list))
+        changes = [
+            lambda: manager.update_taskList(list(self.task_list)),
+            lambda: manager.add_task(MagicMock(getEventWaited=MagicMock(return_value=None))),
+            lambda: manager.select_heuristic("/heuristic_2"),
+            lambda: manager.select_filter("/filter_1"),
+            lambda: TaskModel("Task", "work", 0, 0, 1, 1, 0, " ", "False", "", 0, None, None).setStatus("x"),
+        ]
+        manager.filtered_task_list
+
+        for change in changes:
+            change()
+            manager.filtered_task_list
+
+        self.assertEqual(manager.get_filtered_list_cache_info(), (0, len(changes) + 1))
+
+    def test_filtered_task_list_recomputed_when_minute_changes(self):
+        manager, heuristic_mock = self.createCachedManager(self.task_list)
+
+        with patch.object(TimePoint, "now", side_effect=[TimePoint.from_int(0), TimePoint.from_int(59999), TimePoint.from_int(60000)]):
+            manager.filtered_task_list
+            manager.filtered_task_list
+            manager.filtered_task_list
+
+        self.assertEqual(manager.get_filtered_list_cache_info(), (1, 2))
+
+    def test_filtered_list_version_kept_while_nothing_changes(self):
+        manager, heuristic_mock = self.createCachedManager(list(self.task_list))
+        version = manager.get_filtered_list_version()
+
+        self.assertEqual(manager.get_filtered_list_version(), version)
+        manager.select_heuristic("/heuristic_2")
+        self.assertGreater(manager.get_filtered_list_version(), version)
+        heuristic_mock.sortColumns.assert_not_called()
+
+    def test_get_task_list_content_uses_cached_list(self):
+        manager, heuristic_mock = self.createCachedManager(self.task_list)
+        manager.filtered_task_list
+
+        content = manager.get_task_list_content()
+
+        heuristic_mock.topColumns.assert_not_called()
+        self.assertEqual(content.total_tasks, 3)
+        self.assertEqual(manager.get_filtered_list_cache_info(), (1, 1))
+
 
 class TestTelegramTaskListManagerAdditional(unittest.TestCase):
 
@@ -190,5 +292,64 @@ class TestTelegramTaskListManagerAdditional(unittest.TestCase):
         self.assertNotIn(self.task1, result)
 
 
+class AcceptAllFilter(IFilter):
+    def filter(self, tasks):
+        return tasks
+
+    def getDescription(self):
+        return "All"
+
+
+@patch.object(TimePoint, "now", staticmethod(lambda: TimePoint.from_int(1000)))
+class TestTelegramTaskListManagerQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = [
+            self.createTask("Write report", 0, waited="report"),
+            self.createTask("Buy milk", 1),
+            self.createTask("Call plumber", 2, waited="plumber"),
+        ]
+        self.task_provider = MagicMock(spec=ITaskProvider)
+        filters = [("All", AcceptAllFilter(), True)]
+        self.task_list_manager = TelegramTaskListManager(self.tasks, [], [], filters, MagicMock(), taskProvider=self.task_provider)
+
+    def createTask(self, description, index, waited=None):
+        return TaskModel(description, "work", 0, 2000, 1.0, 1.0, 0.0, " ", "False", "", index, None, waited)
+
+    def test_raise_event_uses_the_query_of_the_task_provider(self):
+        self.task_provider.queryTasks.return_value = [self.tasks[2]]
+
+        result = self.task_list_manager.raiseEvent("plumber")
+
+        self.task_provider.queryTasks.assert_called_once_with(TaskQuery(waited="plumber"))
+        self.assertEqual(result, [self.tasks[2]])
+        self.assertIsNone(self.tasks[2].getEventWaited())
+
+    def test_search_tasks_checks_the_tasks_found(self):
+        # the tasks found may not meet the query, their conditions are still checked
+        self.task_provider.queryTasks.return_value = [self.tasks[0], self.tasks[1]]
+
+        result = self.task_list_manager.search_tasks(["MILK"])
+
+        self.task_provider.queryTasks.assert_called_once_with(TaskQuery(openOnly=True, searchTerms=["MILK"]))
+        self.assertEqual(result.filtered_task_list, [self.tasks[1]])
+
+    def test_filtered_task_list_uses_the_query_of_the_task_provider(self):
+        self.task_provider.queryTasks.return_value = [self.tasks[1]]
+
+        self.assertEqual(self.task_list_manager.filtered_task_list, [self.tasks[1]])
+        self.task_provider.queryTasks.assert_called_once_with(TaskQuery(openOnly=True, waiting=False))
+
+    def test_task_list_scanned_when_the_task_provider_cannot_query(self):
+        self.task_provider.queryTasks.return_value = None
+
+        self.assertEqual(self.task_list_manager.raiseEvent("report"), [self.tasks[0]])
+
+    def test_task_list_scanned_when_the_tasks_found_are_from_another_list(self):
+        self.task_provider.queryTasks.return_value = [self.createTask("Call plumber", 2, waited="plumber")]
+
+        self.assertEqual(self.task_list_manager.raiseEvent("plumber"), [self.tasks[2]])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of the cache of parsed time strings of TimeManagement.
+
+Sorts 50k tasks with SlackHeuristic three times:
+- with task models that build their amounts by parsing time strings, without the cache
+- with the same models, with the cache
+- with the current task model, which builds its amounts from numbers and parses nothing
+
+Run from the backend directory:
+    python -m tests.TimeManagement_benchmark
+"""
+
+import time
+
+from src.heuristics.SlackHeuristic import SlackHeuristic
+from src.wrappers import TimeManagement
+from src.wrappers.TimeManagement import TimeAmount, TimePoint
+from src.taskmodels.TaskModel import TaskModel
+from tests.TaskModel_benchmark import DAY_MS, LegacyTaskModel
+
+TASK_COUNT = 50000
+REPEAT = 3
+
+
+def loadTasks(modelClass: type[TaskModel]) -> list[TaskModel]:
+    now = TimePoint.now().as_int()
+    return [
+        modelClass(f"Task {i}", "work", now - (i % 30) * DAY_MS, now + (i % 90) * DAY_MS, 1 + i % 5, 1 + i % 8, i % 3, " ", "False", "", i, None, None)
+        for i in range(TASK_COUNT)
+    ]
+
+
+def measure(tasks: list[TaskModel]) -> float:
+    heuristic = SlackHeuristic(TimeAmount("8p"))
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        heuristic.sort(tasks)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    cachedParse = TimeManagement._parse_time_string
+    legacyTasks = loadTasks(LegacyTaskModel)
+
+    TimeManagement._parse_time_string = cachedParse.__wrapped__
+    try:
+        uncached = measure(legacyTasks)
+    finally:
+        TimeManagement._parse_time_string = cachedParse
+
+    cachedParse.cache_clear()
+    cached = measure(legacyTasks)
+    info = TimeAmount.parse_cache_info()
+    current = measure(loadTasks(TaskModel))
+
+    print(f"{TASK_COUNT} tasks, SlackHeuristic.sort")
+    print(f"{'parsing':>22} {'sort (s)':>9}")
+    print(f"{'strings, no cache':>22} {uncached:>9.3f}")
+    print(f"{'strings, cache':>22} {cached:>9.3f}")
+    print(f"{'numbers':>22} {current:>9.3f}")
+    print(f"cache {uncached / cached:.2f}x faster: {info.hits} hits, {info.misses} misses, {info.currsize} strings kept")
+
+
+if __name__ == "__main__":
+    main()
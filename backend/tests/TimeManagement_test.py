@@ -0,0 +1,89 @@
+import datetime
+import unittest
+from unittest.mock import patch
+
+from src.wrappers.TimeManagement import TimeAmount, TimePoint
+
+
+class TestTimeAmount(unittest.TestCase):
+    def test_factories_match_parsed_strings(self):
+        for value in [0, 1, 2.5, -2.5, 0.1, 1 / 3, 123456.789]:
+            self.assertEqual(TimeAmount.from_pomodoros(value), TimeAmount(f"{value}p"))
+            self.assertEqual(TimeAmount.from_days(value), TimeAmount(f"{value}d"))
+            self.assertEqual(TimeAmount.from_seconds(value), TimeAmount(f"{value}s"))
+        self.assertEqual(TimeAmount.from_miliseconds(90000), TimeAmount("1.5m"))
+
+    def test_arithmetic_keeps_milliseconds(self):
+        a = TimeAmount.from_miliseconds(3000)
+        b = TimeAmount.from_miliseconds(2000)
+
+        self.assertEqual((a + b).int_representation, 5000)
+        self.assertEqual((a - b).int_representation, 1000)
+        self.assertEqual((a * b).int_representation, 6000000)
+        self.assertEqual((a / b).int_representation, 1)
+
+    def test_arithmetic_does_not_parse_strings(self):
+        a = TimeAmount.from_pomodoros(2)
+        b = TimeAmount.from_pomodoros(1)
+
+        with patch("src.wrappers.TimeManagement._convert_time_string_to_miliseconds") as parse:
+            a + b
+            a - b
+            TimeAmount.from_days(1)
+            parse.assert_not_called()
+
+    def test_parsed_strings_are_remembered(self):
+        before = TimeAmount.parse_cache_info()
+
+        first = TimeAmount("1234.5p")
+        second = TimeAmount("1234.5p")
+
+        after = TimeAmount.parse_cache_info()
+        self.assertEqual(first, second)
+        self.assertEqual(after.misses - before.misses, 1)
+        self.assertEqual(after.hits - before.hits, 1)
+
+    def test_cached_hour_strings(self):
+        self.assertEqual(TimeAmount("01:30").int_representation, 90 * 60 * 1000)
+        self.assertEqual(TimeAmount("01:30").int_representation, 90 * 60 * 1000)
+
+    def test_invalid_strings_fail_every_time(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                TimeAmount("12x")
+
+    def test_instances_have_no_dict(self):
+        self.assertFalse(hasattr(TimeAmount.from_days(1), "__dict__"))
+        self.assertFalse(hasattr(TimePoint.from_int(0), "__dict__"))
+
+
+class TestTimePoint(unittest.TestCase):
+    def test_from_int_keeps_miliseconds(self):
+        point = TimePoint.from_int(1767225600123)
+
+        self.assertEqual(point.as_int(), 1767225600123)
+        self.assertEqual(point.timestamp, 1767225600.123)
+
+    def test_from_int_builds_datetime_when_asked(self):
+        point = TimePoint.from_int(1000)
+
+        self.assertIsNone(point._datetime)
+        self.assertEqual(point.datetime_representation, datetime.datetime.fromtimestamp(1))
+
+    def test_strings_match_datetime(self):
+        moment = datetime.datetime(2026, 1, 15, 10, 30)
+        point = TimePoint.from_int(TimePoint(moment).as_int())
+
+        self.assertEqual(point.str_representation, "2026-01-15")
+        self.assertEqual(str(point), "2026-01-15T10:30")
+        self.assertEqual(str(point.strip_time()), "2026-01-15")
+
+    def test_add_and_compare(self):
+        point = TimePoint(datetime.datetime(2026, 1, 15))
+
+        self.assertEqual(point + TimeAmount.from_days(1), TimePoint(datetime.datetime(2026, 1, 16)))
+        self.assertEqual((point + TimeAmount.from_seconds(-1)).as_int(), point.as_int() - 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
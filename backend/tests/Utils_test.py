@@ -1,5 +1,8 @@
+import json
 import unittest
-from src.Utils import stripDoc
+from dataclasses import asdict
+from src.Utils import AgendaContent, TaskEntry, stripDoc
+from src.wrappers.TimeManagement import TimePoint
 
 
 class TestUtils(unittest.TestCase):
@@ -64,6 +67,16 @@ Next line after whitespace."""
 *Special* characters!"""
         self.assertEqual(stripDoc(docstring), expected)
 
+    def test_agenda_content_is_json_serializable(self):
+        """Test that the agenda is serialized like the HTTP service does."""
+        task = TaskEntry("1", "Task", "work", "2024-01-01", "2024-01-02", 1.0, " ", 1.0, 0.0, 0.5)
+        agenda = AgendaContent(TimePoint.from_string("2024-01-01"), [task], [], {"2024-01-02": [task]}, [], None)
+
+        serialized = json.loads(json.dumps(asdict(agenda)))
+
+        self.assertEqual(serialized["date"], {"timestamp": TimePoint.from_string("2024-01-01").timestamp, "str_representation": "2024-01-01"})
+        self.assertEqual(serialized["active_urgent_tasks"][0]["description"], "Task")
+
 
 if __name__ == "__main__":
     unittest.main()
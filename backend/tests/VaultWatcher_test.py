@@ -0,0 +1,103 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.wrappers.VaultWatcher import InotifyVaultWatcher, PollingVaultWatcher, createVaultWatcher
+
+
+class TestPollingVaultWatcher(unittest.TestCase):
+
+    def test_popChanges_AlwaysRequestsFullScan(self):
+        watcher = PollingVaultWatcher()
+        self.assertIsNone(watcher.popChanges())
+
+    def test_waitForChanges_WhenDisposed_ThenReturnsImmediately(self):
+        watcher = PollingVaultWatcher()
+        watcher.dispose()
+        self.assertFalse(watcher.waitForChanges(10))
+
+
+class TestCreateVaultWatcher(unittest.TestCase):
+
+    @patch("src.wrappers.VaultWatcher.sys")
+    def test_createVaultWatcher_WhenNotLinux_ThenPolling(self, mock_sys):
+        mock_sys.platform = "win32"
+        self.assertIsInstance(createVaultWatcher("."), PollingVaultWatcher)
+
+    @patch("src.wrappers.VaultWatcher.InotifyVaultWatcher", side_effect=OSError(28, "No space left on device"))
+    @patch("src.wrappers.VaultWatcher.sys")
+    def test_createVaultWatcher_WhenInotifyFails_ThenPolling(self, mock_sys, _):
+        mock_sys.platform = "linux"
+        self.assertIsInstance(createVaultWatcher("."), PollingVaultWatcher)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is only available on Linux")
+class TestInotifyVaultWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.vaultPath = tempfile.mkdtemp() + os.sep
+        os.mkdir(os.path.join(self.vaultPath, "notes"))
+        self.watcher = InotifyVaultWatcher(self.vaultPath)
+
+    def tearDown(self):
+        self.watcher.dispose()
+        shutil.rmtree(self.vaultPath)
+
+    def write(self, relativePath: str, content: str) -> None:
+        with open(os.path.join(self.vaultPath, relativePath), "w") as file:
+            file.write(content)
+
+    def test_popChanges_WhenFirstCalled_ThenRequestsFullScan(self):
+        self.assertIsNone(self.watcher.popChanges())
+        self.assertEqual(self.watcher.popChanges(), set())
+
+    def test_popChanges_WhenFilesAreWritten_ThenReturnsTheirRelativePaths(self):
+        self.watcher.popChanges()
+        self.write("root.md", "- [ ] task")
+        self.write(os.path.join("notes", "nested.md"), "- [ ] task")
+
+        self.assertTrue(self.watcher.waitForChanges(1))
+        self.assertEqual(self.watcher.popChanges(), {"root.md", os.path.join("notes", "nested.md")})
+        self.assertEqual(self.watcher.popChanges(), set())
+
+    def test_popChanges_WhenFileIsDeleted_ThenReturnsItsPath(self):
+        self.write("root.md", "- [ ] task")
+        self.watcher.popChanges()
+        os.remove(os.path.join(self.vaultPath, "root.md"))
+
+        self.assertEqual(self.watcher.popChanges(), {"root.md"})
+
+    def test_popChanges_WhenDirectoryIsCreated_ThenRequestsFullScanAndWatchesIt(self):
+        self.watcher.popChanges()
+        os.mkdir(os.path.join(self.vaultPath, "new"))
+
+        self.assertIsNone(self.watcher.popChanges())
+        self.write(os.path.join("new", "note.md"), "- [ ] task")
+        self.assertEqual(self.watcher.popChanges(), {os.path.join("new", "note.md")})
+
+    def test_popChanges_WhenIgnoredDirectoryChanges_ThenNothingIsReported(self):
+        os.mkdir(os.path.join(self.vaultPath, ".git"))
+        watcher = InotifyVaultWatcher(self.vaultPath, {".git", ".trash"})
+        watcher.popChanges()
+        self.write(os.path.join(".git", "HEAD"), "ref")
+        os.mkdir(os.path.join(self.vaultPath, ".trash"))
+
+        self.assertEqual(watcher.popChanges(), set())
+        watcher.dispose()
+
+    def test_waitForChanges_WhenIdle_ThenTimesOut(self):
+        self.watcher.popChanges()
+        self.assertFalse(self.watcher.waitForChanges(0.05))
+
+    def test_waitForChanges_WhenDisposed_ThenReturnsFalse(self):
+        self.watcher.popChanges()
+        self.watcher.dispose()
+
+        self.assertFalse(self.watcher.waitForChanges(0.05))
+
+
+if __name__ == "__main__":
+    unittest.main()